@@ -0,0 +1,135 @@
+from collections import deque
+
+import numpy as np
+
+from utils.candidatos import ListaCandidatos
+from utils.parada import CriterioParada
+from utils.tour_dos_niveles import TourDosNiveles
+
+
+class BusquedaLocalDLB:
+    # Mejora mínima para aceptar un movimiento (evita ciclos por errores de redondeo)
+    EPSILON = 1e-9
+    def __init__(self, tour_inicial, distancia_inicial, distancias, params, candidatos=None):
+        """
+        Inicializa la Búsqueda Local 2-opt con don't-look bits y cola de primera mejora.
+
+        Cada ciudad tiene un bit que indica si merece la pena volver a examinarla. Solo están en la cola las
+        ciudades cuyo entorno ha cambiado desde la última vez que se examinaron, así que el coste depende
+        de cuánto cambia el tour y no de n por el número de iteraciones. Termina en un óptimo local 2-opt
+        respecto a la lista de candidatos.
+
+        :param tour_inicial: Solución del algoritmo Greedy Aleatorio.
+        :param distancia_inicial: Distancia de la ruta.
+        :param distancias: Proveedor de distancias entre las ciudades (ver utils.distancias).
+        :param params: Parámetros del archivo de configuración.
+        :param candidatos: Lista de vecinos más cercanos de la instancia (utils.candidatos.ListaCandidatos).
+        """
+        self.tour_actual = TourDosNiveles.crear(tour_inicial, params)  # Copia propia: los movimientos se aplican en el sitio
+        self.distancias = distancias
+        self.distancia_actual = distancia_inicial
+        self.params = params
+
+        # Los movimientos solo se buscan entre cada ciudad y sus vecinos más cercanos
+        if candidatos is None:
+            coordenadas = getattr(distancias, 'coordenadas', None)
+            candidatos = ListaCandidatos(coordenadas, params.get('num_candidatos', 10), distancias=distancias)
+        self.candidatos = candidatos
+
+    def resolver(self, semilla, logger=None, perfil=None, activas=None):
+        """
+        Resuelve el problema aplicando movimientos 2-opt de mejora hasta vaciar la cola de ciudades.
+
+        :param semilla: Semilla para el generador aleatorio (orden inicial de la cola).
+        :param perfil: Perfilador (utils.perfilado.Perfilador) o None si el perfilado está desactivado.
+        :param activas: Ciudades que empiezan en la cola (None para todas); el resto solo se examina si
+                        un movimiento cambia alguno de sus arcos.
+        :return: Lista de ciudades en el orden del tour y la distancia total del tour.
+        """
+        rng = np.random.default_rng(semilla)
+        n = len(self.tour_actual)
+        self.parada = parada = CriterioParada.desde_params(self.params)  # Tiempo, evaluaciones y distancia objetivo
+        evaluaciones_por_ciudad = 2 * self.candidatos.num_candidatos
+
+        if logger: logger.registrar_evento(f"Partimos de la solución del Greedy Aleatorio: {self.distancia_actual}")
+
+        # Los mensajes de cada movimiento solo se construyen si el log está en nivel de depuración
+        depurar = logger is not None and logger.depuracion
+
+        # Al principio todas las ciudades (o solo las indicadas) están activas (bit a 0), en orden aleatorio
+        iniciales = rng.permutation(n) if activas is None else rng.permutation(activas)
+        cola = deque(iniciales.tolist())
+        en_cola = np.zeros(n, dtype=bool)
+        en_cola[iniciales] = True
+        movimientos = 0
+
+        while cola:
+            if parada.agotado(self.distancia_actual):
+                if logger: logger.registrar_evento(f"Parada por {parada.motivo}.")
+                break
+
+            ciudad = cola.popleft()
+            en_cola[ciudad] = False
+
+            if perfil: t = perfil.ahora()
+            mejora = self.mejorar_ciudad(ciudad)
+            parada.contar(evaluaciones_por_ciudad)
+            if perfil:
+                perfil.fase('examinar_ciudad', t)
+                perfil.contar('evaluaciones', evaluaciones_por_ciudad)
+            if mejora is None:
+                continue  # Sin mejora: la ciudad queda dormida hasta que cambie un arco suyo
+
+            ganancia, tocadas = mejora
+            self.distancia_actual -= ganancia
+            movimientos += 1
+            if perfil: perfil.contar('movimientos_aceptados')
+
+            if depurar: logger.depurar("Movimiento %s desde la ciudad %s, Distancia actual: %s", movimientos, ciudad, self.distancia_actual)
+
+            # Se despiertan los extremos de los arcos modificados (incluida la propia ciudad)
+            for tocada in tocadas:
+                if not en_cola[tocada]:
+                    en_cola[tocada] = True
+                    cola.append(tocada)
+
+        if logger and not cola: logger.registrar_evento(f"Óptimo local alcanzado tras {movimientos} movimientos.")
+
+        return self.tour_actual.ciudades, self.distancia_actual
+
+    def mejorar_ciudad(self, a):
+        """
+        Busca el mejor movimiento 2-opt que crea el arco (a, b) con b candidato de a y, si mejora, lo aplica.
+
+        Se evalúan a la vez los dos sentidos para todos los candidatos: sustituir (a, sig(a)), (b, sig(b))
+        por (a, b), (sig(a), sig(b)), o bien (ant(a), a), (ant(b), b) por (a, b), (ant(a), ant(b)).
+
+        :param a: Ciudad a examinar.
+        :return: (ganancia, ciudades cuyos arcos han cambiado), o None si no hay movimiento de mejora.
+        """
+        tour = self.tour_actual
+        d = self.distancias
+
+        b = self.candidatos.vecinos[a]
+        siguientes_b = tour.siguientes(b)
+        anteriores_b = tour.anteriores(b)
+        siguiente_a, anterior_a = tour.siguiente(a), tour.anterior(a)
+
+        d_ab = d[np.full(len(b), a), b]
+        ganancia_sig = d[a, siguiente_a] + d[b, siguientes_b] - d_ab - d[np.full(len(b), siguiente_a), siguientes_b]
+        ganancia_ant = d[anterior_a, a] + d[anteriores_b, b] - d_ab - d[np.full(len(b), anterior_a), anteriores_b]
+
+        k_sig, k_ant = int(np.argmax(ganancia_sig)), int(np.argmax(ganancia_ant))
+        if max(ganancia_sig[k_sig], ganancia_ant[k_ant]) <= BusquedaLocalDLB.EPSILON:
+            return None
+
+        if ganancia_sig[k_sig] >= ganancia_ant[k_ant]:
+            # a sig(a) ... b sig(b)  ->  a b ... sig(a) sig(b)
+            vecina, siguiente_b = int(b[k_sig]), int(siguientes_b[k_sig])
+            tour.invertir_tramo(siguiente_a, vecina)
+            return float(ganancia_sig[k_sig]), (a, int(siguiente_a), vecina, siguiente_b)
+
+        # ant(b) b ... ant(a) a  ->  ant(b) ant(a) ... b a
+        vecina, anterior_b = int(b[k_ant]), int(anteriores_b[k_ant])
+        tour.invertir_tramo(vecina, anterior_a)
+        return float(ganancia_ant[k_ant]), (a, int(anterior_a), vecina, anterior_b)
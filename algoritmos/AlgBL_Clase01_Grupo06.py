@@ -1,61 +1,137 @@
 import random
+import numpy as np
 
+from utils.checkpoint import Checkpoint
+from utils.operadores import Operador
+from utils.parada import CriterioParada
+from utils.tour import Tour
 from utils.utilidades import Utilidades
 
 class BusquedaLocal:
-    def __init__(self, tour_inicial, distancia_inicial, matriz_distancias, params):
+    def __init__(self, tour_inicial, distancia_inicial, distancias, params, candidatos=None):
         """
         Inicializa el algoritmo Búsqueda Local del Mejor
 
         :param tour_inicial: Solución del algoritmo Greedy Aleatorio.
         :param distancia_inicial: Distancia de la ruta.
-        :param matriz_distancias: Matriz de distancias entre las ciudades.
+        :param distancias: Proveedor de distancias entre las ciudades (ver utils.distancias).
         :param params: Parámetros del archivo de configuración.
+        :param candidatos: Lista de vecinos más cercanos de la instancia (utils.candidatos.ListaCandidatos).
         """
-        self.tour_actual = tour_inicial
-        self.matriz_distancias = matriz_distancias
+        self.tour_actual = Tour(tour_inicial)  # Copia propia: los movimientos se aplican en el sitio
+        self.distancias = distancias
         self.distancia_actual = distancia_inicial
         self.params = params
 
-    def resolver(self, semilla, logger=None):
+        # Con entorno = candidatos los vecinos solo acercan ciudades a sus vecinos más próximos
+        self.candidatos = candidatos if params.get('entorno', 'aleatorio') == 'candidatos' else None
+
+        # Operador de movimiento elegido en config.txt (intercambio, 2opt u or_opt)
+        self.operador = Operador.crear(params)
+
+    def resolver(self, semilla, logger=None, perfil=None, checkpoint=None):
         """
         Resuelve el problema utilizando el algoritmo Búsqueda Local del Mejor con una semilla específica.
 
         :param semilla: Semilla para el generador aleatorio.
+        :param perfil: Perfilador (utils.perfilado.Perfilador) o None si el perfilado está desactivado.
+        :param checkpoint: Checkpoint (utils.checkpoint.Checkpoint) de la ejecución o None; si tiene un
+                           estado guardado, la búsqueda continúa desde él con el mismo resultado.
         :return: Lista de ciudades en el orden del tour y la distancia total del tour.
         """
         random.seed(semilla)  # Establece la semilla para la aleatoriedad
+        rng = np.random.default_rng(semilla)  # Generador vectorizado para muestrear el entorno
         tamanio_entorno = int(self.params['iteraciones'] * self.params['per_tamanio'])
         cont = int(self.params['iteraciones'] * self.params['per_iteraciones'])
         ite = 0
+        self.parada = parada = CriterioParada.desde_params(self.params)  # Tiempo, evaluaciones y distancia objetivo
 
         if logger: logger.registrar_evento(f"Partimos de la solución del Greedy Aleatorio: {self.distancia_actual}")
 
-        for iteracion in range(self.params['iteraciones']):
+        # Continuar desde el último checkpoint si lo hay
+        primera_iteracion = 0
+        estado = checkpoint.cargar_estado() if checkpoint else None
+        if estado:
+            primera_iteracion, tamanio_entorno, cont, ite = self.restaurar_checkpoint(estado, rng)
+            if logger: logger.registrar_evento(f"Reanudando desde la iteración {primera_iteracion}: {self.distancia_actual}")
+
+        # Los mensajes de cada iteración solo se construyen si el log está en nivel de depuración
+        depurar = logger is not None and logger.depuracion
+
+        for iteracion in range(primera_iteracion, self.params['iteraciones']):
+            if parada.agotado(self.distancia_actual):
+                if logger: logger.registrar_evento(f"Parada por {parada.motivo}.")
+                break
+
             # Generar vecinos
-            vecinos = Utilidades.generar_vecinos(tamanio_entorno, self.tour_actual, self.matriz_distancias, self.distancia_actual)
+            if perfil: t = perfil.ahora()
+            movimientos = self.operador.seleccionar_movimientos(tamanio_entorno, self.tour_actual, rng, self.candidatos)
+            if perfil: t = perfil.fase('generar_vecinos', t)
+            deltas = self.operador.evaluar(self.tour_actual.ciudades, self.distancias, movimientos)
+            if perfil: t = perfil.fase('evaluar', t)
+            parada.contar(len(deltas))
+            if perfil:
+                perfil.contar('iteraciones')
+                perfil.contar('evaluaciones', len(deltas))
 
-            if logger: logger.registrar_evento(f"Iteración: {iteracion}, Tamaño del entorno: {tamanio_entorno}, Vecinos generados: {tamanio_entorno}")
+            if depurar: logger.depurar("Iteración: %s, Tamaño del entorno: %s, Vecinos generados: %s", iteracion, tamanio_entorno, tamanio_entorno)
 
             # Buscar la mejor solución en los vecinos
-            mejor_vecino = min(vecinos, key=lambda x: x[1], default=(None, float('inf'), None))
-            nuevo_tour, nueva_distancia, movimiento = mejor_vecino
+            mejor = Utilidades.mejor_movimiento(deltas)
+            if mejor is None:
+                movimiento, nueva_distancia = None, float('inf')
+            else:
+                movimiento = tuple(int(componente[mejor]) for componente in movimientos)
+                nueva_distancia = self.distancia_actual + deltas[mejor]
+            if perfil: t = perfil.fase('elegir', t)
 
-            if logger: logger.registrar_evento(f"Mejor vecino (movimiento): {movimiento}, Distancia: {nueva_distancia}")
+            if depurar: logger.depurar("Mejor vecino (movimiento): %s, Distancia: %s", movimiento, nueva_distancia)
 
             # Si encontramos un mejor vecino
             if nueva_distancia < self.distancia_actual:
-                self.tour_actual = nuevo_tour
+                self.operador.aplicar(self.tour_actual, movimiento)  # Solo se aplica el movimiento ganador
                 self.distancia_actual = nueva_distancia
+                if perfil:
+                    perfil.fase('aplicar', t)
+                    perfil.contar('movimientos_aceptados')
             else:
                 if logger: logger.registrar_evento(f"Ninguno de los vecinos mejora la solución actual.")
                 break
 
-            if logger: logger.registrar_evento(f"¡Mejora encontrada! Distancia actual: {nueva_distancia}")
+            if depurar: logger.depurar("¡Mejora encontrada! Distancia actual: %s", nueva_distancia)
 
             # Reducimos el tamaño del entorno
             tamanio_entorno, cont, ite = Utilidades.reducir_entorno(tamanio_entorno, cont, iteracion, self.params['per_disminucion'], self.params['per_iteraciones'], ite)
             if tamanio_entorno < (self.params['per_disminucion'] * 100):
                 break
 
-        return self.tour_actual, self.distancia_actual
\ No newline at end of file
+            if checkpoint and checkpoint.toca():
+                self.guardar_checkpoint(checkpoint, rng, iteracion + 1, tamanio_entorno, cont, ite)
+
+        return self.tour_actual.ciudades, self.distancia_actual
+
+    def guardar_checkpoint(self, checkpoint, rng, iteracion, tamanio_entorno, cont, ite):
+        """
+        Guarda el estado necesario para continuar la búsqueda en la iteración indicada.
+
+        :param checkpoint: Checkpoint de la ejecución.
+        :param rng: Generador aleatorio de NumPy de la búsqueda.
+        :param iteracion: Siguiente iteración a ejecutar.
+        """
+        meta = {'iteracion': iteracion, 'tamanio_entorno': tamanio_entorno, 'cont': cont, 'ite': ite,
+                'distancia_actual': float(self.distancia_actual), 'evaluaciones': self.parada.evaluaciones,
+                'generadores': Checkpoint.estado_generadores(rng)}
+        checkpoint.guardar_estado({'tour_actual': self.tour_actual.ciudades}, meta)
+
+    def restaurar_checkpoint(self, estado, rng):
+        """
+        Recupera el estado guardado por guardar_checkpoint.
+
+        :return: Siguiente iteración, tamaño del entorno y contadores de reducción del entorno (cont, ite).
+        """
+        arrays, meta = estado
+        self.tour_actual = Tour(arrays['tour_actual'])
+        self.distancia_actual = meta['distancia_actual']
+        self.parada.reanudar(meta['evaluaciones'], meta['tiempo'])  # El presupuesto sigue desde donde se quedó
+        Checkpoint.restaurar_generadores(rng, meta['generadores'])
+        return meta['iteracion'], meta['tamanio_entorno'], meta['cont'], meta['ite']
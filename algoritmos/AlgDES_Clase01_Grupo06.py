@@ -0,0 +1,261 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from algoritmos.AlgGRE_Clase01_Grupo06 import GreedyAleatorio
+from algoritmos.AlgBL_Clase01_Grupo06 import BusquedaLocal
+from algoritmos.AlgBLDLB_Clase01_Grupo06 import BusquedaLocalDLB
+from algoritmos.AlgLK_Clase01_Grupo06 import LinKernighan
+from algoritmos.AlgTA_Clase01_Grupo06 import AlgoritmoTabu
+from utils.candidatos import ListaCandidatos
+from utils.distancias import Distancias, MatrizDistancias
+from utils.parada import CriterioParada
+from utils.utilidades import Utilidades
+
+
+class Descomposicion:
+    # Algoritmos con los que se puede resolver cada subproblema (todos parten del Greedy Aleatorio)
+    ALGORITMOS = {'busqueda_local': BusquedaLocal, 'busqueda_local_dlb': BusquedaLocalDLB, 'lin_kernighan': LinKernighan, 'algoritmo_tabu': AlgoritmoTabu}
+
+    # Un cluster final con menos ciudades se une al anterior (los algoritmos necesitan unas pocas ciudades)
+    TAMANIO_MINIMO = 8
+
+    # Resolución de la rejilla sobre la que se calcula el orden de Hilbert (2^16 celdas por lado)
+    BITS_HILBERT = 16
+
+    def __init__(self, distancias, params, candidatos=None):
+        """
+        Inicializa la descomposición espacial para instancias muy grandes.
+
+        Reparte las ciudades en clusters de unas tamanio_cluster ciudades contiguas en el plano, resuelve
+        cada uno con el Greedy Aleatorio y algoritmo_subproblema en procesos en paralelo, une los subtours
+        en el orden de los clusters y repara las costuras con la Búsqueda Local con don't-look bits,
+        empezando solo por las ciudades con algún candidato en otro cluster. El coste de cada cluster no
+        depende de n, así que el tiempo crece de forma lineal con el tamaño de la instancia.
+
+        :param distancias: Proveedor de distancias entre las ciudades (ver utils.distancias).
+        :param params: Parámetros del archivo de configuración.
+        :param candidatos: Lista de vecinos más cercanos de la instancia (utils.candidatos.ListaCandidatos).
+        """
+        self.distancias = distancias
+        self.params = params
+        self.candidatos = candidatos
+
+        # Las coordenadas vienen del proveedor perezoso o, con matriz densa, de la lista de candidatos
+        self.coordenadas = getattr(distancias, 'coordenadas', None)
+        if self.coordenadas is None and candidatos is not None:
+            self.coordenadas = candidatos.coordenadas
+        if self.coordenadas is None:
+            raise ValueError("La descomposición espacial necesita las coordenadas de las ciudades (no admite instancias EXPLICIT)")
+
+        self.particion = params.get('particion', 'hilbert')
+        self.tamanio_cluster = params.get('tamanio_cluster', 1000)
+        self.algoritmo = params.get('algoritmo_subproblema', 'algoritmo_tabu')
+        if self.algoritmo not in Descomposicion.ALGORITMOS:
+            raise ValueError(f"Algoritmo de subproblema no válido: {self.algoritmo}")
+
+        # procesos_descomposicion = 0 usa todos los núcleos disponibles; dentro del grupo del Ejecutor, solo su parte
+        self.procesos = Utilidades.procesos_internos(params.get('procesos_descomposicion', 0), params)
+
+    @staticmethod
+    def orden_hilbert(coordenadas):
+        """
+        Orden de las ciudades a lo largo de la curva de Hilbert: ciudades cercanas en el orden lo están
+        también en el plano, y cada tramo contiguo del orden ocupa una región compacta.
+
+        :param coordenadas: Array (n, 2) con las coordenadas de las ciudades.
+        :return: Array de ciudades ordenadas.
+        """
+        lado = 1 << Descomposicion.BITS_HILBERT
+        coordenadas = np.asarray(coordenadas, dtype=np.float64)
+        minimo = coordenadas.min(axis=0)
+        escala = (lado - 1) / max(float(np.ptp(coordenadas, axis=0).max()), 1e-12)  # Misma escala en x e y
+        x = ((coordenadas[:, 0] - minimo[0]) * escala).astype(np.int64)
+        y = ((coordenadas[:, 1] - minimo[1]) * escala).astype(np.int64)
+
+        indice = np.zeros(len(coordenadas), dtype=np.int64)
+        s = lado >> 1
+        while s > 0:
+            rx = ((x & s) > 0).astype(np.int64)
+            ry = ((y & s) > 0).astype(np.int64)
+            indice += s * s * ((3 * rx) ^ ry)
+
+            # Rotación del cuadrante para que la curva sea continua
+            girar = ry == 0
+            reflejar = girar & (rx == 1)
+            x = np.where(reflejar, lado - 1 - x, x)
+            y = np.where(reflejar, lado - 1 - y, y)
+            x, y = np.where(girar, y, x), np.where(girar, x, y)
+            s >>= 1
+
+        return np.argsort(indice, kind='stable')
+
+    def orden_rejilla(self):
+        """
+        Orden de las ciudades por celdas de una rejilla recorrida en zigzag (filas alternas al revés).
+
+        :return: Array de ciudades ordenadas y celda de cada ciudad en ese orden.
+        """
+        coordenadas = np.asarray(self.coordenadas, dtype=np.float64)
+        lado = max(1, int(np.ceil(np.sqrt(len(coordenadas) / self.tamanio_cluster))))
+        minimo = coordenadas.min(axis=0)
+        extension = np.maximum(np.ptp(coordenadas, axis=0), 1e-12)
+        celda = np.minimum(((coordenadas - minimo) / extension * lado).astype(np.int64), lado - 1)
+
+        fila, columna = celda[:, 1], celda[:, 0]
+        columna = np.where(fila % 2 == 1, lado - 1 - columna, columna)  # Zigzag: celdas consecutivas adyacentes
+        celdas = fila * lado + columna
+        orden = np.argsort(celdas, kind='stable')
+        return orden, celdas[orden]
+
+    def particionar(self):
+        """
+        Reparte las ciudades en clusters según particion (hilbert o rejilla). Los clusters siguen el orden
+        de la curva o de la rejilla, de modo que clusters consecutivos son vecinos en el plano.
+
+        :return: Lista de arrays de ciudades, uno por cluster.
+        """
+        n = len(self.coordenadas)
+        if self.particion == 'hilbert':
+            orden = Descomposicion.orden_hilbert(self.coordenadas)
+            cortes = list(range(self.tamanio_cluster, n, self.tamanio_cluster))
+        elif self.particion == 'rejilla':
+            # Se juntan celdas consecutivas hasta llegar a tamanio_cluster ciudades
+            orden, celdas = self.orden_rejilla()
+            cambios = np.flatnonzero(celdas[1:] != celdas[:-1]) + 1
+            cortes, ultimo = [], 0
+            for cambio in cambios.tolist():
+                if cambio - ultimo >= self.tamanio_cluster:
+                    cortes.append(cambio)
+                    ultimo = cambio
+        else:
+            raise ValueError(f"Partición no válida: {self.particion}")
+
+        if cortes and n - cortes[-1] < Descomposicion.TAMANIO_MINIMO:
+            cortes.pop()
+        return np.split(orden, cortes)
+
+    def subproblema(self, cluster):
+        """
+        Datos que necesita el proceso que resuelve un cluster: sus coordenadas y, con matriz densa, la
+        submatriz (así las distancias son exactamente las de la instancia completa).
+
+        :param cluster: Array de ciudades del cluster.
+        :return: Coordenadas del cluster, submatriz (o None) y tipo de distancia.
+        """
+        matriz = getattr(self.distancias, 'matriz', None)
+        submatriz = matriz[np.ix_(cluster, cluster)] if matriz is not None else None
+        return self.coordenadas[cluster], submatriz, getattr(self.distancias, 'tipo', 'EUCLIDEA')
+
+    @staticmethod
+    def _resolver_cluster(coordenadas, submatriz, tipo, params, algoritmo, semilla):
+        """
+        Punto de entrada de cada proceso: Greedy Aleatorio y algoritmo_subproblema sobre un cluster.
+
+        :return: Orden de las ciudades del cluster (índices locales) y movimientos evaluados.
+        """
+        if len(coordenadas) < Descomposicion.TAMANIO_MINIMO:
+            return np.arange(len(coordenadas)), 0
+
+        if submatriz is not None:
+            distancias = MatrizDistancias(submatriz)
+        else:
+            distancias = Distancias.crear(coordenadas, params.get('umbral_matriz_densa'), tipo)
+        candidatos = ListaCandidatos(coordenadas, params['num_candidatos'], distancias=distancias) if params.get('num_candidatos') else None
+
+        greedy = GreedyAleatorio(distancias, params, candidatos)
+        tour, distancia = greedy.resolver(semilla)
+        resolutor = Descomposicion.ALGORITMOS[algoritmo](tour, distancia, distancias, params, candidatos)
+        ciudades, _ = resolutor.resolver(semilla)
+        return np.asarray(ciudades), resolutor.parada.evaluaciones
+
+    def unir(self, ciclos):
+        """
+        Une los subtours en el orden de los clusters. Cada ciclo se abre por el arco que minimiza
+        d(salida del anterior, entrada) - arco roto + d(salida, representante del siguiente), en los dos
+        sentidos; el representante es la ciudad más cercana al centroide del siguiente cluster (o la
+        primera ciudad del tour para el último).
+
+        :param ciclos: Lista de arrays de ciudades (índices globales), uno por cluster.
+        :return: Array de ciudades del tour completo.
+        """
+        d = self.distancias
+        representantes = []
+        for ciclo in ciclos:
+            coordenadas = self.coordenadas[ciclo]
+            centroide = coordenadas.mean(axis=0)
+            representantes.append(int(ciclo[np.argmin(np.sum((coordenadas - centroide) ** 2, axis=1))]))
+
+        caminos = []
+        anterior = None
+        for i, ciclo in enumerate(ciclos):
+            m = len(ciclo)
+            siguientes = np.roll(ciclo, -1)
+            objetivo = representantes[i + 1] if i + 1 < len(ciclos) else (int(caminos[0][0]) if caminos else representantes[0])
+
+            # Opción k < m: se rompe el arco (ciclo[k], ciclo[k + 1]) y se recorre hacia delante desde ciclo[k + 1];
+            # opción k >= m: el mismo arco, recorrido hacia atrás desde ciclo[k - m]
+            entradas = np.concatenate([siguientes, ciclo])
+            salidas = np.concatenate([ciclo, siguientes])
+            coste = -np.tile(d[ciclo, siguientes], 2) + d[salidas, np.full(2 * m, objetivo)]
+            if anterior is not None:
+                coste = coste + d[np.full(2 * m, anterior), entradas]
+
+            k = int(np.argmin(coste)) if m > 1 else 0
+            camino = np.roll(ciclo, -(k % m + 1))
+            caminos.append(camino if k < m else camino[::-1])
+            anterior = int(caminos[-1][-1])
+
+        return np.concatenate(caminos)
+
+    def resolver(self, semilla, logger=None, perfil=None):
+        """
+        Resuelve el problema por descomposición espacial con una semilla específica.
+
+        :param semilla: Semilla base; el cluster i usa semilla + i y la reparación de costuras, semilla.
+        :param perfil: Perfilador (utils.perfilado.Perfilador) o None si el perfilado está desactivado.
+        :return: Lista de ciudades en el orden del tour y la distancia total del tour.
+        """
+        self.parada = CriterioParada.desde_params(self.params)  # Acumula las evaluaciones de todas las fases
+
+        if perfil: t = perfil.ahora()
+        clusters = self.particionar()
+        if perfil: t = perfil.fase('particion', t)
+        if logger: logger.registrar_evento(f"Partición {self.particion}: {len(clusters)} clusters de hasta {max(map(len, clusters))} ciudades.")
+
+        # Cada cluster es independiente: resultado igual en serie o en paralelo. El presupuesto restante se
+        # reparte entre los clusters (las evaluaciones) y entre las tandas de procesos (el tiempo)
+        procesos = min(self.procesos, len(clusters))
+        params_cluster = self.parada.restante(self.params, partes_tiempo=-(-len(clusters) // procesos), partes_evaluaciones=len(clusters))
+        tareas = [(*self.subproblema(cluster), params_cluster, self.algoritmo, semilla + i) for i, cluster in enumerate(clusters)]
+        if procesos > 1:
+            with ProcessPoolExecutor(max_workers=procesos, mp_context=multiprocessing.get_context('spawn')) as grupo:
+                soluciones = list(grupo.map(Descomposicion._resolver_cluster, *zip(*tareas)))
+        else:
+            soluciones = [Descomposicion._resolver_cluster(*tarea) for tarea in tareas]
+        if perfil: t = perfil.fase('subproblemas', t)
+
+        ciclos = [cluster[orden] for cluster, (orden, _) in zip(clusters, soluciones)]
+        self.parada.contar(sum(evaluaciones for _, evaluaciones in soluciones))
+        tour = self.unir(ciclos)
+        distancia = Utilidades.calcular_distancia_total(tour, self.distancias)
+        if perfil: t = perfil.fase('union', t)
+        if logger: logger.registrar_evento(f"Subtours unidos ({procesos} procesos): {distancia}")
+
+        # Reparación de las costuras: empiezan en la cola las ciudades con algún candidato en otro cluster
+        reparacion = BusquedaLocalDLB(tour, distancia, self.distancias, self.parada.restante(self.params), self.candidatos)
+        cluster_de = np.empty(len(tour), dtype=np.int64)
+        for i, cluster in enumerate(clusters):
+            cluster_de[cluster] = i
+        frontera = np.flatnonzero((cluster_de[reparacion.candidatos.vecinos] != cluster_de[:, None]).any(axis=1))
+        tour, distancia = reparacion.resolver(semilla, activas=frontera)
+        self.parada.contar(reparacion.parada.evaluaciones)
+        if perfil:
+            perfil.fase('reparacion', t)
+            perfil.contar('clusters', len(clusters))
+            perfil.contar('frontera', len(frontera))
+            perfil.contar('evaluaciones', self.parada.evaluaciones)
+        if logger: logger.registrar_evento(f"Costuras reparadas desde {len(frontera)} ciudades de frontera: {distancia}")
+
+        return tour, distancia
@@ -1,36 +1,46 @@
 import random
 import numpy as np
+from scipy.spatial import cKDTree
 
+from utils.parada import CriterioParada
 from utils.utilidades import Utilidades
 
 class GreedyAleatorio:
-    def __init__(self, matriz_distancias, params):
+    def __init__(self, distancias, params, candidatos=None):
         """
         Inicializa el algoritmo Greedy Aleatorio.
 
-        :param matriz_distancias: Matriz de distancias entre las ciudades.
+        :param distancias: Proveedor de distancias entre las ciudades (ver utils.distancias).
         :param params: Parámetros del archivo de configuración.
+        :param candidatos: Lista de vecinos más cercanos de la instancia, necesaria para rcl_greedy = vecino_cercano.
         """
-        self.matriz_distancias = matriz_distancias
+        self.distancias = distancias
+        self.params = params
         self.k = params['k']
+        self.rcl = params.get('rcl_greedy', 'prometedoras')
+        self.candidatos = candidatos
 
-    def resolver(self, semilla, logger=None):
+    def resolver(self, semilla, logger=None, perfil=None):
         """
         Resuelve el problema utilizando el algoritmo Greedy Aleatorio con una semilla específica.
 
         :param semilla: Semilla para el generador aleatorio.
+        :param perfil: Perfilador (utils.perfilado.Perfilador) o None si el perfilado está desactivado.
         :return: Lista de ciudades en el orden del tour y la distancia total del tour.
         """
         random.seed(semilla)  # Establece la semilla para la aleatoriedad
-        num_ciudades = self.matriz_distancias.shape[0]  # Número de ciudades
+        self.parada = parada = CriterioParada.desde_params(self.params)  # Solo se aplica el límite de tiempo
+        num_ciudades = self.distancias.shape[0]  # Número de ciudades
         visitadas = np.zeros(num_ciudades, dtype=bool)  # Lista booleana de ciudades visitadas
         tour = []
 
         # Precomputar las sumas de distancias para todas las ciudades
-        suma_distancias = np.sum(self.matriz_distancias, axis=1)
+        if perfil: t = perfil.ahora()
+        suma_distancias = self.distancias.suma_distancias()
 
         # Ordenar las ciudades por la suma de sus distancias al resto
         sorted_indices = np.argsort(suma_distancias)
+        if perfil: t = perfil.fase('ordenar_ciudades', t)
 
         # Seleccionar la ciudad inicial aleatoriamente entre las K más prometedoras
         ciudades_prometedoras = sorted_indices[:self.k]
@@ -41,28 +51,128 @@ class GreedyAleatorio:
 
         if logger: logger.registrar_evento(f"Ciudad de Inicio: {ciudad_actual}, Distancia recorrida = {acumulada}")
 
+        # Los mensajes de cada paso solo se construyen si el log está en nivel de depuración
+        depurar = logger is not None and logger.depuracion
+
+        if self.rcl == 'vecino_cercano' and self.candidatos is not None and self.candidatos.coordenadas is not None:
+            rcl = ListaRestringidaCercanas(self.candidatos.coordenadas, visitadas)
+        else:
+            rcl = ListaRestringidaPrometedoras(sorted_indices)
+        rcl.visitar(ciudad_actual)
+
         for _ in range(num_ciudades - 1):
-            # Obtener las ciudades no visitadas
-            no_visitadas = np.where(~visitadas)[0]
+            if parada.agotado():
+                # Se completa el tour con las ciudades pendientes en orden de prometedoras
+                if logger: logger.registrar_evento(f"Parada por {parada.motivo}, se completa el tour sin aleatoriedad.")
+                tour.extend(sorted_indices[~visitadas[sorted_indices]].tolist())
+                break
 
             # Obtener las K ciudades más prometedoras entre las no visitadas
-            k_mejores_ciudades = sorted_indices[np.isin(sorted_indices, no_visitadas)][:self.k]
-            if logger: logger.registrar_evento(f"{self.k} ciudades más prometedoras: {k_mejores_ciudades}")
+            k_mejores_ciudades = rcl.mejores(self.k, ciudad_actual)
+            if depurar: logger.depurar("%s ciudades más prometedoras: %s", self.k, k_mejores_ciudades)
 
             # Elegir aleatoriamente una ciudad de las K más prometedoras
             siguiente_ciudad = random.choice(k_mejores_ciudades)
 
             # Sumo la distancia acumulada
-            acumulada += self.matriz_distancias[ciudad_actual][siguiente_ciudad]
+            acumulada += self.distancias[ciudad_actual, siguiente_ciudad]
 
             # Actualizar el tour y marcar la ciudad como visitada
             tour.append(siguiente_ciudad)
             visitadas[siguiente_ciudad] = True
+            rcl.visitar(siguiente_ciudad)
             ciudad_actual = siguiente_ciudad
 
-            if logger: logger.registrar_evento(f"Viajando a ciudad: {ciudad_actual}, Distancia recorrida = {acumulada}")
+            if depurar: logger.depurar("Viajando a ciudad: %s, Distancia recorrida = %s", ciudad_actual, acumulada)
+
+        if perfil:
+            t = perfil.fase('construccion', t)
+            perfil.contar('pasos', len(tour) - 1)
 
         # Calcular la distancia total del tour
-        distancia_total = Utilidades.calcular_distancia_total(np.array(tour), self.matriz_distancias)
+        distancia_total = Utilidades.calcular_distancia_total(np.array(tour), self.distancias)
         if logger: logger.registrar_evento(f"Vuelta a ciudad de Inicio, Distancia recorrida = {distancia_total}")
-        return tour, distancia_total
\ No newline at end of file
+        return tour, distancia_total
+
+
+class ListaRestringidaPrometedoras:
+    def __init__(self, sorted_indices):
+        """
+        Mantiene de forma incremental las ciudades no visitadas en el orden de sorted_indices.
+
+        Cada posición apunta a la siguiente posición no visitada (con compresión de caminos), de modo que
+        obtener las K primeras no visitadas cuesta O(K) amortizado en lugar de recorrer todas las ciudades.
+
+        :param sorted_indices: Ciudades ordenadas de más a menos prometedora.
+        """
+        self.sorted_indices = sorted_indices
+        self.rango = np.empty(len(sorted_indices), dtype=np.int64)
+        self.rango[sorted_indices] = np.arange(len(sorted_indices))
+        self.rango = self.rango.tolist()
+        self.siguiente = list(range(len(sorted_indices) + 1))  # La última posición es el centinela
+
+    def buscar(self, posicion):
+        """Devuelve la primera posición no visitada a partir de la dada."""
+        raiz = posicion
+        while self.siguiente[raiz] != raiz:
+            raiz = self.siguiente[raiz]
+
+        # Compresión de caminos
+        while self.siguiente[posicion] != raiz:
+            self.siguiente[posicion], posicion = raiz, self.siguiente[posicion]
+
+        return raiz
+
+    def visitar(self, ciudad):
+        """Saca una ciudad de la lista de no visitadas."""
+        posicion = self.rango[ciudad]
+        self.siguiente[posicion] = posicion + 1
+
+    def mejores(self, k, ciudad_actual=None):
+        """Devuelve las K ciudades no visitadas más prometedoras."""
+        posiciones = []
+        posicion = self.buscar(0)
+        while len(posiciones) < k and posicion < len(self.sorted_indices):
+            posiciones.append(posicion)
+            posicion = self.buscar(posicion + 1)
+        return self.sorted_indices[posiciones]
+
+
+class ListaRestringidaCercanas:
+    def __init__(self, coordenadas, visitadas):
+        """
+        Lista restringida formada por las K ciudades no visitadas más cercanas a la ciudad actual.
+
+        Usa un KD-tree que se reconstruye solo con las ciudades pendientes cada vez que la mitad de sus
+        puntos ya han sido visitados, por lo que cada consulta encuentra enseguida K ciudades libres.
+
+        :param coordenadas: Array (n, 2) con las coordenadas de las ciudades.
+        :param visitadas: Array booleano de ciudades visitadas (compartido con el algoritmo).
+        """
+        self.coordenadas = coordenadas
+        self.visitadas = visitadas
+        self.reconstruir()
+
+    def reconstruir(self):
+        """Construye el KD-tree con las ciudades que aún no se han visitado."""
+        self.ids = np.flatnonzero(~self.visitadas)
+        self.arbol = cKDTree(self.coordenadas[self.ids]) if len(self.ids) else None
+        self.visitadas_en_arbol = 0
+
+    def visitar(self, ciudad):
+        """Cuenta la ciudad visitada y reconstruye el árbol cuando está medio vacío."""
+        self.visitadas_en_arbol += 1
+        if 2 * self.visitadas_en_arbol > len(self.ids):
+            self.reconstruir()
+
+    def mejores(self, k, ciudad_actual):
+        """Devuelve las K ciudades no visitadas más cercanas a la ciudad actual."""
+        consulta = k
+        while True:
+            consulta = min(consulta, len(self.ids))
+            _, indices = self.arbol.query(self.coordenadas[ciudad_actual], k=[*range(1, consulta + 1)])
+            cercanas = self.ids[indices]
+            cercanas = cercanas[~self.visitadas[cercanas]]
+            if len(cercanas) >= k or consulta == len(self.ids):
+                return cercanas[:k]
+            consulta *= 2
@@ -0,0 +1,205 @@
+from collections import deque
+
+import numpy as np
+
+from utils.candidatos import ListaCandidatos
+from utils.parada import CriterioParada
+from utils.reinicios import Reinicio
+from utils.tour_dos_niveles import TourDosNiveles
+
+
+class LinKernighan:
+    # Mejora mínima para aceptar una cadena (evita ciclos por errores de redondeo)
+    EPSILON = 1e-9
+
+    def __init__(self, tour_inicial, distancia_inicial, distancias, params, candidatos=None):
+        """
+        Inicializa el algoritmo Lin-Kernighan de profundidad acotada (encadenado con perturbaciones).
+
+        Cada paso de la cadena es un movimiento 2-opt que quita el arco (t1, t2) y un arco (t3, t4) y añade
+        (t2, t3) y (t4, t1), con t3 candidato de t2. La cadena sigue desde t4 mientras la ganancia parcial
+        (arcos quitados menos añadidos, sin el de cierre) sea positiva y no se supere profundidad_lk, y al
+        final se deshacen los pasos posteriores al mejor cierre. Así se encuentran mejoras de 3-opt y
+        superiores que ningún movimiento simple alcanza por sí solo. Las ciudades a examinar se llevan con
+        don't-look bits, y tras el óptimo local se aplican perturbaciones_lk double-bridge desde el mejor tour.
+
+        :param tour_inicial: Solución del algoritmo Greedy Aleatorio.
+        :param distancia_inicial: Distancia de la ruta.
+        :param distancias: Proveedor de distancias entre las ciudades (ver utils.distancias).
+        :param params: Parámetros del archivo de configuración.
+        :param candidatos: Lista de vecinos más cercanos de la instancia (utils.candidatos.ListaCandidatos).
+        """
+        self.tour_actual = TourDosNiveles.crear(tour_inicial, params)  # Copia propia: los pasos se aplican en el sitio
+        self.distancias = distancias
+        self.distancia_actual = distancia_inicial
+        self.params = params
+        self.profundidad = params.get('profundidad_lk', 10)
+        self.amplitud = params.get('amplitud_lk', 5)
+        self.perturbaciones = params.get('perturbaciones_lk', 100)
+
+        # Los arcos nuevos solo se buscan entre cada ciudad y sus vecinos más cercanos
+        if candidatos is None:
+            coordenadas = getattr(distancias, 'coordenadas', None)
+            candidatos = ListaCandidatos(coordenadas, params.get('num_candidatos', 10), distancias=distancias)
+        self.candidatos = candidatos
+
+    def dos_opt(self, a, b, c, d):
+        """
+        Sustituye los arcos (a, b) y (c, d) por (a, c) y (b, d). b sigue a 'a' en el mismo sentido en
+        que d sigue a c, de modo que basta invertir el camino entre b y c.
+        """
+        if self.tour_actual.siguiente(a) == b:
+            self.tour_actual.invertir_tramo(b, c)
+        else:
+            self.tour_actual.invertir_tramo(c, b)
+
+    def cadena(self, t1, t2, alternativa):
+        """
+        Construye una cadena de pasos desde el arco (t1, t2) y deja aplicada la parte hasta el mejor cierre.
+
+        :param t1: Ciudad de inicio de la cadena.
+        :param t2: Vecina de t1 en el tour; el arco (t1, t2) es el primero que se quita.
+        :param alternativa: Posición, por ganancia, del t3 elegido en el primer paso (en los demás, el mejor).
+        :return: Ganancia y ciudades cuyos arcos han cambiado; (0, None) si no mejora; None si no hay
+                 tantas alternativas válidas en el primer paso.
+        """
+        tour, d = self.tour_actual, self.distancias
+        g = float(d[t1, t2])
+        mejor_ganancia, mejor_pasos = LinKernighan.EPSILON, 0
+        pasos, anadidos = [], set()
+
+        for profundidad in range(self.profundidad):
+            # t4 sigue a t3 en el mismo sentido en que t1 sigue a t2
+            t3 = self.candidatos.vecinos[t2]
+            t4 = tour.siguientes(t3) if tour.siguiente(t2) == t1 else tour.anteriores(t3)
+            parcial = g - d[np.full(len(t3), t2), t3]
+            abierta = parcial + d[t3, t4]  # Se elige el paso que más deja para cerrar (|x2| - |y1|)
+            validos = (parcial > LinKernighan.EPSILON) & (t3 != t1) & (t4 != t2) & (t4 != t1)
+            orden = [k for k in np.argsort(-abierta).tolist() if validos[k] and (min(t3[k], t4[k]), max(t3[k], t4[k])) not in anadidos]
+
+            eleccion = alternativa if profundidad == 0 else 0
+            if eleccion >= len(orden):
+                if profundidad == 0:
+                    return None
+                break
+            k = orden[eleccion]
+            c3, c4 = int(t3[k]), int(t4[k])
+
+            self.dos_opt(t2, t1, c3, c4)
+            pasos.append((t2, c3, c4))
+            anadidos.add((min(t2, c3), max(t2, c3)))
+            self.parada.contar(len(t3))
+
+            g = float(abierta[k])
+            ganancia = g - float(d[c4, t1])
+            if ganancia > mejor_ganancia:
+                mejor_ganancia, mejor_pasos = ganancia, len(pasos)
+            t2 = c4
+
+        # Se deshacen en orden inverso los pasos posteriores al mejor cierre
+        for a, c, e in reversed(pasos[mejor_pasos:]):
+            self.dos_opt(a, c, t1, e)
+        if mejor_pasos == 0:
+            return 0.0, None
+
+        tocadas = {t1}
+        for a, c, e in pasos[:mejor_pasos]:
+            tocadas.update((a, c, e))
+        return mejor_ganancia, tocadas
+
+    def mejorar_ciudad(self, t1):
+        """
+        Busca una cadena de mejora desde t1, quitando primero el arco con su siguiente o con su anterior.
+        En el primer paso se prueban hasta amplitud_lk alternativas; en los demás, solo la mejor.
+
+        :param t1: Ciudad a examinar.
+        :return: (ganancia, ciudades cuyos arcos han cambiado), o None si no hay cadena de mejora.
+        """
+        for t2 in (self.tour_actual.siguiente(t1), self.tour_actual.anterior(t1)):
+            for alternativa in range(self.amplitud):
+                resultado = self.cadena(t1, int(t2), alternativa)
+                if resultado is None:
+                    break  # No quedan alternativas válidas para este t2
+                if resultado[1] is not None:
+                    return resultado
+        return None
+
+    def optimo_local(self, activas, rng, logger=None, perfil=None):
+        """
+        Aplica cadenas de mejora hasta que ninguna ciudad de la cola mejora (don't-look bits).
+
+        :param activas: Ciudades que empiezan en la cola.
+        :param rng: Generador aleatorio de NumPy (orden inicial de la cola).
+        :return: False si se ha cumplido un criterio de parada antes de vaciar la cola.
+        """
+        n = len(self.tour_actual)
+        cola = deque(rng.permutation(activas).tolist())
+        en_cola = np.zeros(n, dtype=bool)
+        en_cola[list(cola)] = True
+
+        while cola:
+            if self.parada.agotado(self.distancia_actual):
+                return False
+
+            ciudad = cola.popleft()
+            en_cola[ciudad] = False
+            if perfil: t = perfil.ahora()
+            mejora = self.mejorar_ciudad(ciudad)
+            if perfil: perfil.fase('cadenas', t)
+            if mejora is None:
+                continue
+
+            ganancia, tocadas = mejora
+            self.distancia_actual -= ganancia
+            if perfil: perfil.contar('mejoras')
+            for tocada in tocadas:
+                if not en_cola[tocada]:
+                    en_cola[tocada] = True
+                    cola.append(tocada)
+        return True
+
+    def resolver(self, semilla, logger=None, perfil=None):
+        """
+        Resuelve el problema con Lin-Kernighan encadenado con una semilla específica.
+
+        :param semilla: Semilla para el generador aleatorio (orden de la cola y perturbaciones).
+        :param perfil: Perfilador (utils.perfilado.Perfilador) o None si el perfilado está desactivado.
+        :return: Lista de ciudades en el orden del tour y la distancia total del tour.
+        """
+        rng = np.random.default_rng(semilla)
+        n = len(self.tour_actual)
+        self.parada = parada = CriterioParada.desde_params(self.params)  # Tiempo, evaluaciones y distancia objetivo
+
+        if logger: logger.registrar_evento(f"Partimos de la solución del Greedy Aleatorio: {self.distancia_actual}")
+
+        completo = self.optimo_local(np.arange(n), rng, logger, perfil)
+        mejor_ciudades, mejor_distancia = self.tour_actual.ciudades.copy(), self.distancia_actual
+        if logger: logger.registrar_evento(f"Óptimo local Lin-Kernighan: {mejor_distancia}")
+
+        for perturbacion in range(self.perturbaciones if completo else 0):
+            if parada.agotado(mejor_distancia):
+                if logger: logger.registrar_evento(f"Parada por {parada.motivo}.")
+                break
+
+            # Double-bridge desde el mejor tour; solo se examinan las ciudades con algún arco nuevo
+            if perfil: t = perfil.ahora()
+            ciudades, distancia = Reinicio.doble_puente(mejor_ciudades, mejor_distancia, self.distancias, rng)
+            siguiente_antes, siguiente_despues = np.empty(n, dtype=np.int64), np.empty(n, dtype=np.int64)
+            siguiente_antes[mejor_ciudades] = np.roll(mejor_ciudades, -1)
+            siguiente_despues[ciudades] = np.roll(ciudades, -1)
+            cambiadas = np.flatnonzero(siguiente_antes != siguiente_despues)
+            activas = np.union1d(cambiadas, siguiente_despues[cambiadas])
+            self.tour_actual = TourDosNiveles.crear(ciudades, self.params)
+            self.distancia_actual = distancia
+            if perfil:
+                perfil.fase('perturbacion', t)
+                perfil.contar('perturbaciones')
+
+            self.optimo_local(activas, rng, logger, perfil)
+            if self.distancia_actual < mejor_distancia - LinKernighan.EPSILON:
+                mejor_ciudades, mejor_distancia = self.tour_actual.ciudades.copy(), self.distancia_actual
+                if logger: logger.registrar_evento(f"Perturbación {perturbacion + 1}: nueva mejor solución {mejor_distancia}")
+
+        if perfil: perfil.contar('evaluaciones', parada.evaluaciones)
+        if logger: logger.registrar_evento(f"Mejor solución Lin-Kernighan: {mejor_distancia}")
+        return mejor_ciudades, mejor_distancia
@@ -0,0 +1,159 @@
+import multiprocessing
+import tempfile
+import time
+
+import numpy as np
+
+from algoritmos.AlgTA_Clase01_Grupo06 import AlgoritmoTabu
+from utils.elite_compartida import EliteCompartida
+from utils.instancia_compartida import InstanciaCompartida
+from utils.parada import CriterioParada
+from utils.utilidades import Utilidades
+
+
+class IntercambioIslas:
+    def __init__(self, elite, isla, intervalo):
+        """
+        Intercambio periódico de una isla con las demás a través de la élite compartida.
+
+        :param elite: Élites de todas las islas (utils.elite_compartida.EliteCompartida).
+        :param isla: Índice de esta isla.
+        :param intervalo: Iteraciones del Algoritmo Tabú entre intercambios.
+        """
+        self.elite = elite
+        self.isla = isla
+        self.intervalo = intervalo
+
+    def intercambiar(self, algoritmo):
+        """
+        Publica la mejor solución de la isla, suma a su MLP los arcos de las élites de las demás y adopta
+        la mejor de ellas si supera a la propia.
+
+        :param algoritmo: AlgoritmoTabu de esta isla.
+        :return: True si la isla ha adoptado la élite de otra.
+        """
+        self.elite.publicar(self.isla, algoritmo.mejor_global.ciudades, algoritmo.distancia_mejor_global, algoritmo.parada.evaluaciones)
+        tours, distancias = self.elite.leer()
+        otras = [isla for isla in range(len(distancias)) if isla != self.isla and np.isfinite(distancias[isla])]
+
+        # Los arcos de las élites ajenas cuentan en la MLP como si hubieran estado en el tour todo el intervalo
+        for isla in otras:
+            algoritmo.mlp.reforzar(tours[isla], np.roll(tours[isla], -1), self.intervalo)
+
+        if not otras:
+            return False
+        mejor = min(otras, key=lambda isla: distancias[isla])
+        if distancias[mejor] >= algoritmo.distancia_mejor_global:
+            return False
+
+        algoritmo.adoptar(tours[mejor], float(distancias[mejor]))
+        return True
+
+
+class AlgoritmoTabuIslas:
+    def __init__(self, tour_inicial, distancia_inicial, distancias, params, candidatos=None, nombre='instancia'):
+        """
+        Inicializa el Algoritmo Tabú en paralelo con modelo de islas.
+
+        Cada isla es un proceso que ejecuta AlgoritmoTabu con su propia semilla y su propia oscilación
+        estratégica. Cada intervalo_intercambio iteraciones publica su mejor tour en memoria compartida,
+        refuerza en su MLP los arcos de las élites de las demás y adopta la mejor si supera a la suya.
+
+        :param tour_inicial: Solución del algoritmo Greedy Aleatorio.
+        :param distancia_inicial: Distancia de la ruta.
+        :param distancias: Proveedor de distancias entre las ciudades (ver utils.distancias).
+        :param params: Parámetros del archivo de configuración.
+        :param candidatos: Lista de vecinos más cercanos de la instancia (utils.candidatos.ListaCandidatos).
+        :param nombre: Nombre de la instancia (para los ficheros compartidos con las islas).
+        """
+        self.tour_inicial = np.asarray(tour_inicial, dtype=np.int32)
+        self.distancia_inicial = distancia_inicial
+        self.distancias = distancias
+        self.params = params
+        self.candidatos = candidatos
+        self.nombre = nombre
+
+        # num_islas = 0 usa todos los núcleos disponibles (dentro del grupo del Ejecutor, solo su parte). Un valor
+        # explícito se respeta siempre: el número de islas decide sus semillas y su oscilación estratégica
+        num_islas = params.get('num_islas', 0)
+        self.num_islas = num_islas if num_islas > 0 else Utilidades.procesos_internos(0, params)
+        self.intervalo = params.get('intervalo_intercambio', 100)
+
+    def parametros_isla(self, isla):
+        """
+        Parámetros de una isla: la oscilación estratégica se reparte entre 0.1 y 0.9 para que unas islas
+        diversifiquen más y otras intensifiquen más.
+
+        :param isla: Índice de la isla.
+        :return: Copia de los parámetros con la oscilación de la isla.
+        """
+        if self.num_islas == 1:
+            return self.params
+        return dict(self.params, oscilacion_estrategica=0.1 + 0.8 * isla / (self.num_islas - 1))
+
+    def resolver(self, semilla, logger=None, perfil=None):
+        """
+        Lanza las islas, espera a que terminen y devuelve la mejor élite.
+
+        :param semilla: Semilla base; la isla i usa semilla + i.
+        :param perfil: Perfilador (utils.perfilado.Perfilador) o None si el perfilado está desactivado.
+        :return: Lista de ciudades en el orden del tour y la distancia total del tour.
+        """
+        self.parada = CriterioParada.desde_params(self.params)  # Solo acumula las evaluaciones de las islas
+
+        if logger: logger.registrar_evento(f"Partimos de la solución del Greedy Aleatorio: {self.distancia_inicial}")
+        if logger: logger.registrar_evento(f"Lanzando {self.num_islas} islas con intercambio cada {self.intervalo} iteraciones.")
+        nucleos = Utilidades.procesos_internos(0, self.params)
+        if logger and self.num_islas > nucleos:
+            logger.registrar_evento(f"Aviso: {self.num_islas} islas para {nucleos} núcleos disponibles; las islas compartirán núcleos.")
+
+        # spawn en todos los sistemas: los procesos no heredan los hilos del log ni el estado del padre
+        contexto = multiprocessing.get_context('spawn')
+        elite = EliteCompartida(self.num_islas, len(self.tour_inicial), contexto.Lock())
+        try:
+            with tempfile.TemporaryDirectory(prefix='islas_') as directorio:
+                if perfil: t = perfil.ahora()
+                instancia = InstanciaCompartida(self.nombre, self.distancias, self.candidatos, directorio)
+                # Las islas van en paralelo: se reparten las evaluaciones restantes y todas terminan a la misma
+                # hora de reloj (el arranque de cada proceso también consume el tiempo restante)
+                fin = time.time() + self.parada.restante(self.params)['tiempo_maximo'] if self.parada.tiempo_maximo else None
+                procesos = [contexto.Process(target=AlgoritmoTabuIslas._isla,
+                                             args=(instancia, elite, isla, self.tour_inicial, self.distancia_inicial,
+                                                   self.parada.restante(self.parametros_isla(isla), partes_evaluaciones=self.num_islas),
+                                                   semilla + isla, self.intervalo, fin))
+                            for isla in range(self.num_islas)]
+                for proceso in procesos:
+                    proceso.start()
+                for proceso in procesos:
+                    proceso.join()
+                if perfil: perfil.fase('islas', t)
+
+            fallidas = [isla for isla, proceso in enumerate(procesos) if proceso.exitcode != 0]
+            if fallidas:
+                raise RuntimeError(f"Las islas {fallidas} han terminado con error")
+
+            tours, distancias_islas = elite.leer()
+            self.parada.contar(int(elite.evaluaciones.sum()))
+        finally:
+            elite.cerrar()
+
+        if logger:
+            for isla, distancia in enumerate(distancias_islas):
+                logger.registrar_evento(f"Isla {isla} (semilla {semilla + isla}): {distancia}")
+        if perfil:
+            perfil.contar('evaluaciones', self.parada.evaluaciones)
+            perfil.contar('islas', self.num_islas)
+
+        mejor = int(np.argmin(distancias_islas))
+        return tours[mejor], float(distancias_islas[mejor])
+
+    @staticmethod
+    def _isla(instancia, elite, isla, tour_inicial, distancia_inicial, params, semilla, intervalo, fin=None):
+        """Punto de entrada del proceso de cada isla; fin es la hora de reloj a la que debe parar (o None)."""
+        distancias, candidatos = instancia.cargar()
+        if fin is not None:
+            params = dict(params, tiempo_maximo=max(fin - time.time(), CriterioParada.TIEMPO_MINIMO))
+        algoritmo = AlgoritmoTabu(tour_inicial, distancia_inicial, distancias, params, candidatos)
+        ciudades, distancia = algoritmo.resolver(semilla, intercambio=IntercambioIslas(elite, isla, intervalo))
+        elite.publicar(isla, ciudades, distancia, algoritmo.parada.evaluaciones)
+        elite.cerrar()
@@ -1,83 +1,138 @@
 import random
-from collections import deque  # Para la lista circular
+import numpy as np
+from utils.checkpoint import Checkpoint
+from utils.memoria_tabu import MemoriaCortoPlazo, MemoriaLargoPlazo
+from utils.operadores import Operador
+from utils.parada import CriterioParada
+from utils.reinicios import Reinicio
+from utils.tour import Tour
 from utils.utilidades import Utilidades
 
 class AlgoritmoTabu:
-    def __init__(self, tour_inicial, distancia_inicial, matriz_distancias, params):
+    def __init__(self, tour_inicial, distancia_inicial, distancias, params, candidatos=None):
         """
         Inicializa el Algoritmo Tabú
 
         :param tour_inicial: Solución del algoritmo Greedy Aleatorio.
         :param distancia_inicial: Distancia de la ruta.
-        :param matriz_distancias: Matriz de distancias entre las ciudades.
+        :param distancias: Proveedor de distancias entre las ciudades (ver utils.distancias).
         :param params: Parámetros del archivo de configuración.
+        :param candidatos: Lista de vecinos más cercanos de la instancia (utils.candidatos.ListaCandidatos).
         """
-        self.tour_actual = tour_inicial
-        self.matriz_distancias = matriz_distancias
+        self.tour_actual = Tour(tour_inicial)  # Copia propia: los movimientos se aplican en el sitio
+        self.distancias = distancias
         self.distancia_actual = distancia_inicial
         self.params = params
 
-        # La lista circular mantendrá los últimos 20 movimientos
-        self.mcp_lista_tabu = deque(maxlen=params['tamano_lista_circular'])  # Lista circular para la MCP
-        self.mcp_tenencias = {}  # Diccionario para las tenencias de cada movimiento
-        self.mlp = {}  # Diccionario para la MLP
+        # Con entorno = candidatos los vecinos solo acercan ciudades a sus vecinos más próximos
+        self.candidatos = candidatos if params.get('entorno', 'aleatorio') == 'candidatos' else None
+        self.lista_candidatos = candidatos  # Para reconstruir el tour en los reinicios, sea cual sea el entorno
+
+        # Operador de movimiento elegido en config.txt (intercambio, 2opt u or_opt)
+        self.operador = Operador.crear(params)
+
+        # MCP: casillas prohibidas con su vencimiento y lista circular de tamaño tamano_lista_circular
+        self.mcp = MemoriaCortoPlazo(len(self.tour_actual), params['tenencia'], params['tamano_lista_circular'],
+                                     self.operador.kernels)
+
+        # MLP: frecuencia de cada arco, actualizada solo con los arcos que cambia cada movimiento
+        self.mlp = MemoriaLargoPlazo(len(self.tour_actual), candidatos)
+        self.mlp.establecer_tour(self.tour_actual.ciudades)
 
         # Inicializa las variables para el seguimiento de las mejores soluciones
-        self.mejor_momento_actual = tour_inicial.copy()  # Copia del tour inicial
-        self.mejor_global = tour_inicial.copy()  # Copia del tour inicial
+        self.mejor_momento_actual = self.tour_actual.copiar()  # Copia del tour inicial
+        self.mejor_global = self.tour_actual.copiar()  # Copia del tour inicial
         self.distancia_mejor_momento_actual = self.distancia_actual
         self.distancia_mejor_global = self.distancia_actual
 
-    def resolver(self, semilla, logger=None):
+    def resolver(self, semilla, logger=None, perfil=None, intercambio=None, checkpoint=None):
         """
         Resuelve el problema utilizando el Algoritmo Tabú con una semilla específica.
 
         :param semilla: Semilla para el generador aleatorio.
+        :param perfil: Perfilador (utils.perfilado.Perfilador) o None si el perfilado está desactivado.
+        :param intercambio: Intercambio de élites del modelo de islas (ver AlgTAIslas) o None si se ejecuta solo.
+        :param checkpoint: Checkpoint (utils.checkpoint.Checkpoint) de la ejecución o None; si tiene un
+                           estado guardado, la búsqueda continúa desde él con el mismo resultado.
         :return: Lista de ciudades en el orden del tour y la distancia total del tour.
         """
         random.seed(semilla)  # Establece la semilla para la aleatoriedad
+        rng = np.random.default_rng(semilla)  # Generador vectorizado para muestrear el entorno
         tamanio_entorno = int(self.params['iteraciones'] * self.params['per_tamanio'])
         cont = int(self.params['iteraciones'] * self.params['per_iteraciones'])
         ite = 0
         estancamiento_contador = 0
+        self.parada = parada = CriterioParada.desde_params(self.params)  # Tiempo, evaluaciones y distancia objetivo
 
         if logger: logger.registrar_evento(f"Partimos de la solución del Greedy Aleatorio: {self.distancia_actual}")
         if logger: logger.registrar_evento(f"Solucion actual = {self.distancia_actual} | Mejor momento actual = {self.distancia_mejor_momento_actual} | Mejor Global = {self.distancia_mejor_global}\n")
 
-        for iteracion in range(self.params['iteraciones']):
-            # Generar vecinos
-            vecinos_filtrados = []
-            for _ in range(tamanio_entorno):
-                vecino, nueva_distancia, i, j = Utilidades.generar_vecino(self.tour_actual, self.matriz_distancias, self.distancia_actual)
-                if self.movimiento_no_tabu((i, j)):
-                    vecinos_filtrados.append((vecino, nueva_distancia, (i, j)))
+        # Continuar desde el último checkpoint si lo hay
+        primera_iteracion = 0
+        estado = checkpoint.cargar_estado() if checkpoint else None
+        if estado:
+            primera_iteracion, tamanio_entorno, cont, ite, estancamiento_contador = self.restaurar_checkpoint(estado, rng)
+            if logger: logger.registrar_evento(f"Reanudando desde la iteración {primera_iteracion}: Mejor Global = {self.distancia_mejor_global}")
+
+        # Los mensajes de cada iteración solo se construyen si el log está en nivel de depuración
+        depurar = logger is not None and logger.depuracion
+
+        for iteracion in range(primera_iteracion, self.params['iteraciones']):
+            if parada.agotado(self.distancia_mejor_global):
+                if logger: logger.registrar_evento(f"Parada por {parada.motivo}.")
+                break
 
-            if logger: logger.registrar_evento(f"Iteración: {iteracion}, Tamaño del entorno: {tamanio_entorno}, Vecinos generados: {tamanio_entorno}")
+            # Generar y evaluar vecinos, descartando los movimientos tabú mediante una máscara
+            if perfil: t = perfil.ahora()
+            movimientos = self.operador.seleccionar_movimientos(tamanio_entorno, self.tour_actual, rng, self.candidatos)
+            if perfil: t = perfil.fase('generar_vecinos', t)
+            deltas = self.operador.evaluar(self.tour_actual.ciudades, self.distancias, movimientos)
+            if perfil: t = perfil.fase('evaluar', t)
+            parada.contar(len(deltas))
+            no_tabu = self.movimientos_no_tabu(movimientos[0], movimientos[1])
+            if perfil: t = perfil.fase('mascara_tabu', t)
+            if perfil:
+                perfil.contar('iteraciones')
+                perfil.contar('evaluaciones', len(deltas))
+
+            if depurar: logger.depurar("Iteración: %s, Tamaño del entorno: %s, Vecinos generados: %s", iteracion, tamanio_entorno, tamanio_entorno)
 
             # Buscar el mejor vecino
-            mejor_vecino = min(vecinos_filtrados, key=lambda x: x[1], default=(None, float('inf'), None))
-            nuevo_tour, nueva_distancia, movimiento = mejor_vecino
+            mejor = Utilidades.mejor_movimiento(deltas, no_tabu)
+            if mejor is None:
+                movimiento, nueva_distancia = None, float('inf')
+            else:
+                movimiento = tuple(int(componente[mejor]) for componente in movimientos)
+                nueva_distancia = self.distancia_actual + deltas[mejor]
+            if perfil: t = perfil.fase('elegir', t)
 
-            if logger: logger.registrar_evento(f"Mejor vecino (movimiento): {movimiento}, Distancia: {nueva_distancia}")
+            if depurar: logger.depurar("Mejor vecino (movimiento): %s, Distancia: %s", movimiento, nueva_distancia)
 
             # Actualizar memoria y manejar estancamiento
             if nueva_distancia < self.distancia_actual:
-                self.tour_actual = nuevo_tour
+                arcos_salen, arcos_entran = self.operador.arcos(self.tour_actual.ciudades, movimiento)
+                self.operador.aplicar(self.tour_actual, movimiento)  # Solo se aplica el movimiento ganador
                 self.distancia_actual = nueva_distancia
+                if perfil:
+                    perfil.fase('aplicar', t)
+                    perfil.contar('movimientos_aceptados')
 
                 # Actualizar mejor momento actual
-                self.mejor_momento_actual = nuevo_tour.copy()  # Copiar el nuevo tour
+                self.mejor_momento_actual.copiar_de(self.tour_actual)  # Copiar el nuevo tour sin reservar memoria
                 self.distancia_mejor_momento_actual = nueva_distancia
 
                 # Actualizar mejor global
                 if nueva_distancia < self.distancia_mejor_global:
-                    self.mejor_global = nuevo_tour.copy()  # Copiar el nuevo tour
+                    self.mejor_global.copiar_de(self.tour_actual)  # Copiar el nuevo tour sin reservar memoria
                     self.distancia_mejor_global = nueva_distancia
 
-                if logger: logger.registrar_evento(f"¡Mejora encontrada! Distancia actual: {nueva_distancia}")
+                if depurar: logger.depurar("¡Mejora encontrada! Distancia actual: %s", nueva_distancia)
 
-                self.actualizar_mcp(nuevo_tour, movimiento)
-                self.actualizar_mlp(nuevo_tour)
+                if perfil: t = perfil.ahora()
+                self.actualizar_mcp(self.tour_actual, movimiento)
+                if perfil: t = perfil.fase('mcp', t)
+                self.actualizar_mlp(arcos_salen, arcos_entran)
+                if perfil: perfil.fase('mlp', t)
                 estancamiento_contador = 0  # Reiniciar el contador de estancamiento
             else:
                 estancamiento_contador += 1
@@ -85,17 +140,78 @@ class AlgoritmoTabu:
             # Verificar si hay estancamiento
             if estancamiento_contador >= self.params['per_estancamiento'] * self.params['iteraciones']:
                 if logger: logger.registrar_evento("Estancamiento detectado, generando nueva solución...")
-                self.generar_nueva_solucion(logger)
+                if perfil: t = perfil.ahora()
+                self.generar_nueva_solucion(rng, logger)
+                if perfil:
+                    perfil.fase('reinicio', t)
+                    perfil.contar('reinicios')
                 estancamiento_contador = 0  # Reiniciar el contador de estancamiento
 
+            # En el modelo de islas, publicar la élite y traer la de otra isla si es mejor
+            if intercambio and (iteracion + 1) % intercambio.intervalo == 0:
+                if perfil: t = perfil.ahora()
+                if intercambio.intercambiar(self):
+                    if logger: logger.registrar_evento(f"Adoptada la élite de otra isla: {self.distancia_actual}")
+                    estancamiento_contador = 0
+                if perfil:
+                    perfil.fase('intercambio', t)
+                    perfil.contar('intercambios')
+
             # Reducir el tamaño del entorno cada 10% de iteraciones del total
             tamanio_entorno, cont, ite = Utilidades.reducir_entorno(tamanio_entorno, cont, iteracion, self.params['per_disminucion'], self.params['per_iteraciones'], ite)
             if tamanio_entorno < (self.params['per_disminucion'] * 100):
                 break
 
-            if logger: logger.registrar_evento(f"Solucion actual = {self.distancia_actual} | Mejor momento actual = {self.distancia_mejor_momento_actual} | Mejor Global = {self.distancia_mejor_global} | Estancamiento: {estancamiento_contador}\n")
+            if depurar: logger.depurar("Solucion actual = %s | Mejor momento actual = %s | Mejor Global = %s | Estancamiento: %s\n", self.distancia_actual, self.distancia_mejor_momento_actual, self.distancia_mejor_global, estancamiento_contador)
+
+            if checkpoint and checkpoint.toca():
+                self.guardar_checkpoint(checkpoint, rng, iteracion + 1, tamanio_entorno, cont, ite, estancamiento_contador)
+
+        return self.mejor_global.ciudades, self.distancia_mejor_global
+
+    def guardar_checkpoint(self, checkpoint, rng, iteracion, tamanio_entorno, cont, ite, estancamiento_contador):
+        """
+        Guarda el estado necesario para continuar la búsqueda en la iteración indicada: los tres tours,
+        sus distancias, la MCP, la MLP, los generadores aleatorios y los contadores del bucle.
+
+        :param checkpoint: Checkpoint de la ejecución.
+        :param rng: Generador aleatorio de NumPy de la búsqueda.
+        :param iteracion: Siguiente iteración a ejecutar.
+        """
+        arrays = {'tour_actual': self.tour_actual.ciudades, 'mejor_momento_actual': self.mejor_momento_actual.ciudades,
+                  'mejor_global': self.mejor_global.ciudades}
+        arrays_mcp, meta_mcp = self.mcp.estado()
+        arrays_mlp, meta_mlp = self.mlp.estado()
+        arrays.update({'mcp_' + nombre: array for nombre, array in arrays_mcp.items()})
+        arrays.update({'mlp_' + nombre: array for nombre, array in arrays_mlp.items()})
+
+        meta = {'iteracion': iteracion, 'tamanio_entorno': tamanio_entorno, 'cont': cont, 'ite': ite,
+                'estancamiento_contador': estancamiento_contador, 'distancia_actual': float(self.distancia_actual),
+                'distancia_mejor_momento_actual': float(self.distancia_mejor_momento_actual),
+                'distancia_mejor_global': float(self.distancia_mejor_global), 'evaluaciones': self.parada.evaluaciones,
+                'mcp': meta_mcp, 'mlp': meta_mlp, 'generadores': Checkpoint.estado_generadores(rng)}
+        checkpoint.guardar_estado(arrays, meta)
+
+    def restaurar_checkpoint(self, estado, rng):
+        """
+        Recupera el estado guardado por guardar_checkpoint.
 
-        return self.mejor_global, self.distancia_mejor_global
+        :return: Siguiente iteración, tamaño del entorno, contadores de reducción del entorno (cont, ite)
+                 y contador de estancamiento.
+        """
+        arrays, meta = estado
+        self.tour_actual = Tour(arrays['tour_actual'])
+        self.mejor_momento_actual = Tour(arrays['mejor_momento_actual'])
+        self.mejor_global = Tour(arrays['mejor_global'])
+        self.distancia_actual = meta['distancia_actual']
+        self.distancia_mejor_momento_actual = meta['distancia_mejor_momento_actual']
+        self.distancia_mejor_global = meta['distancia_mejor_global']
+        self.parada.reanudar(meta['evaluaciones'], meta['tiempo'])  # El presupuesto sigue desde donde se quedó
+
+        self.mcp.restaurar({nombre[4:]: array for nombre, array in arrays.items() if nombre.startswith('mcp_')}, meta['mcp'])
+        self.mlp.restaurar({nombre[4:]: array for nombre, array in arrays.items() if nombre.startswith('mlp_')}, meta['mlp'])
+        Checkpoint.restaurar_generadores(rng, meta['generadores'])
+        return meta['iteracion'], meta['tamanio_entorno'], meta['cont'], meta['ite'], meta['estancamiento_contador']
 
     def movimiento_no_tabu(self, movimiento):
         """
@@ -105,123 +221,132 @@ class AlgoritmoTabu:
         :return: True si el movimiento no es tabú, False en caso contrario.
         """
         i, j = movimiento
+        return not self.mcp.es_tabu(i, j)
 
-        # El par siempre se guarda en un orden consistente (i, j)
-        movimiento_tabu = (min(i, j), max(i, j))
-
-        # Verificar si el movimiento está en la lista tabú (circular)
-        for tabu in self.mcp_lista_tabu:
-            if tabu == movimiento_tabu:
-                # Si el movimiento está en la lista tabú, se considera prohibido
-                return False
+    def movimientos_no_tabu(self, movimientos_i, movimientos_j):
+        """
+        Versión vectorizada de movimiento_no_tabu para todo un entorno.
 
-        # Si no está en la lista tabú, el movimiento no es tabú
-        return True
+        :param movimientos_i: Array con el primer índice de cada movimiento.
+        :param movimientos_j: Array con el segundo índice de cada movimiento.
+        :return: Máscara booleana, True para los movimientos que no son tabú.
+        """
+        return self.mcp.mascara_no_tabu(movimientos_i, movimientos_j)
 
     def actualizar_mcp(self, nuevo_tour, movimiento):
         """
-        Actualiza la MCP (Memoria de Control de Prohibición) mediante la lista circular y el diccionario de tenencias.
+        Actualiza la MCP (Memoria de Control de Prohibición): caducan las tenencias cumplidas y se prohíben
+        las casillas del nuevo movimiento.
 
-        :param nuevo_tour: El nuevo tour generado.
-        :param movimiento: El movimiento realizado (índices i, j).
+        :param nuevo_tour: El nuevo tour generado (utils.tour.Tour).
+        :param movimiento: El movimiento realizado (sus dos primeras componentes son las posiciones i, j).
         """
-        # Reducir la tenencia de todos los movimientos prohibidos en la MCP
-        movimientos_a_eliminar = []
-        for casilla, tenencia in self.mcp_tenencias.items():
-            # Decrementar la tenencia de cada movimiento
-            self.mcp_tenencias[casilla] -= 1
-            # Si la tenencia llega a 0 o menos, marcar para eliminación
-            if self.mcp_tenencias[casilla] <= 0:
-                movimientos_a_eliminar.append(casilla)
-
-        # Eliminar los movimientos cuya tenencia ha caducado
-        for movimiento_eliminar in movimientos_a_eliminar:
-            del self.mcp_tenencias[movimiento_eliminar]
-            # También eliminar de la lista circular si está presente
-            if movimiento_eliminar in self.mcp_lista_tabu:
-                self.mcp_lista_tabu.remove(movimiento_eliminar)
-
-        # Actualizar la tenencia para el nuevo movimiento en la MCP
-        i, j = movimiento
-        ciudad_1, ciudad_2 = nuevo_tour[i], nuevo_tour[j]
+        i, j = movimiento[0], movimiento[1]
+        ciudad_1, ciudad_2 = int(nuevo_tour[i]), int(nuevo_tour[j])
 
-        # Crear las casillas que representan los pares (índice, ciudad) en la MCP
-        casilla_1 = (min(i, ciudad_1), max(i, ciudad_1))
-        casilla_2 = (min(j, ciudad_2), max(j, ciudad_2))
+        # Las casillas representan los pares (índice, ciudad) en la MCP
+        self.mcp.actualizar(((i, ciudad_1), (j, ciudad_2)))
 
-        # Establecer el valor de tenencia tabú para estos movimientos
-        tenencia_tabu = self.params['tenencia']
-        self.mcp_tenencias[casilla_1] = tenencia_tabu
-        self.mcp_tenencias[casilla_2] = tenencia_tabu
-
-        # Añadir los movimientos a la lista circular (lista tabú)
-        self.mcp_lista_tabu.append(casilla_1)
-        self.mcp_lista_tabu.append(casilla_2)
-
-        # Si la lista tabú excede el tamaño máximo, eliminar los movimientos más antiguos
-        while len(self.mcp_lista_tabu) > self.params['tamano_lista_circular']:
-            movimiento_mas_antiguo = self.mcp_lista_tabu.popleft()
-            # También eliminar la tenencia correspondiente si existe en el diccionario
-            if movimiento_mas_antiguo in self.mcp_tenencias:
-                del self.mcp_tenencias[movimiento_mas_antiguo]
-
-    def actualizar_mlp(self, nuevo_tour):
+    def actualizar_mlp(self, arcos_salen, arcos_entran):
         """
-        Actualiza la MLP (Memoria a Largo Plazo) incrementando los arcos visitados en el tour actual.
-        Utiliza un diccionario para almacenar los conteos de los arcos.
+        Actualiza la MLP (Memoria a Largo Plazo): todos los arcos del tour suman una visita, pero solo
+        se modifican los contadores de los arcos que el movimiento ha eliminado o creado.
 
-        :param nuevo_tour: La lista de ciudades del tour actual.
+        :param arcos_salen: Arcos eliminados por el movimiento (pares de ciudades).
+        :param arcos_entran: Arcos creados por el movimiento (pares de ciudades).
         """
-        # Recorrer el tour e incrementar el conteo de los arcos en el diccionario de la MLP
-        for k in range(len(nuevo_tour)):
-            origen = nuevo_tour[k]
-            destino = nuevo_tour[(k + 1) % len(nuevo_tour)]  # Asegura que el destino sea cíclico
+        self.mlp.actualizar(arcos_salen, arcos_entran)
 
-            # Crear la clave para el arco (ordenado de menor a mayor para consistencia)
-            arco = (min(origen, destino), max(origen, destino))
-
-            # Incrementar el conteo del arco en el diccionario
-            if arco in self.mlp:
-                self.mlp[arco] += 1
-            else:
-                self.mlp[arco] = 1
+    def adoptar(self, ciudades, distancia):
+        """
+        Sustituye el tour actual por una solución externa mejor (la élite de otra isla), que pasa a ser
+        también el mejor momento actual y el mejor global.
 
-    def generar_nueva_solucion(self, logger=None):
+        :param ciudades: Array de ciudades de la solución.
+        :param distancia: Distancia de la solución.
+        """
+        self.tour_actual = Tour(ciudades)
+        self.distancia_actual = distancia
+        self.mejor_momento_actual.copiar_de(self.tour_actual)
+        self.distancia_mejor_momento_actual = distancia
+        self.mejor_global.copiar_de(self.tour_actual)
+        self.distancia_mejor_global = distancia
+
+        # Los movimientos prohibidos se referían al tour anterior
+        self.mcp.limpiar()
+        self.mlp.establecer_tour(self.tour_actual.ciudades)
+
+    def generar_nueva_solucion(self, rng, logger=None):
         """
         Genera una nueva solución mediante oscilación estratégica (diversificación o intensificación).
         Utiliza la información de la MLP para influir en la estrategia elegida.
+
+        Con reinicio = estructurado ambas estrategias parten del mejor global y conservan casi todos sus
+        arcos: la diversificación aplica un double-bridge y la intensificación rompe los arcos menos
+        frecuentes en la MLP y reconecta los fragmentos. La distancia se actualiza con los arcos que
+        cambian. Con reinicio = aleatorio se reconstruye el tour al azar a partir de los arcos de la MLP.
+
+        :param rng: Generador aleatorio de NumPy (np.random.Generator).
         """
-        if random.random() < self.params['oscilacion_estrategica']:
-            if logger: logger.registrar_evento("Ejecutando diversificación.")
-            self.tour_actual = self.estrategia_diversificacion()
+        estructurado = self.params.get('reinicio', 'estructurado') == 'estructurado'
+        diversificar = random.random() < self.params['oscilacion_estrategica']
+
+        if logger: logger.registrar_evento("Ejecutando diversificación." if diversificar else "Ejecutando intensificación.")
+
+        if estructurado:
+            if diversificar:
+                ciudades, distancia = self.estrategia_doble_puente(rng)
+            else:
+                ciudades, distancia = self.estrategia_reconstruccion(rng)
+            self.tour_actual = Tour(ciudades)
+            self.distancia_actual = distancia
         else:
-            if logger: logger.registrar_evento("Ejecutando intensificación.")
-            self.tour_actual = self.estrategia_intensificacion()
+            self.tour_actual = Tour(self.estrategia_diversificacion() if diversificar else self.estrategia_intensificacion())
+            self.distancia_actual = Utilidades.calcular_distancia_total(self.tour_actual.ciudades, self.distancias)
 
         # Reiniciar solo la MCP
-        self.mcp_lista_tabu.clear()  # Limpiar la lista tabú
-        self.mcp_tenencias.clear()  # Limpiar el diccionario de tenencias
+        self.mcp.limpiar()
+
+        # La MLP sigue los arcos del nuevo tour
+        self.mlp.establecer_tour(self.tour_actual.ciudades)
 
-        # Reiniciar la distancia
-        self.distancia_actual = Utilidades.calcular_distancia_total(self.tour_actual, self.matriz_distancias)
         if logger: logger.registrar_evento(f"NUEVA SOLUCIÓN: {self.distancia_actual}")
 
+    def estrategia_doble_puente(self, rng):
+        """
+        Diversificación: perturbación double-bridge del mejor tour global.
+
+        :return: Array de ciudades del nuevo tour y su distancia.
+        """
+        return Reinicio.doble_puente(self.mejor_global.ciudades, self.distancia_mejor_global, self.distancias, rng)
+
+    def estrategia_reconstruccion(self, rng):
+        """
+        Intensificación: conserva los arcos del mejor tour global más frecuentes en la MLP y reconecta el resto.
+
+        :return: Array de ciudades del nuevo tour y su distancia.
+        """
+        ciudades = self.mejor_global.ciudades
+        frecuencias = self.mlp.frecuencias_arcos(ciudades, np.roll(ciudades, -1))
+        return Reinicio.reconstruir(ciudades, self.distancia_mejor_global, self.distancias, frecuencias,
+                                    self.params.get('per_reconstruccion', 0.1), rng, self.lista_candidatos)
+
     def estrategia_diversificacion(self):
         """
         Implementa la lógica de diversificación utilizando la información de la MLP.
-        Busca los arcos menos utilizados en mlp_diccionario para generar una nueva solución.
+        Busca los arcos menos utilizados en la MLP para generar una nueva solución.
         """
-        # Obtener los arcos menos utilizados
-        arcos_menos_usados = sorted(self.mlp.items(), key=lambda item: item[1])
+        # Obtener los 10 arcos menos utilizados (selección parcial, sin ordenar toda la memoria)
+        arcos_menos_usados = self.mlp.extremos(10, mas_usados=False)
         # Extraer las ciudades de los arcos menos utilizados utilizando conjuntos
-        ciudades_utilizadas = {ciudad for arco in arcos_menos_usados[:10] for ciudad in arco[0]}
+        ciudades_utilizadas = {ciudad for arco, _ in arcos_menos_usados for ciudad in arco}
 
         # Crear un nuevo tour aleatorio utilizando las ciudades menos usadas
         nuevas_ciudades = list(ciudades_utilizadas)
         random.shuffle(nuevas_ciudades)
 
         # Completar el tour con las ciudades que no están en las ciudades menos usadas
-        ciudades_restantes = set(self.tour_actual) - ciudades_utilizadas
+        ciudades_restantes = set(self.tour_actual.a_lista()) - ciudades_utilizadas
         nuevo_tour = nuevas_ciudades + list(ciudades_restantes)
 
         return nuevo_tour
@@ -229,19 +354,19 @@ class AlgoritmoTabu:
     def estrategia_intensificacion(self):
         """
         Implementa la lógica de intensificación utilizando la información de la MLP.
-        Busca los arcos más utilizados en mlp_diccionario para generar una nueva solución.
+        Busca los arcos más utilizados en la MLP para generar una nueva solución.
         """
-        # Obtener los arcos más utilizados
-        arcos_mas_usados = sorted(self.mlp.items(), key=lambda item: item[1], reverse=True)
+        # Obtener los 10 arcos más utilizados (selección parcial, sin ordenar toda la memoria)
+        arcos_mas_usados = self.mlp.extremos(10, mas_usados=True)
         # Extraer las ciudades de los arcos más utilizados utilizando conjuntos
-        ciudades_utilizadas = {ciudad for arco in arcos_mas_usados[:10] for ciudad in arco[0]}
+        ciudades_utilizadas = {ciudad for arco, _ in arcos_mas_usados for ciudad in arco}
 
         # Crear un nuevo tour aleatorio utilizando las ciudades más usadas
         nuevas_ciudades = list(ciudades_utilizadas)
         random.shuffle(nuevas_ciudades)
 
         # Completar el tour con las ciudades que no están en las ciudades más usadas
-        ciudades_restantes = set(self.tour_actual) - ciudades_utilizadas
+        ciudades_restantes = set(self.tour_actual.a_lista()) - ciudades_utilizadas
         nuevo_tour = nuevas_ciudades + list(ciudades_restantes)
 
         return nuevo_tour
\ No newline at end of file
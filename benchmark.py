@@ -0,0 +1,52 @@
+import argparse
+import os
+import sys
+
+from utils.benchmark import Benchmark
+from utils.procesar_configuracion import Configuracion
+from utils.utilidades import Utilidades
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prueba de rendimiento de los algoritmos (parámetros de config.txt).")
+    parser.add_argument('--repeticiones', type=int, default=3, help="Semillas por algoritmo e instancia.")
+    parser.add_argument('--tamanios', type=int, nargs='*', default=list(Benchmark.TAMANIOS), help="Tamaños de las instancias sintéticas.")
+    parser.add_argument('--tipos', nargs='*', default=list(Benchmark.TIPOS), help="Tipos de instancias sintéticas (uniforme, agrupada).")
+    parser.add_argument('--salida', default=os.path.join('benchmark', 'resultados.json'), help="Archivo JSON de resultados.")
+    parser.add_argument('--referencia', default=os.path.join('benchmark', 'referencia.json'), help="Archivo JSON de referencia.")
+    parser.add_argument('--umbral', type=float, default=0.10, help="Empeoramiento relativo tolerado respecto a la referencia.")
+    parser.add_argument('--guardar-referencia', action='store_true', help="Guarda estos resultados como nueva referencia.")
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    params = Configuracion(os.path.join(base_dir, 'config.txt')).procesar()
+
+    # Las mismas semillas que main.py, para que los resultados sean comparables
+    semillas = Utilidades.generar_semillas(params['dni'], args.repeticiones)
+
+    benchmark = Benchmark(params, semillas, args.tamanios, args.tipos)
+    datos = benchmark.ejecutar()
+    Benchmark.guardar(args.salida, datos)
+
+    print(f"\n===========================")
+    print(f"Resultados ({args.salida}):")
+    print(f"===========================")
+    Benchmark.imprimir_resumen(datos['resumen'])
+
+    if args.guardar_referencia:
+        Benchmark.guardar(args.referencia, datos)
+        print(f"\nReferencia guardada en {args.referencia}")
+        sys.exit(0)
+
+    referencia = Benchmark.cargar(args.referencia)
+    if referencia is None:
+        print(f"\nNo hay referencia en {args.referencia} (usa --guardar-referencia para crearla).")
+        sys.exit(0)
+
+    regresiones = Benchmark.comparar(datos['resumen'], referencia['resumen'], args.umbral)
+    if regresiones:
+        print(f"\nRegresiones (umbral {args.umbral:.0%}):")
+        for regresion in regresiones:
+            print(f"  {regresion}")
+        sys.exit(1)
+
+    print(f"\nSin regresiones respecto a la referencia (umbral {args.umbral:.0%}).")
@@ -1,14 +1,15 @@
-import sys, os, time
+import sys, os, multiprocessing
 
-from algoritmos.AlgGRE_Clase01_Grupo06 import GreedyAleatorio
-from algoritmos.AlgBL_Clase01_Grupo06 import BusquedaLocal
-from algoritmos.AlgTA_Clase01_Grupo06 import AlgoritmoTabu
 from utils.procesar_configuracion import Configuracion
 from utils.procesar_tsp import TSP
+from utils.cache_instancias import CacheInstancias
 from utils.utilidades import Utilidades
-from utils.crear_logs import Logger
+from utils.ejecutor import Ejecutor
+from utils.perfilado import Perfilador
 
 if __name__ == "__main__":
+    # Necesario para lanzar procesos desde el ejecutable de PyInstaller
+    multiprocessing.freeze_support()
 
     # Detectar si se está ejecutando en un entorno PyInstaller
     if getattr(sys, 'frozen', False):
@@ -37,63 +38,57 @@ if __name__ == "__main__":
     # Obtener la lista de archivos TSP desde la configuración
     archivos_tsp = params['archivos']
 
-    # Obtener la lista de algoritmos a ejecutar
-    algoritmos_a_ejecutar = params['algoritmos']
-
     # Crear logs solo si params['echo'] es False (antes era 'no')
     if not params['echo']:
         os.makedirs('logs', exist_ok=True)
 
-    # Procesar cada archivo TSP
+    # Caché en disco de coordenadas, distancias y candidatos (por hash del archivo)
+    cache = CacheInstancias(params.get('directorio_cache', 'cache')) if params.get('cache', False) else None
+
+    # Perfilado de las fases comunes (lectura de instancias); cada algoritmo lleva el suyo
+    perfil = Perfilador() if params.get('perfilado', False) else None
+
+    # Procesar cada archivo TSP una sola vez
+    instancias = []
     for archivo_tsp in archivos_tsp:
         ruta_archivo = os.path.join('data', archivo_tsp)  # Construye la ruta completa
-        tsp = TSP(ruta_archivo)  # Crea una instancia de TSP
-        matriz_distancias, tour_inicial = tsp.procesar()  # Procesa el archivo
+        if perfil: t = perfil.ahora()
+        tsp = TSP(ruta_archivo, params.get('umbral_matriz_densa'), params.get('num_candidatos'), cache, params.get('cache_matriz', False), params.get('distancia_tsplib', False))  # Crea una instancia de TSP
+        tsp.procesar()  # Procesa el archivo
+        if perfil: perfil.fase('procesar_tsp', t)
+        instancias.append((archivo_tsp, tsp))
         print(f"\n===========================")
         print(f"Procesado {archivo_tsp}:")
         print(f"===========================")
 
-        # Inicializar tour y distancia_total como None
-        tour = None
-        distancia_total = None
-
-        # Ejecutar los algoritmos listados en config.txt
-        for i, semilla in enumerate(semillas, start=1):
-            # Ejecutar Greedy Aleatorio si está en la lista de algoritmos
-            if 'greedy_aleatorio' in algoritmos_a_ejecutar or tour is None:
-                log_greedy = Logger(nombre_algoritmo="greedy_aleatorio", archivo_tsp={'nombre': archivo_tsp}, semilla=semilla, num_ejecucion=i, echo=params['echo'])
-                log_greedy.registrar_evento(f"Ejecutando Greedy Aleatorio con la semilla {semilla}:")
-                greedy_aleatorio = GreedyAleatorio(matriz_distancias, params)
-                start_time = time.time()
-                tour, distancia_total = greedy_aleatorio.resolver(semilla, logger=log_greedy)
-                execution_time = time.time() - start_time
-                log_greedy.registrar_evento(f"\nTour obtenido: {list(map(int, tour))}")
-                log_greedy.registrar_evento(f"Distancia total: {distancia_total}, Tiempo: {execution_time}")
-                log_greedy.cerrar_log()  # Solo cerrar si `echo` es False
-
-            # Ejecutar Búsqueda Local si está en la lista de algoritmos
-            if 'busqueda_local' in algoritmos_a_ejecutar:
-                log_bl = Logger(nombre_algoritmo="busqueda_local", archivo_tsp={'nombre': archivo_tsp}, semilla=semilla, num_ejecucion=i, echo=params['echo'])
-                log_bl.registrar_evento(f"Ejecutando Búsqueda Local del mejor con la semilla {semilla}:")
-                busqueda_local = BusquedaLocal(tour, distancia_total, matriz_distancias, params)
-                start_time = time.time()
-                tour_busqueda, distancia_busqueda = busqueda_local.resolver(semilla, logger=log_bl)
-                execution_time = time.time() - start_time
-                log_bl.registrar_evento(f"\nTour obtenido: {list(map(int, tour_busqueda))}")
-                log_bl.registrar_evento(f"Distancia total: {distancia_busqueda}, Tiempo: {execution_time}")
-                log_bl.cerrar_log()  # Solo cerrar si `echo` es False
-
-            # Ejecutar Algoritmo Tabú si está en la lista de algoritmos
-            if 'algoritmo_tabu' in algoritmos_a_ejecutar:
-                log_tabu = Logger(nombre_algoritmo="algoritmo_tabu", archivo_tsp={'nombre': archivo_tsp}, semilla=semilla, num_ejecucion=i, echo=params['echo'])
-                log_tabu.registrar_evento(f"Ejecutando Algoritmo Tabú con la semilla {semilla}:")
-                algoritmo_tabu = AlgoritmoTabu(tour, distancia_total, matriz_distancias, params)
-                start_time = time.time()
-                tour_tabu, distancia_tabu = algoritmo_tabu.resolver(semilla, logger=log_tabu)
-                execution_time = time.time() - start_time
-                log_tabu.registrar_evento(f"\nTour obtenido: {list(map(int, tour_tabu))}")
-                log_tabu.registrar_evento(f"Distancia total: {distancia_tabu}, Tiempo: {execution_time}")
-                log_tabu.cerrar_log()  # Solo cerrar si `echo` es False
+    # Ejecutar los algoritmos listados en config.txt para cada archivo y semilla (en paralelo si workers != 1)
+    ejecutor = Ejecutor(params, semillas)
+    resultados = ejecutor.ejecutar(instancias)
+
+    print(f"\n===========================")
+    print(f"Resumen ({ejecutor.workers} procesos):")
+    print(f"===========================")
+    for resultado in resultados:
+        print(f"{resultado['archivo']} | Ejecución {resultado['ejecucion']} (semilla {resultado['semilla']}) | "
+              f"{resultado['algoritmo']}: Distancia total: {resultado['distancia']}, Tiempo: {resultado['tiempo']}")
+
+    # Informe de perfilado: JSON con cada ejecución y tabla resumen por algoritmo
+    if perfil:
+        por_algoritmo = {}
+        for resultado in resultados:
+            if 'perfil' in resultado:  # Las ejecuciones reanudadas de un checkpoint sin perfilado no lo tienen
+                por_algoritmo.setdefault(resultado['algoritmo'], []).append(resultado['perfil'])
+        resumen = {algoritmo: Perfilador.agregar(informes) for algoritmo, informes in por_algoritmo.items()}
+
+        archivo_perfil = params.get('archivo_perfil', 'perfil.json')
+        Perfilador.guardar(archivo_perfil, {'general': perfil.informe(), 'algoritmos': resumen, 'ejecuciones': resultados})
+
+        print(f"\n===========================")
+        print(f"Perfilado ({archivo_perfil}):")
+        print(f"===========================")
+        Perfilador.imprimir_tabla("general", perfil.informe())
+        for algoritmo, informe in resumen.items():
+            Perfilador.imprimir_tabla(algoritmo, informe)
 
     # Pausa antes de salir
-    input("Presiona Enter para salir...")
\ No newline at end of file
+    input("Presiona Enter para salir...")
@@ -0,0 +1,36 @@
+import argparse
+import os
+
+from utils.ajuste import Ajuste
+from utils.benchmark import Benchmark
+from utils.procesar_configuracion import Configuracion
+from utils.utilidades import Utilidades
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ajuste de parámetros de config.txt por carreras (successive halving).")
+    parser.add_argument('--algoritmo', default='algoritmo_tabu', help="Algoritmo cuya distancia final se compara.")
+    parser.add_argument('--parametros', nargs='*', default=list(Ajuste.ESPACIO), help="Parámetros a ajustar (valores candidatos en Ajuste.ESPACIO).")
+    parser.add_argument('--configuraciones', type=int, default=27, help="Configuraciones que empiezan la carrera (incluida la de config.txt).")
+    parser.add_argument('--semillas', type=int, default=8, help="Semillas máximas por configuración e instancia.")
+    parser.add_argument('--semillas-iniciales', type=int, default=2, help="Semillas de la primera ronda.")
+    parser.add_argument('--eta', type=int, default=2, help="Factor de eliminación de cada ronda.")
+    parser.add_argument('--archivos', nargs='*', default=None, help="Archivos TSP de data/ (por defecto, los de config.txt).")
+    parser.add_argument('--tamanios', type=int, nargs='*', default=[], help="Tamaños de instancias sintéticas adicionales.")
+    parser.add_argument('--tipos', nargs='*', default=['uniforme'], help="Tipos de las instancias sintéticas (uniforme, agrupada).")
+    parser.add_argument('--salida', default=os.path.join('ajuste', 'mejores.json'), help="Archivo JSON de resultados.")
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    params = Configuracion(os.path.join(base_dir, 'config.txt')).procesar()
+
+    # Las mismas semillas que main.py: las primeras rondas usan las primeras
+    semillas = Utilidades.generar_semillas(params['dni'], args.semillas)
+
+    ajuste = Ajuste(params, semillas, args.algoritmo, args.parametros, args.configuraciones, args.semillas_iniciales, args.eta)
+    datos = ajuste.ejecutar(params['archivos'] if args.archivos is None else args.archivos, args.tamanios, args.tipos)
+    Benchmark.guardar(args.salida, datos)
+
+    print(f"\n===========================")
+    print(f"Mejores configuraciones ({args.salida}):")
+    print(f"===========================")
+    Ajuste.imprimir_resumen(datos)
@@ -0,0 +1,225 @@
+import itertools
+import math
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.benchmark import Benchmark
+from utils.cache_instancias import CacheInstancias
+from utils.ejecutor import Ejecutor
+from utils.instancia_compartida import InstanciaCompartida
+from utils.procesar_tsp import TSP
+
+
+class Ajuste:
+    # Valores candidatos de cada parámetro; las configuraciones se toman del producto cartesiano
+    ESPACIO = {
+        'k': (3, 5, 8),
+        'per_tamanio': (0.04, 0.08, 0.12),
+        'per_disminucion': (0.05, 0.10, 0.20),
+        'tenencia': (5, 10, 20),
+        'tamano_lista_circular': (10, 20, 40),
+        'oscilacion_estrategica': (0.3, 0.5, 0.7),
+    }
+
+    # Límites superiores de las clases de tamaño: se busca una configuración por clase
+    CLASES_TAMANIO = (1000, 10000, 100000)
+
+    def __init__(self, params, semillas, algoritmo='algoritmo_tabu', parametros=None, num_configuraciones=27,
+                 semillas_iniciales=2, eta=2, directorio_datos='data'):
+        """
+        Ajuste de parámetros de config.txt por carreras (successive halving).
+
+        En cada ronda se ejecutan las configuraciones que siguen vivas con las semillas de la ronda sobre las
+        instancias de una clase de tamaño, se ordenan por su distancia relativa a la mejor obtenida con cada
+        (instancia, semilla) y solo pasa a la siguiente ronda la mejor fracción 1/eta, que se evalúa con eta
+        veces más semillas. Así la mayor parte del tiempo se dedica a las configuraciones prometedoras y las
+        malas se descartan tras unas pocas ejecuciones. Los resultados de cada (configuración, instancia,
+        semilla) se guardan, de modo que cada ronda solo ejecuta las semillas nuevas.
+
+        :param params: Parámetros del archivo de configuración (valores de partida y del resto de parámetros).
+        :param semillas: Semillas disponibles, en el orden en que se van incorporando (ver Utilidades.generar_semillas).
+        :param algoritmo: Algoritmo cuya distancia final se compara.
+        :param parametros: Nombres de los parámetros a ajustar (por defecto, todos los de ESPACIO).
+        :param num_configuraciones: Configuraciones que empiezan la carrera (incluida la de config.txt).
+        :param semillas_iniciales: Semillas de la primera ronda.
+        :param eta: Factor de eliminación: pasa 1/eta de las configuraciones y se multiplican por eta las semillas.
+        :param directorio_datos: Directorio de los archivos TSP de config.txt.
+        """
+        self.semillas = semillas
+        self.algoritmo = algoritmo
+        self.parametros = list(parametros) if parametros else list(Ajuste.ESPACIO)
+        self.num_configuraciones = num_configuraciones
+        self.semillas_iniciales = min(semillas_iniciales, len(semillas))
+        self.eta = eta
+        self.directorio_datos = directorio_datos
+
+        for nombre in self.parametros:
+            if nombre not in Ajuste.ESPACIO:
+                raise ValueError(f"Parámetro sin valores candidatos: {nombre}")
+
+        # workers = 0 usa todos los núcleos disponibles
+        workers = params.get('workers', 1)
+        self.workers = workers if workers > 0 else os.cpu_count()
+
+        # procesos_ejecutor reparte los núcleos entre las ejecuciones simultáneas (ver Utilidades.procesos_internos)
+        self.params = dict(params, algoritmos=[algoritmo], echo=True, nivel_log='ninguno', workers=1,
+                           checkpoint=False, perfilado=False, procesos_ejecutor=self.workers)
+
+    @staticmethod
+    def clase_tamanio(num_ciudades):
+        """Nombre de la clase de tamaño de una instancia (p. ej. 'hasta_1000')."""
+        for limite in Ajuste.CLASES_TAMANIO:
+            if num_ciudades <= limite:
+                return f"hasta_{limite}"
+        return f"mas_de_{Ajuste.CLASES_TAMANIO[-1]}"
+
+    def configuraciones(self, rng):
+        """
+        Elige las configuraciones que empiezan la carrera: la de config.txt y una muestra sin repetición
+        del producto cartesiano de los valores candidatos.
+
+        :param rng: Generador aleatorio de NumPy.
+        :return: Lista de diccionarios {parámetro: valor}.
+        """
+        inicial = {nombre: self.params[nombre] for nombre in self.parametros}
+        rejilla = [dict(zip(self.parametros, valores)) for valores in itertools.product(*(Ajuste.ESPACIO[nombre] for nombre in self.parametros))]
+        rejilla = [configuracion for configuracion in rejilla if configuracion != inicial]
+
+        num_muestra = min(self.num_configuraciones - 1, len(rejilla))
+        elegidas = rng.choice(len(rejilla), size=num_muestra, replace=False)
+        return [inicial] + [rejilla[i] for i in sorted(elegidas)]
+
+    def instancias(self, archivos, tamanios, tipos, directorio):
+        """
+        Procesa las instancias de la carrera: las de config.txt que existan y las sintéticas (escritas en directorio).
+
+        :return: Lista de tuplas (nombre, utils.procesar_tsp.TSP ya procesado).
+        """
+        rutas = []
+        for archivo in archivos:
+            ruta = os.path.join(self.directorio_datos, archivo)
+            if os.path.exists(ruta):
+                rutas.append((archivo, ruta))
+            else:
+                print(f"Aviso: no se encuentra {ruta}, se omite.")
+
+        for tipo in tipos:
+            for tamanio in tamanios:
+                nombre = f"{tipo}_{tamanio}"
+                ruta = os.path.join(directorio, nombre + '.tsp')
+                Benchmark.escribir_tsp(ruta, nombre, Benchmark.generar_coordenadas(tipo, tamanio, semilla=tamanio))
+                rutas.append((nombre, ruta))
+
+        instancias = []
+        for nombre, ruta in rutas:
+            tsp = TSP(ruta, self.params.get('umbral_matriz_densa'), self.params.get('num_candidatos'), None, False, self.params.get('distancia_tsplib', False))
+            tsp.procesar()
+            instancias.append((nombre, tsp))
+        return instancias
+
+    def ejecutar(self, archivos, tamanios=(), tipos=('uniforme',), semilla=0):
+        """
+        Ejecuta una carrera por clase de tamaño.
+
+        :param archivos: Archivos TSP (en directorio_datos) sobre los que se ajusta.
+        :param tamanios: Números de ciudades de instancias sintéticas adicionales.
+        :param tipos: Distribuciones de las instancias sintéticas.
+        :param semilla: Semilla de la muestra de configuraciones.
+        :return: Diccionario serializable a JSON con la mejor configuración y las rondas de cada clase.
+        """
+        configuraciones = self.configuraciones(np.random.default_rng(semilla))
+        print(f"Carrera de {len(configuraciones)} configuraciones para {self.algoritmo} (parámetros: {', '.join(self.parametros)})")
+
+        with tempfile.TemporaryDirectory(prefix='ajuste_') as directorio:
+            instancias = self.instancias(archivos, tamanios, tipos, directorio)
+
+            clases = {}
+            for nombre, tsp in instancias:
+                clases.setdefault(Ajuste.clase_tamanio(tsp.distancias.num_ciudades), []).append((nombre, tsp))
+
+            # El almacén de soluciones reutiliza el greedy de cada semilla entre configuraciones con la misma k
+            almacen = self.params.get('almacen_soluciones', False)
+            hashes = {nombre: CacheInstancias.calcular_hash(tsp.archivo) if almacen else None for nombre, tsp in instancias}
+
+            if self.workers <= 1:
+                tsps = dict(instancias)
+
+                def lanzar(nombre, semilla_, i, params):
+                    return Ejecutor.ejecutar_semilla(nombre, tsps[nombre].distancias, tsps[nombre].candidatos, semilla_, i, params, hashes[nombre])
+
+                clases = {clase: self.carrera(miembros, configuraciones, lanzar) for clase, miembros in clases.items()}
+            else:
+                compartidas = {nombre: InstanciaCompartida(nombre, tsp.distancias, tsp.candidatos, directorio, tsp.coordenadas) for nombre, tsp in instancias}
+                with ProcessPoolExecutor(max_workers=self.workers) as grupo:
+                    def lanzar(nombre, semilla_, i, params):
+                        return grupo.submit(Ejecutor.ejecutar_compartida, compartidas[nombre], semilla_, i, params, hashes[nombre])
+
+                    clases = {clase: self.carrera(miembros, configuraciones, lanzar) for clase, miembros in clases.items()}
+
+        return {'algoritmo': self.algoritmo, 'parametros': self.parametros, 'semillas': self.semillas, 'eta': self.eta, 'clases': clases}
+
+    def carrera(self, instancias, configuraciones, lanzar):
+        """
+        Successive halving de las configuraciones sobre las instancias de una clase de tamaño.
+
+        :param instancias: Lista de tuplas (nombre, TSP) de la clase.
+        :param configuraciones: Configuraciones que empiezan la carrera.
+        :param lanzar: Función (nombre, semilla, num_ejecucion, params) que ejecuta una semilla; devuelve la
+                       lista de resultados o un futuro que la devuelve.
+        :return: Diccionario con la mejor configuración, su puntuación y el detalle de cada ronda.
+        """
+        nombres = [nombre for nombre, _ in instancias]
+        print(f"\nClase {Ajuste.clase_tamanio(instancias[0][1].distancias.num_ciudades)}: {', '.join(nombres)}")
+
+        distancias = {}  # (configuración, instancia, semilla) -> distancia final
+        vivas = list(range(len(configuraciones)))
+        num_semillas = self.semillas_iniciales
+        rondas = []
+
+        while True:
+            semillas = self.semillas[:num_semillas]
+
+            # Solo se lanzan las ejecuciones que faltan; todas a la vez para llenar el grupo de procesos
+            pendientes = {}
+            for c in vivas:
+                params = dict(self.params, **configuraciones[c])
+                for nombre in nombres:
+                    for i, semilla in enumerate(semillas, start=1):
+                        if (c, nombre, semilla) not in distancias:
+                            pendientes[(c, nombre, semilla)] = lanzar(nombre, semilla, i, params)
+            for clave, pendiente in pendientes.items():
+                resultados = pendiente if isinstance(pendiente, list) else pendiente.result()
+                distancias[clave] = next(r['distancia'] for r in resultados if r['algoritmo'] == self.algoritmo)
+
+            # Puntuación: exceso medio sobre la mejor distancia de cada (instancia, semilla) entre todas las evaluadas
+            mejores = {}
+            for (c, nombre, semilla), distancia in distancias.items():
+                clave = (nombre, semilla)
+                mejores[clave] = min(distancia, mejores.get(clave, math.inf))
+            puntuaciones = {c: float(np.mean([distancias[(c, nombre, semilla)] / mejores[(nombre, semilla)] - 1
+                                              for nombre in nombres for semilla in semillas])) for c in vivas}
+            vivas.sort(key=lambda c: puntuaciones[c])
+
+            rondas.append({'semillas': num_semillas, 'configuraciones': [{'configuracion': configuraciones[c], 'exceso': puntuaciones[c]} for c in vivas]})
+            print(f"  Ronda {len(rondas)}: {len(vivas)} configuraciones x {num_semillas} semillas, mejor exceso {puntuaciones[vivas[0]]:.4%}")
+
+            if len(vivas) == 1 or num_semillas >= len(self.semillas):
+                break
+            vivas = vivas[:math.ceil(len(vivas) / self.eta)]
+            num_semillas = min(num_semillas * self.eta, len(self.semillas))
+
+        mejor = vivas[0]
+        return {'instancias': nombres, 'mejor': configuraciones[mejor], 'exceso': puntuaciones[mejor],
+                'es_inicial': mejor == 0, 'rondas': rondas}
+
+    @staticmethod
+    def imprimir_resumen(datos):
+        """Muestra la mejor configuración de cada clase como líneas de config.txt."""
+        for clase, carrera in datos['clases'].items():
+            inicial = " (la de config.txt)" if carrera['es_inicial'] else ""
+            print(f"\n# {clase} ({', '.join(carrera['instancias'])}): exceso {carrera['exceso']:.4%}{inicial}")
+            for nombre, valor in carrera['mejor'].items():
+                print(f"{nombre} = {valor}")
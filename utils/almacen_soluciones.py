@@ -0,0 +1,68 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from utils.cache_instancias import EntradaCache
+
+
+class AlmacenSoluciones:
+    # Parámetros de los que depende la solución de cada algoritmo; el resto (tabú, búsqueda local...) no la invalida
+    PARAMS_ALGORITMO = {
+        'greedy_aleatorio': ('k', 'rcl_greedy', 'distancia_tsplib', 'umbral_matriz_densa', 'cache_matriz'),
+    }
+
+    def __init__(self, directorio='soluciones'):
+        """
+        Almacén en disco de soluciones por (hash de la instancia, algoritmo, semilla, parámetros).
+
+        Cada solución es un array int32 de ciudades (la longitud va en la cabecera del .npy) más su distancia
+        y el tiempo que costó obtenerla. Se leen como memoria mapeada de solo lectura, así que los
+        algoritmos que parten de ellas reciben vistas que no pueden modificar y las copian al crear su Tour.
+
+        :param directorio: Directorio raíz del almacén.
+        """
+        self.directorio = directorio
+
+    @staticmethod
+    def huella(algoritmo, params):
+        """Resumen corto de los parámetros de los que depende la solución del algoritmo."""
+        nombres = list(AlmacenSoluciones.PARAMS_ALGORITMO[algoritmo])
+        if params.get('rcl_greedy') == 'vecino_cercano':
+            nombres.append('num_candidatos')  # Solo la lista de vecinos cercanos usa los candidatos
+        relevantes = {nombre: params.get(nombre) for nombre in sorted(nombres)}
+        return hashlib.sha1(json.dumps(relevantes, sort_keys=True, default=str).encode()).hexdigest()[:10]
+
+    def _entrada(self, hash_instancia, algoritmo, params):
+        return EntradaCache(os.path.join(self.directorio, hash_instancia, f"{algoritmo}_{AlmacenSoluciones.huella(algoritmo, params)}"))
+
+    def cargar(self, hash_instancia, algoritmo, semilla, params):
+        """
+        Busca una solución guardada.
+
+        :param hash_instancia: Hash del contenido del archivo TSP (ver CacheInstancias.calcular_hash).
+        :param algoritmo: Nombre del algoritmo (clave de PARAMS_ALGORITMO).
+        :param semilla: Semilla con la que se obtuvo.
+        :param params: Parámetros del archivo de configuración.
+        :return: Array de ciudades de solo lectura, distancia y tiempo; o None si no está guardada.
+        """
+        entrada = self._entrada(hash_instancia, algoritmo, params)
+        tour = entrada.cargar(f"tour_{semilla}")  # Se escribe el último: si existe, los datos también
+        if tour is None:
+            return None
+        distancia, tiempo = entrada.cargar(f"datos_{semilla}").tolist()
+        return tour, distancia, tiempo
+
+    def guardar(self, hash_instancia, algoritmo, semilla, params, tour, distancia, tiempo):
+        """
+        Guarda una solución.
+
+        :param tour: Secuencia de ciudades.
+        :param distancia: Distancia del tour.
+        :param tiempo: Segundos que costó obtenerla.
+        :return: El tour guardado, como array de solo lectura.
+        """
+        entrada = self._entrada(hash_instancia, algoritmo, params)
+        entrada.guardar(f"datos_{semilla}", np.array([distancia, tiempo], dtype=np.float64))
+        return entrada.guardar(f"tour_{semilla}", np.asarray(tour, dtype=np.int32))
@@ -0,0 +1,246 @@
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    import resource  # Solo existe en sistemas tipo Unix
+except ImportError:
+    resource = None
+
+from utils.ejecutor import Ejecutor
+from utils.procesar_tsp import TSP
+
+
+class Benchmark:
+    # Instancias sintéticas por defecto: tamaños y distribuciones de las ciudades
+    TAMANIOS = (1000, 10000, 50000)
+    TIPOS = ('uniforme', 'agrupada')
+
+    # Métricas comparadas con la referencia: True si un valor mayor es peor
+    METRICAS = {'tiempo_medio': True, 'distancia_media': True, 'rss_mb': True, 'evaluaciones_por_segundo': False}
+
+    # Por debajo de estos segundos los tiempos son sobre todo ruido y no se comparan
+    TIEMPO_MINIMO = 0.05
+
+    def __init__(self, params, semillas, tamanios=TAMANIOS, tipos=TIPOS, directorio_datos='data'):
+        """
+        Prueba de rendimiento de los algoritmos sobre las instancias de config.txt y sobre instancias
+        sintéticas. Cada instancia se mide en un proceso nuevo para que el pico de memoria sea solo suyo.
+
+        :param params: Parámetros del archivo de configuración.
+        :param semillas: Semillas con las que se repite cada algoritmo.
+        :param tamanios: Números de ciudades de las instancias sintéticas.
+        :param tipos: Distribuciones de las instancias sintéticas ('uniforme', 'agrupada').
+        :param directorio_datos: Directorio de los archivos TSP de config.txt.
+        """
+        # Sin logs, caché, checkpoints, almacén de soluciones ni perfilado: se mide el trabajo de los algoritmos
+        # y del procesado, nunca resultados guardados de ejecuciones anteriores
+        self.params = dict(params, echo=True, nivel_log='ninguno', workers=1, checkpoint=False,
+                           almacen_soluciones=False, perfilado=False)
+        self.semillas = semillas
+        self.tamanios = tamanios
+        self.tipos = tipos
+        self.directorio_datos = directorio_datos
+
+    @staticmethod
+    def generar_coordenadas(tipo, num_ciudades, semilla=0):
+        """
+        Genera las coordenadas de una instancia sintética en el cuadrado [0, 1e6)².
+
+        :param tipo: 'uniforme' o 'agrupada' (ciudades repartidas en grupos gaussianos).
+        :param num_ciudades: Número de ciudades.
+        :param semilla: Semilla del generador.
+        :return: Array (n, 2) de coordenadas.
+        """
+        rng = np.random.default_rng(semilla)
+        lado = 1e6
+        if tipo == 'uniforme':
+            return rng.random((num_ciudades, 2)) * lado
+        if tipo == 'agrupada':
+            num_grupos = max(1, num_ciudades // 100)
+            centros = rng.random((num_grupos, 2)) * lado
+            grupo = rng.integers(0, num_grupos, size=num_ciudades)
+            coordenadas = centros[grupo] + rng.normal(scale=lado / (4 * np.sqrt(num_grupos)), size=(num_ciudades, 2))
+            return np.clip(coordenadas, 0, lado)
+        raise ValueError(f"Tipo de instancia sintética desconocido: {tipo}")
+
+    @staticmethod
+    def escribir_tsp(ruta, nombre, coordenadas):
+        """Escribe las coordenadas como archivo TSPLIB EUC_2D."""
+        with open(ruta, 'w') as f:
+            f.write(f"NAME : {nombre}\nTYPE : TSP\nDIMENSION : {len(coordenadas)}\nEDGE_WEIGHT_TYPE : EUC_2D\nNODE_COORD_SECTION\n")
+            identificadores = np.arange(1, len(coordenadas) + 1)
+            np.savetxt(f, np.column_stack([identificadores, coordenadas]), fmt=['%d', '%.2f', '%.2f'])
+            f.write("EOF\n")
+
+    def instancias(self, directorio):
+        """
+        Prepara la lista de instancias: las de config.txt que existan y las sintéticas (escritas en directorio).
+
+        :param directorio: Directorio temporal donde escribir las instancias sintéticas.
+        :return: Lista de tuplas (nombre, ruta, tipo).
+        """
+        instancias = []
+        for archivo in self.params.get('archivos', []):
+            ruta = os.path.join(self.directorio_datos, archivo)
+            if os.path.exists(ruta):
+                instancias.append((archivo, ruta, 'datos'))
+            else:
+                print(f"Aviso: no se encuentra {ruta}, se omite.")
+
+        for tipo in self.tipos:
+            for tamanio in self.tamanios:
+                nombre = f"{tipo}_{tamanio}"
+                ruta = os.path.join(directorio, nombre + '.tsp')
+                Benchmark.escribir_tsp(ruta, nombre, Benchmark.generar_coordenadas(tipo, tamanio, semilla=tamanio))
+                instancias.append((nombre, ruta, tipo))
+
+        return instancias
+
+    def ejecutar(self):
+        """
+        Mide todas las instancias y devuelve los resultados en un diccionario serializable a JSON.
+
+        :return: Diccionario con el entorno, los resultados de cada ejecución y el resumen por algoritmo.
+        """
+        filas = []
+        with tempfile.TemporaryDirectory(prefix='benchmark_') as directorio:
+            for nombre, ruta, tipo in self.instancias(directorio):
+                print(f"Midiendo {nombre}...")
+                # Un proceso nuevo por instancia: el pico de memoria (ru_maxrss) no arrastra el de las anteriores
+                with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as grupo:
+                    filas.extend(grupo.submit(Benchmark.medir_instancia, nombre, ruta, tipo, self.params, self.semillas).result())
+
+        return {'entorno': Benchmark.entorno(), 'semillas': self.semillas, 'resultados': filas, 'resumen': Benchmark.resumir(filas)}
+
+    @staticmethod
+    def medir_instancia(nombre, ruta, tipo, params, semillas):
+        """
+        Procesa una instancia y ejecuta los algoritmos de config.txt con cada semilla (en el proceso actual).
+
+        :return: Lista de filas, una por algoritmo y semilla.
+        """
+        inicio = time.perf_counter()
+        tsp = TSP(ruta, params.get('umbral_matriz_densa'), params.get('num_candidatos'), None, False, params.get('distancia_tsplib', False))
+        tsp.procesar()
+        tiempo_procesar = time.perf_counter() - inicio
+
+        filas = []
+        for i, semilla in enumerate(semillas, start=1):
+            for resultado in Ejecutor.ejecutar_semilla(nombre, tsp.distancias, tsp.candidatos, semilla, i, params):
+                tiempo = resultado['tiempo']
+                filas.append({'instancia': nombre, 'tipo': tipo, 'ciudades': tsp.distancias.num_ciudades,
+                              'algoritmo': resultado['algoritmo'], 'semilla': semilla, 'tiempo': tiempo,
+                              'distancia': resultado['distancia'], 'evaluaciones': resultado['evaluaciones'],
+                              'evaluaciones_por_segundo': resultado['evaluaciones'] / tiempo if tiempo > 0 else 0.0,
+                              'tiempo_procesar': tiempo_procesar})
+
+        rss_mb = Benchmark.pico_memoria_mb()
+        for fila in filas:
+            fila['rss_mb'] = rss_mb
+        return filas
+
+    @staticmethod
+    def pico_memoria_mb():
+        """Pico de memoria residente del proceso actual en MB (None si el sistema no lo permite)."""
+        if resource is None:
+            return None
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024  # macOS: bytes, Linux: KB
+
+    @staticmethod
+    def entorno():
+        """Datos de la máquina y de las versiones, para poder interpretar los tiempos."""
+        return {'fecha': time.strftime('%Y-%m-%d %H:%M:%S'), 'python': platform.python_version(),
+                'numpy': np.__version__, 'plataforma': platform.platform(), 'nucleos': os.cpu_count()}
+
+    @staticmethod
+    def resumir(filas):
+        """
+        Agrega las filas por instancia y algoritmo (medias sobre las semillas).
+
+        :param filas: Filas devueltas por medir_instancia.
+        :return: Lista de diccionarios de resumen.
+        """
+        grupos = {}
+        for fila in filas:
+            grupos.setdefault((fila['instancia'], fila['algoritmo']), []).append(fila)
+
+        resumen = []
+        for (instancia, algoritmo), grupo in grupos.items():
+            distancias = np.array([fila['distancia'] for fila in grupo])
+            rss = [fila['rss_mb'] for fila in grupo if fila['rss_mb'] is not None]
+            resumen.append({'instancia': instancia, 'algoritmo': algoritmo, 'ciudades': grupo[0]['ciudades'],
+                            'ejecuciones': len(grupo),
+                            'tiempo_medio': float(np.mean([fila['tiempo'] for fila in grupo])),
+                            'tiempo_procesar': grupo[0]['tiempo_procesar'],
+                            'distancia_media': float(distancias.mean()), 'distancia_minima': float(distancias.min()),
+                            'distancia_desviacion': float(distancias.std()),
+                            'evaluaciones_por_segundo': float(np.mean([fila['evaluaciones_por_segundo'] for fila in grupo])),
+                            'rss_mb': max(rss) if rss else None})
+        return resumen
+
+    @staticmethod
+    def comparar(resumen, referencia, umbral):
+        """
+        Compara un resumen con el de una ejecución de referencia.
+
+        :param resumen: Resumen actual (ver resumir).
+        :param referencia: Resumen de referencia.
+        :param umbral: Empeoramiento relativo tolerado (0.1 = 10 %).
+        :return: Lista de textos describiendo cada regresión (vacía si no hay ninguna).
+        """
+        anteriores = {(fila['instancia'], fila['algoritmo']): fila for fila in referencia}
+        regresiones = []
+
+        for fila in resumen:
+            anterior = anteriores.get((fila['instancia'], fila['algoritmo']))
+            if anterior is None:
+                continue
+
+            ruido = anterior['tiempo_medio'] < Benchmark.TIEMPO_MINIMO
+            for metrica, mayor_es_peor in Benchmark.METRICAS.items():
+                if ruido and metrica in ('tiempo_medio', 'evaluaciones_por_segundo'):
+                    continue
+
+                actual, previo = fila.get(metrica), anterior.get(metrica)
+                if not previo or actual is None:
+                    continue  # Sin referencia con la que comparar o sin medida (p. ej. de memoria); un 0 actual sí se compara
+
+                cambio = (actual - previo) / previo
+                if (cambio if mayor_es_peor else -cambio) > umbral:
+                    regresiones.append(f"{fila['instancia']} | {fila['algoritmo']}: {metrica} {previo:.4g} -> {actual:.4g} ({cambio:+.1%})")
+
+        return regresiones
+
+    @staticmethod
+    def guardar(ruta, datos):
+        """Escribe los resultados en JSON."""
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with open(ruta, 'w') as f:
+            json.dump(datos, f, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def cargar(ruta):
+        """Lee unos resultados guardados con guardar (None si el archivo no existe)."""
+        if not os.path.exists(ruta):
+            return None
+        with open(ruta) as f:
+            return json.load(f)
+
+    @staticmethod
+    def imprimir_resumen(resumen):
+        """Muestra el resumen como tabla en el terminal."""
+        print(f"{'Instancia':<18} {'Algoritmo':<20} {'n':>7} {'Tiempo (s)':>11} {'Distancia media':>16} {'Eval/s':>11} {'RSS (MB)':>9}")
+        for fila in resumen:
+            rss = f"{fila['rss_mb']:.0f}" if fila['rss_mb'] is not None else '-'
+            print(f"{fila['instancia']:<18} {fila['algoritmo']:<20} {fila['ciudades']:>7} {fila['tiempo_medio']:>11.3f} "
+                  f"{fila['distancia_media']:>16.1f} {fila['evaluaciones_por_segundo']:>11.0f} {rss:>9}")
@@ -0,0 +1,82 @@
+import hashlib
+import os
+
+import numpy as np
+
+
+class CacheInstancias:
+    def __init__(self, directorio='cache'):
+        """
+        Caché en disco de los datos derivados de cada archivo TSP (coordenadas, distancias, candidatos).
+        Cada entrada se identifica por el hash del contenido del archivo, así que editarlo la invalida.
+
+        :param directorio: Directorio raíz de la caché.
+        """
+        self.directorio = directorio
+
+    @staticmethod
+    def calcular_hash(archivo, tamanio_bloque=1 << 20):
+        """
+        Calcula el SHA-256 del contenido de un archivo leyéndolo por bloques.
+
+        :param archivo: Ruta del archivo.
+        :param tamanio_bloque: Bytes leídos en cada lectura.
+        :return: Hash en hexadecimal.
+        """
+        sha = hashlib.sha256()
+        with open(archivo, 'rb') as f:
+            for bloque in iter(lambda: f.read(tamanio_bloque), b''):
+                sha.update(bloque)
+        return sha.hexdigest()
+
+    def entrada(self, archivo):
+        """
+        Devuelve la entrada de la caché correspondiente a un archivo TSP.
+
+        :param archivo: Ruta del archivo TSP.
+        :return: EntradaCache asociada al hash del archivo.
+        """
+        return EntradaCache(os.path.join(self.directorio, CacheInstancias.calcular_hash(archivo)))
+
+
+class EntradaCache:
+    def __init__(self, directorio):
+        """
+        Conjunto de arrays .npy asociados a una instancia. Se leen como memoria mapeada.
+
+        :param directorio: Directorio de la entrada.
+        """
+        self.directorio = directorio
+        self.clave = os.path.basename(directorio)
+
+    def ruta(self, nombre):
+        return os.path.join(self.directorio, nombre + '.npy')
+
+    def cargar(self, nombre):
+        """
+        Abre un array de la entrada sin leerlo entero en memoria.
+
+        :param nombre: Nombre del array (sin extensión).
+        :return: np.memmap de solo lectura, o None si no está en la caché.
+        """
+        ruta = self.ruta(nombre)
+        if not os.path.exists(ruta):
+            return None
+        return np.load(ruta, mmap_mode='r')
+
+    def guardar(self, nombre, array):
+        """
+        Guarda un array en la entrada. Se escribe en un temporal y se renombra, de modo que un proceso
+        que lea a la vez nunca ve un archivo a medio escribir.
+
+        :param nombre: Nombre del array (sin extensión).
+        :param array: Array a guardar.
+        :return: El array guardado, abierto como memoria mapeada.
+        """
+        os.makedirs(self.directorio, exist_ok=True)
+        ruta = self.ruta(nombre)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, 'wb') as f:
+            np.save(f, array)
+        os.replace(temporal, ruta)
+        return self.cargar(nombre)
@@ -0,0 +1,85 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class ListaCandidatos:
+    def __init__(self, coordenadas, num_candidatos=None, vecinos=None, distancias=None):
+        """
+        Índice de vecinos más cercanos: para cada ciudad guarda sus K ciudades más próximas.
+        Se construye una sola vez por instancia con un KD-tree y lo comparten todos los algoritmos.
+
+        :param coordenadas: Array (n, 2) con las coordenadas de las ciudades (None en instancias EXPLICIT).
+        :param num_candidatos: Número K de vecinos más cercanos por ciudad.
+        :param vecinos: Array (n, K) ya calculado (p. ej. leído de disco); si se da, no se consulta el KD-tree.
+        :param distancias: Matriz de distancias (utils.distancias.MatrizDistancias), usada si no hay coordenadas.
+        """
+        self.coordenadas = coordenadas
+        self._arbol = None
+
+        if vecinos is None and coordenadas is None:
+            vecinos = ListaCandidatos.vecinos_desde_matriz(distancias.matriz, num_candidatos)
+        elif vecinos is None:
+            vecinos = self.calcular_vecinos(num_candidatos)
+
+        self.vecinos = vecinos
+        self.num_candidatos = vecinos.shape[1]
+
+    @property
+    def arbol(self):
+        """KD-tree sobre las coordenadas, construido solo cuando se necesita."""
+        if self._arbol is None:
+            self._arbol = cKDTree(self.coordenadas)
+        return self._arbol
+
+    def calcular_vecinos(self, num_candidatos):
+        """
+        Consulta el KD-tree para obtener los K vecinos más cercanos de cada ciudad.
+
+        :param num_candidatos: Número K de vecinos más cercanos por ciudad.
+        :return: Array (n, K) int32 con los vecinos de cada ciudad, del más cercano al más lejano.
+        """
+        num_ciudades = len(self.coordenadas)
+        num_candidatos = max(1, min(num_candidatos, num_ciudades - 1))
+
+        # Se piden K + 1 vecinos porque, salvo coordenadas repetidas, el más cercano es la propia ciudad
+        _, indices = self.arbol.query(self.coordenadas, k=num_candidatos + 1)
+        propia = indices == np.arange(num_ciudades)[:, None]
+
+        # Si la ciudad no aparece (empate con un duplicado), se descarta el vecino más lejano
+        sin_propia = ~propia.any(axis=1)
+        propia[sin_propia, -1] = True
+
+        return indices[~propia].reshape(num_ciudades, num_candidatos).astype(np.int32)
+
+    @staticmethod
+    def vecinos_desde_matriz(matriz, num_candidatos, tamanio_bloque=1024):
+        """
+        Obtiene los K vecinos más cercanos de cada ciudad a partir de la matriz de distancias.
+
+        :param matriz: Matriz (n, n) de distancias.
+        :param num_candidatos: Número K de vecinos más cercanos por ciudad.
+        :param tamanio_bloque: Número de filas procesadas a la vez.
+        :return: Array (n, K) int32 con los vecinos de cada ciudad, del más cercano al más lejano.
+        """
+        num_ciudades = matriz.shape[0]
+        num_candidatos = max(1, min(num_candidatos, num_ciudades - 1))
+        vecinos = np.empty((num_ciudades, num_candidatos), dtype=np.int32)
+
+        for inicio in range(0, num_ciudades, tamanio_bloque):
+            fin = min(inicio + tamanio_bloque, num_ciudades)
+            filas = np.array(matriz[inicio:fin], dtype=np.float64)
+            filas[np.arange(fin - inicio), np.arange(inicio, fin)] = np.inf  # Excluir la propia ciudad
+
+            # Selección parcial de los K menores y ordenación solo de esos K
+            cercanos = np.argpartition(filas, num_candidatos - 1, axis=1)[:, :num_candidatos]
+            orden = np.argsort(np.take_along_axis(filas, cercanos, axis=1), axis=1, kind='stable')
+            vecinos[inicio:fin] = np.take_along_axis(cercanos, orden, axis=1)
+
+        return vecinos
+
+    def __getitem__(self, ciudad):
+        """Devuelve el array con los candidatos de una ciudad."""
+        return self.vecinos[ciudad]
+
+    def __len__(self):
+        return len(self.vecinos)
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import random
+import time
+
+import numpy as np
+
+
+class Checkpoint:
+    # Parámetros que no influyen en el resultado de una ejecución (no invalidan los checkpoints si cambian)
+    PARAMS_NEUTROS = {'archivos', 'algoritmos', 'num_ejecuciones', 'echo', 'nivel_log', 'intervalo_flush', 'workers',
+                      'cache', 'directorio_cache', 'cache_matriz', 'archivo_perfil', 'checkpoint',
+                      'directorio_checkpoint', 'intervalo_checkpoint', 'kernels', 'almacen_soluciones', 'directorio_soluciones',
+                      'procesos_descomposicion', 'procesos_ejecutor'}
+
+    def __init__(self, params, archivo_tsp, semilla, algoritmo):
+        """
+        Checkpoints de una ejecución (archivo TSP, semilla, algoritmo) en directorio_checkpoint.
+
+        Cada ejecución guarda su estado parcial (.npz, sustituido atómicamente cada
+        intervalo_checkpoint segundos) y, al terminar, el resultado (.json) con su tour (.npy). El nombre
+        incluye una huella de los parámetros, así que cambiar config.txt no reanuda estados incompatibles.
+
+        :param params: Parámetros del archivo de configuración.
+        :param archivo_tsp: Nombre del archivo TSP.
+        :param semilla: Semilla de la ejecución.
+        :param algoritmo: Nombre del algoritmo.
+        """
+        directorio = params.get('directorio_checkpoint', 'checkpoints')
+        os.makedirs(directorio, exist_ok=True)
+
+        base = os.path.join(directorio, f"{os.path.basename(archivo_tsp)}_{semilla}_{algoritmo}_{Checkpoint.huella(params)}")
+        self.ruta_estado = base + '.estado.npz'
+        self.ruta_resultado = base + '.resultado.json'
+        self.ruta_tour = base + '.tour.npy'
+
+        self.intervalo = params.get('intervalo_checkpoint', 60)
+        self.tiempo_previo = 0.0  # Segundos ya ejecutados antes de reanudar
+        self.inicio = time.perf_counter()
+        self.ultimo = self.inicio
+
+    @staticmethod
+    def huella(params):
+        """Resumen corto de los parámetros que influyen en el resultado."""
+        relevantes = {clave: valor for clave, valor in sorted(params.items()) if clave not in Checkpoint.PARAMS_NEUTROS}
+        return hashlib.sha1(json.dumps(relevantes, sort_keys=True, default=str).encode()).hexdigest()[:10]
+
+    def toca(self):
+        """True si han pasado intervalo_checkpoint segundos desde el último guardado (una lectura del reloj)."""
+        return time.perf_counter() - self.ultimo >= self.intervalo
+
+    def tiempo(self):
+        """Segundos de ejecución acumulados, contando los de ejecuciones anteriores reanudadas."""
+        return self.tiempo_previo + time.perf_counter() - self.inicio
+
+    @staticmethod
+    def _reemplazar(ruta, escribir):
+        # Se escribe en un temporal y se renombra: un corte a mitad nunca deja un fichero a medias
+        temporal = ruta + '.tmp'
+        with open(temporal, 'wb') as f:
+            escribir(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, ruta)
+
+    def guardar_estado(self, arrays, meta):
+        """
+        Guarda el estado parcial de la ejecución.
+
+        :param arrays: Diccionario nombre -> array de NumPy.
+        :param meta: Diccionario serializable a JSON (contadores, distancias, estados de los generadores...).
+        """
+        meta = dict(meta, tiempo=self.tiempo())
+        Checkpoint._reemplazar(self.ruta_estado, lambda f: np.savez(f, meta=np.array(json.dumps(meta)), **arrays))
+        self.ultimo = time.perf_counter()
+
+    def cargar_estado(self):
+        """
+        Lee el estado parcial guardado, si lo hay.
+
+        :return: Diccionario de arrays y diccionario meta, o None si no hay estado.
+        """
+        if not os.path.exists(self.ruta_estado):
+            return None
+        with np.load(self.ruta_estado) as datos:
+            arrays = {nombre: datos[nombre] for nombre in datos.files if nombre != 'meta'}
+            meta = json.loads(str(datos['meta']))
+        self.tiempo_previo = meta['tiempo']
+        return arrays, meta
+
+    def guardar_resultado(self, resultado, tour):
+        """
+        Marca la ejecución como terminada: guarda su resultado y su tour y borra el estado parcial.
+
+        :param resultado: Diccionario del resultado (ver Ejecutor.ejecutar_semilla).
+        :param tour: Tour final.
+        """
+        Checkpoint._reemplazar(self.ruta_tour, lambda f: np.save(f, np.asarray(tour, dtype=np.int32)))
+        Checkpoint._reemplazar(self.ruta_resultado, lambda f: f.write(json.dumps(resultado).encode()))
+        if os.path.exists(self.ruta_estado):
+            os.remove(self.ruta_estado)
+
+    def cargar_resultado(self):
+        """
+        Resultado de la ejecución si ya terminó en una ejecución anterior del programa.
+
+        :return: Diccionario del resultado y array del tour, o None.
+        """
+        if not os.path.exists(self.ruta_resultado):
+            return None
+        with open(self.ruta_resultado) as f:
+            resultado = json.load(f)
+        return resultado, np.load(self.ruta_tour)
+
+    @staticmethod
+    def estado_generadores(rng):
+        """Estado del módulo random y del generador de NumPy, serializable a JSON."""
+        version, estado, gauss = random.getstate()
+        return {'random': [version, list(estado), gauss], 'numpy': rng.bit_generator.state}
+
+    @staticmethod
+    def restaurar_generadores(rng, estados):
+        """Devuelve el módulo random y el generador de NumPy al estado guardado por estado_generadores."""
+        version, estado, gauss = estados['random']
+        random.setstate((version, tuple(estado), gauss))
+        rng.bit_generator.state = estados['numpy']
@@ -1,21 +1,112 @@
+import queue
+import sys
+import threading
+import time
+
+
 class Logger:
-    def __init__(self, nombre_algoritmo, archivo_tsp, semilla, num_ejecucion, echo=True):
+    # Niveles de registro: los mensajes por debajo del nivel configurado ni se formatean ni se encolan
+    DEBUG = 10
+    INFO = 20
+    NINGUNO = 100  # No se registra nada (p. ej. en las pruebas de rendimiento)
+    NIVELES = {'debug': DEBUG, 'info': INFO, 'ninguno': NINGUNO}
+
+    # Marca que indica al hilo escritor que debe terminar
+    _FIN = object()
+
+    def __init__(self, nombre_algoritmo, archivo_tsp, semilla, num_ejecucion, echo=True, nivel='debug', intervalo_flush=0.5):
+        """
+        Registro de eventos asíncrono: los mensajes se encolan y un hilo en segundo plano los formatea
+        y escribe por lotes, de modo que el algoritmo nunca espera al terminal ni al disco.
+
+        :param nombre_algoritmo: Nombre del algoritmo (para el nombre del archivo de log).
+        :param archivo_tsp: Diccionario con el nombre del archivo TSP.
+        :param semilla: Semilla de la ejecución.
+        :param num_ejecucion: Número de ejecución.
+        :param echo: Si es True se escribe en el terminal; si es False, en logs/.
+        :param nivel: Nivel mínimo de los mensajes que se registran ('debug', 'info' o 'ninguno').
+        :param intervalo_flush: Segundos máximos entre vaciados del búfer de salida.
+        """
         self.log_file = None
         self.echo = echo
+        self.nivel = Logger.NIVELES[nivel] if isinstance(nivel, str) else nivel
+        self.intervalo_flush = intervalo_flush
+
+        # Los bucles de los algoritmos consultan este atributo antes de construir mensajes de depuración
+        self.depuracion = self.nivel <= Logger.DEBUG
 
         # Si echo es False, generar el archivo de log
         if not self.echo:
             log_filename = f"logs/{nombre_algoritmo}_{archivo_tsp['nombre']}_{semilla}_ejecucion_{num_ejecucion}.log"
-            self.log_file = open(log_filename, 'w')
+            self.log_file = open(log_filename, 'w', buffering=1 << 20)
+
+        self.salida = sys.stdout if self.echo else self.log_file
+        self.cola = queue.SimpleQueue()
+        self.hilo = threading.Thread(target=self._escribir, daemon=True)
+        self.hilo.start()
+
+    def registrar_evento(self, mensaje, *args, nivel=INFO):
+        """
+        Registra un evento en el archivo de log o imprime en consola.
+
+        El mensaje puede ser un texto con formato '%' y sus argumentos, o una función sin argumentos que
+        devuelve el texto; en ambos casos se formatea en el hilo escritor. Los argumentos no deben
+        modificarse después de registrarlos.
+
+        :param mensaje: Texto, plantilla '%' o función que devuelve el texto.
+        :param args: Argumentos de la plantilla.
+        :param nivel: Nivel del mensaje (Logger.DEBUG o Logger.INFO).
+        """
+        if nivel >= self.nivel:
+            self.cola.put((mensaje, args))
+
+    def depurar(self, mensaje, *args):
+        """Registra un mensaje de nivel DEBUG (ver registrar_evento)."""
+        if self.depuracion:
+            self.cola.put((mensaje, args))
+
+    @staticmethod
+    def _formatear(mensaje, args):
+        if callable(mensaje):
+            return mensaje()
+        return mensaje % args if args else mensaje
+
+    def _escribir(self):
+        """Bucle del hilo escritor: agrupa los mensajes pendientes y los escribe de una vez."""
+        ultimo_flush = time.monotonic()
+        terminar = False
+
+        while not terminar:
+            try:
+                pendientes = [self.cola.get(timeout=self.intervalo_flush)]
+            except queue.Empty:
+                pendientes = []
+
+            # Vaciar todo lo que haya en la cola sin bloquear
+            while True:
+                try:
+                    pendientes.append(self.cola.get_nowait())
+                except queue.Empty:
+                    break
+
+            lineas = []
+            for elemento in pendientes:
+                if elemento is Logger._FIN:
+                    terminar = True
+                    break
+                lineas.append(Logger._formatear(*elemento))
+
+            if lineas:
+                self.salida.write('\n'.join(lineas) + '\n')
 
-    def registrar_evento(self, mensaje):
-        """Registra un evento en el archivo de log o imprime en consola."""
-        if self.echo:
-            print(mensaje)
-        elif self.log_file:
-            self.log_file.write(mensaje + '\n')
+            if terminar or time.monotonic() - ultimo_flush >= self.intervalo_flush:
+                self.salida.flush()
+                ultimo_flush = time.monotonic()
 
     def cerrar_log(self):
-        """Cierra el archivo de log, si existe."""
+        """Espera a que se escriban los mensajes pendientes y cierra el archivo de log, si existe."""
+        if self.hilo.is_alive():
+            self.cola.put(Logger._FIN)
+            self.hilo.join()
         if self.log_file:
-            self.log_file.close()
\ No newline at end of file
+            self.log_file.close()
@@ -0,0 +1,198 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+from scipy.spatial.distance import cdist
+
+
+def _euclidea(xa, ya, xb, yb):
+    dx = xa - xb
+    dy = ya - yb
+    return np.sqrt(dx * dx + dy * dy)
+
+
+def _euc_2d(xa, ya, xb, yb):
+    # nint de TSPLIB: (int) (x + 0.5)
+    return np.floor(_euclidea(xa, ya, xb, yb) + 0.5)
+
+
+def _ceil_2d(xa, ya, xb, yb):
+    return np.ceil(_euclidea(xa, ya, xb, yb))
+
+
+def _att(xa, ya, xb, yb):
+    # Pseudo-euclídea de TSPLIB: se redondea y, si queda por debajo, se suma 1
+    dx = xa - xb
+    dy = ya - yb
+    r = np.sqrt((dx * dx + dy * dy) / 10.0)
+    t = np.floor(r + 0.5)
+    return np.where(t < r, t + 1.0, t)
+
+
+def _geo(lat_a, lon_a, lat_b, lon_b):
+    # Las coordenadas ya vienen convertidas a radianes (ver Distancias.transformar)
+    q1 = np.cos(lon_a - lon_b)
+    q2 = np.cos(lat_a - lat_b)
+    q3 = np.cos(lat_a + lat_b)
+    coseno = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+    return np.floor(6378.388 * np.arccos(coseno) + 1.0)
+
+
+class Distancias(ABC):
+    # Por encima de este número de ciudades no se materializa la matriz completa
+    UMBRAL_MATRIZ_DENSA = 5000
+
+    # Funciones de distancia vectorizadas por tipo (EDGE_WEIGHT_TYPE de TSPLIB o euclídea sin redondeo)
+    METRICAS = {
+        'EUCLIDEA': _euclidea,
+        'EUC_2D': _euc_2d,
+        'CEIL_2D': _ceil_2d,
+        'ATT': _att,
+        'GEO': _geo,
+    }
+
+    def __init__(self, num_ciudades):
+        """
+        Interfaz común de los proveedores de distancias entre ciudades.
+
+        :param num_ciudades: Número de ciudades de la instancia.
+        """
+        self.num_ciudades = num_ciudades
+        self.shape = (num_ciudades, num_ciudades)
+        self.suma = None  # Sumas por fila, se calculan una vez (o se leen de la caché)
+
+    @staticmethod
+    def crear(coordenadas, umbral_matriz_densa=None, tipo='EUCLIDEA'):
+        """
+        Elige el proveedor de distancias adecuado según el tamaño de la instancia.
+
+        :param coordenadas: Array (n, 2) con las coordenadas de las ciudades.
+        :param umbral_matriz_densa: Número máximo de ciudades para usar la matriz completa.
+        :param tipo: Tipo de distancia (clave de Distancias.METRICAS).
+        :return: MatrizDistancias para instancias pequeñas, DistanciasCoordenadas en otro caso.
+        """
+        if umbral_matriz_densa is None:
+            umbral_matriz_densa = Distancias.UMBRAL_MATRIZ_DENSA
+
+        perezosas = DistanciasCoordenadas(coordenadas, tipo=tipo)
+        if len(coordenadas) <= umbral_matriz_densa:
+            return MatrizDistancias(perezosas.calcular_matriz())
+        return perezosas
+
+    @staticmethod
+    def transformar(coordenadas, tipo):
+        """
+        Prepara las coordenadas para la función de distancia: con GEO convierte grados.minutos a radianes.
+
+        :param coordenadas: Array (n, 2) con las coordenadas leídas del archivo.
+        :param tipo: Tipo de distancia.
+        :return: Arrays x, y contiguos.
+        """
+        coordenadas = np.asarray(coordenadas, dtype=np.float64)
+        if tipo == 'GEO':
+            grados = np.trunc(coordenadas)
+            coordenadas = 3.141592 * (grados + 5.0 * (coordenadas - grados) / 3.0) / 180.0
+        return np.ascontiguousarray(coordenadas[:, 0]), np.ascontiguousarray(coordenadas[:, 1])
+
+    @abstractmethod
+    def distancia(self, origen, destino):
+        """
+        Calcula la distancia entre ciudades. Admite escalares o arrays de índices.
+
+        :param origen: Índice (o array de índices) de las ciudades de origen.
+        :param destino: Índice (o array de índices) de las ciudades de destino.
+        :return: Distancia (o array de distancias) entre cada par origen-destino.
+        """
+
+    def suma_distancias(self):
+        """
+        Calcula, para cada ciudad, la suma de sus distancias al resto.
+
+        :return: Array de longitud n con la suma de cada fila.
+        """
+        if self.suma is None:
+            self.suma = self.calcular_suma_distancias()
+        return self.suma
+
+    @abstractmethod
+    def calcular_suma_distancias(self):
+        """Calcula la suma de distancias de cada ciudad al resto (suma_distancias la guarda)."""
+
+    def __getitem__(self, indices):
+        # Permite seguir usando la sintaxis de matriz: distancias[origen, destino]
+        origen, destino = indices
+        return self.distancia(origen, destino)
+
+    def __len__(self):
+        return self.num_ciudades
+
+
+class MatrizDistancias(Distancias):
+    def __init__(self, matriz):
+        """
+        Proveedor denso: guarda la matriz completa de distancias (memoria O(n²)).
+
+        :param matriz: Matriz (n, n) de distancias entre las ciudades.
+        """
+        super().__init__(matriz.shape[0])
+        self.matriz = matriz
+
+    def distancia(self, origen, destino):
+        return self.matriz[origen, destino]
+
+    def calcular_suma_distancias(self):
+        return np.sum(self.matriz, axis=1)
+
+
+class DistanciasCoordenadas(Distancias):
+    def __init__(self, coordenadas, tamanio_bloque=1024, tipo='EUCLIDEA'):
+        """
+        Proveedor perezoso: solo guarda las coordenadas (memoria O(n)) y calcula los arcos bajo demanda.
+
+        :param coordenadas: Array (n, 2) con las coordenadas de las ciudades.
+        :param tamanio_bloque: Número de filas que se materializan a la vez en suma_distancias.
+        :param tipo: Tipo de distancia (clave de Distancias.METRICAS).
+        """
+        super().__init__(len(coordenadas))
+        self.coordenadas = np.asarray(coordenadas, dtype=np.float64)
+        self.tipo = tipo
+        self.metrica = Distancias.METRICAS[tipo]
+        self.x, self.y = Distancias.transformar(self.coordenadas, tipo)
+        self.tamanio_bloque = tamanio_bloque
+
+    def distancia(self, origen, destino):
+        return self.metrica(self.x[origen], self.y[origen], self.x[destino], self.y[destino])
+
+    def calcular_filas(self, inicio, fin):
+        """
+        Materializa las filas [inicio, fin) de la matriz de distancias.
+
+        :param inicio: Primera fila.
+        :param fin: Fila siguiente a la última.
+        :return: Array (fin - inicio, n).
+        """
+        if self.tipo == 'EUCLIDEA':
+            return cdist(self.coordenadas[inicio:fin], self.coordenadas, metric='euclidean')
+        return self.metrica(self.x[inicio:fin, None], self.y[inicio:fin, None], self.x[None, :], self.y[None, :])
+
+    def bloques(self):
+        """Recorre la matriz por bloques de filas para no materializarla entera."""
+        for inicio in range(0, self.num_ciudades, self.tamanio_bloque):
+            fin = min(inicio + self.tamanio_bloque, self.num_ciudades)
+            yield inicio, fin, self.calcular_filas(inicio, fin)
+
+    def calcular_matriz(self):
+        """
+        Construye la matriz completa de distancias (para el proveedor denso).
+
+        :return: Array (n, n).
+        """
+        matriz = np.empty(self.shape)
+        for inicio, fin, filas in self.bloques():
+            matriz[inicio:fin] = filas
+        return matriz
+
+    def calcular_suma_distancias(self):
+        suma = np.empty(self.num_ciudades)
+        for inicio, fin, filas in self.bloques():
+            suma[inicio:fin] = np.sum(filas, axis=1)
+        return suma
@@ -0,0 +1,205 @@
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from algoritmos.AlgGRE_Clase01_Grupo06 import GreedyAleatorio
+from algoritmos.AlgBL_Clase01_Grupo06 import BusquedaLocal
+from algoritmos.AlgBLDLB_Clase01_Grupo06 import BusquedaLocalDLB
+from algoritmos.AlgLK_Clase01_Grupo06 import LinKernighan
+from algoritmos.AlgTA_Clase01_Grupo06 import AlgoritmoTabu
+from algoritmos.AlgTAIslas_Clase01_Grupo06 import AlgoritmoTabuIslas
+from algoritmos.AlgDES_Clase01_Grupo06 import Descomposicion
+from utils.almacen_soluciones import AlmacenSoluciones
+from utils.cache_instancias import CacheInstancias
+from utils.checkpoint import Checkpoint
+from utils.crear_logs import Logger
+from utils.instancia_compartida import InstanciaCompartida
+from utils.perfilado import Perfilador
+
+
+class Ejecutor:
+    def __init__(self, params, semillas):
+        """
+        Planifica las ejecuciones (archivo TSP x semilla) en serie o sobre un grupo de procesos.
+
+        :param params: Parámetros del archivo de configuración.
+        :param semillas: Lista de semillas a ejecutar para cada archivo.
+        """
+        self.params = params
+        self.semillas = semillas
+
+        # workers = 0 usa todos los núcleos disponibles
+        workers = params.get('workers', 1)
+        self.workers = workers if workers > 0 else os.cpu_count()
+
+    def ejecutar(self, instancias):
+        """
+        Ejecuta los algoritmos configurados para cada instancia y cada semilla.
+
+        :param instancias: Lista de pares (nombre del archivo, utils.procesar_tsp.TSP ya procesado).
+        :return: Lista de resultados (diccionarios) en el orden archivo, semilla, algoritmo.
+        """
+        # El almacén de soluciones identifica cada instancia por el hash de su archivo
+        almacen = self.params.get('almacen_soluciones', False)
+        hashes = [CacheInstancias.calcular_hash(tsp.archivo) if almacen else None for _, tsp in instancias]
+
+        if self.workers <= 1:
+            resultados = []
+            for (archivo_tsp, tsp), hash_instancia in zip(instancias, hashes):
+                for i, semilla in enumerate(self.semillas, start=1):
+                    resultados.extend(Ejecutor.ejecutar_semilla(archivo_tsp, tsp.distancias, tsp.candidatos, semilla, i, self.params, hash_instancia))
+            return resultados
+
+        with tempfile.TemporaryDirectory(prefix='tsp_') as directorio:
+            compartidas = [InstanciaCompartida(archivo_tsp, tsp.distancias, tsp.candidatos, directorio, tsp.coordenadas) for archivo_tsp, tsp in instancias]
+
+            # Cada tarea sabe cuántas se ejecutan a la vez para repartir los núcleos (islas, descomposición)
+            params = dict(self.params, procesos_ejecutor=self.workers)
+            with ProcessPoolExecutor(max_workers=self.workers) as grupo:
+                futuros = [
+                    grupo.submit(Ejecutor.ejecutar_compartida, compartida, semilla, i, params, hash_instancia)
+                    for compartida, hash_instancia in zip(compartidas, hashes)
+                    for i, semilla in enumerate(self.semillas, start=1)
+                ]
+                return [resultado for futuro in futuros for resultado in futuro.result()]
+
+    @staticmethod
+    def ejecutar_compartida(instancia, semilla, num_ejecucion, params, hash_instancia=None):
+        """
+        Ejecuta una semilla sobre una instancia compartida; es el punto de entrada de cada proceso trabajador.
+
+        :param instancia: Instancia volcada a disco (utils.instancia_compartida.InstanciaCompartida).
+        :return: Lista de resultados, como ejecutar_semilla.
+        """
+        distancias, candidatos = instancia.cargar()
+        return Ejecutor.ejecutar_semilla(instancia.nombre, distancias, candidatos, semilla, num_ejecucion, params, hash_instancia)
+
+    @staticmethod
+    def ejecutar_semilla(archivo_tsp, distancias, candidatos, semilla, num_ejecucion, params, hash_instancia=None):
+        """
+        Ejecuta, para una semilla, los algoritmos listados en config.txt sobre una instancia.
+        Cada ejecución fija su propia semilla, por lo que el resultado no depende del proceso que la ejecute.
+
+        :param archivo_tsp: Nombre del archivo TSP.
+        :param distancias: Proveedor de distancias de la instancia.
+        :param candidatos: Lista de candidatos de la instancia (o None).
+        :param semilla: Semilla de la ejecución.
+        :param num_ejecucion: Número de ejecución (empezando en 1).
+        :param params: Parámetros del archivo de configuración.
+        :param hash_instancia: Hash del archivo TSP para el almacén de soluciones (None para no usarlo).
+        :return: Lista de resultados, uno por algoritmo ejecutado (con los movimientos evaluados).
+        """
+        algoritmos_a_ejecutar = params['algoritmos']
+        resultados = []
+
+        # Con perfilado = yes cada algoritmo recibe su Perfilador; si no, None y las medidas no se hacen
+        perfilar = params.get('perfilado', False)
+
+        # Con checkpoint = yes las ejecuciones ya terminadas se saltan y las interrumpidas continúan
+        usar_checkpoint = params.get('checkpoint', False)
+
+        # Con almacen_soluciones = yes el Greedy de cada semilla se construye una vez y se reutiliza entre barridos
+        almacen = AlmacenSoluciones(params.get('directorio_soluciones', 'soluciones')) if hash_instancia else None
+
+        def ejecutar_algoritmo(nombre_algoritmo, descripcion, resolver, tiempo=None):
+            """
+            Ejecuta un algoritmo con su log, su Perfilador y su checkpoint, y añade su resultado a la lista.
+
+            :param nombre_algoritmo: Nombre del algoritmo en config.txt y en los resultados.
+            :param descripcion: Nombre legible para el log.
+            :param resolver: Función (logger, perfil, checkpoint) -> (tour, distancia, movimientos evaluados).
+            :param tiempo: Tiempo a informar en lugar del medido (p. ej. el de una solución del almacén).
+            :return: Tour y distancia obtenidos (los guardados si el checkpoint dice que ya terminó).
+            """
+            checkpoint = Checkpoint(params, archivo_tsp, semilla, nombre_algoritmo) if usar_checkpoint else None
+            anterior = checkpoint.cargar_resultado() if checkpoint else None
+            if anterior:
+                resultados.append(dict(anterior[0], ejecucion=num_ejecucion))
+                return anterior[1], anterior[0]['distancia']
+
+            logger = Logger(nombre_algoritmo=nombre_algoritmo, archivo_tsp={'nombre': archivo_tsp}, semilla=semilla, num_ejecucion=num_ejecucion, echo=params['echo'], nivel=params.get('nivel_log', 'debug'), intervalo_flush=params.get('intervalo_flush', 0.5))
+            logger.registrar_evento(f"Ejecutando {descripcion} con la semilla {semilla}:")
+            perfil = Perfilador() if perfilar else None
+            start_time = time.time()
+            tour, distancia, evaluaciones = resolver(logger, perfil, checkpoint)
+            if tiempo is None:
+                tiempo = time.time() - start_time
+            if checkpoint: tiempo += checkpoint.tiempo_previo  # Lo ejecutado antes de reanudar
+
+            if perfil: t = perfil.ahora()
+            logger.registrar_evento(lambda: f"\nTour obtenido: {list(map(int, tour))}")  # Se formatea en el hilo del log
+            logger.registrar_evento(f"Distancia total: {distancia}, Tiempo: {tiempo}")
+            logger.cerrar_log()  # Solo cerrar si `echo` es False
+            if perfil: perfil.fase('log', t)
+
+            resultado = {'archivo': archivo_tsp, 'ejecucion': num_ejecucion, 'semilla': semilla,
+                         'algoritmo': nombre_algoritmo, 'distancia': float(distancia), 'tiempo': tiempo,
+                         'evaluaciones': evaluaciones}
+            if perfil:
+                resultado['perfil'] = perfil.informe()
+            resultados.append(resultado)
+            if checkpoint: checkpoint.guardar_resultado(resultado, tour)
+            return tour, distancia
+
+        def con_algoritmo(crear, reanudable=False):
+            # Adapta un algoritmo con resolver(semilla, logger, perfil[, checkpoint]) a la firma de ejecutar_algoritmo
+            def resolver(logger, perfil, checkpoint):
+                algoritmo = crear()
+                opciones = {'checkpoint': checkpoint} if reanudable else {}
+                tour_final, distancia_final = algoritmo.resolver(semilla, logger=logger, perfil=perfil, **opciones)
+                return tour_final, distancia_final, algoritmo.parada.evaluaciones
+            return resolver
+
+        # Greedy Aleatorio: si está en la lista o si hace falta como solución de partida
+        tour, distancia_total = None, None
+        necesita_inicial = any(nombre in algoritmos_a_ejecutar for nombre in ('busqueda_local', 'busqueda_local_dlb', 'lin_kernighan', 'algoritmo_tabu', 'algoritmo_tabu_islas'))
+        if 'greedy_aleatorio' in algoritmos_a_ejecutar or necesita_inicial:
+            almacenada = almacen.cargar(hash_instancia, 'greedy_aleatorio', semilla, params) if almacen else None
+
+            def construir_greedy(logger, perfil, checkpoint):
+                if almacenada:
+                    # Solución del almacén: no se ha evaluado ningún movimiento
+                    return almacenada[0], almacenada[1], 0
+                inicio = time.time()
+                greedy_aleatorio = GreedyAleatorio(distancias, params, candidatos)
+                tour_greedy, distancia_greedy = greedy_aleatorio.resolver(semilla, logger=logger, perfil=perfil)
+                # Un tour cortado por el límite de tiempo depende del reloj: no se reutiliza
+                if almacen and greedy_aleatorio.parada.motivo is None:
+                    tour_greedy = almacen.guardar(hash_instancia, 'greedy_aleatorio', semilla, params, tour_greedy, distancia_greedy, time.time() - inicio)
+                return tour_greedy, distancia_greedy, greedy_aleatorio.parada.evaluaciones
+
+            if 'greedy_aleatorio' in algoritmos_a_ejecutar:
+                # Con una solución del almacén se informa el tiempo de la construcción original
+                tour, distancia_total = ejecutar_algoritmo("greedy_aleatorio", "Greedy Aleatorio", construir_greedy, almacenada[2] if almacenada else None)
+            else:
+                # Solo es la solución de partida: sin log, checkpoint ni fila en los resultados
+                tour, distancia_total, _ = construir_greedy(None, None, None)
+
+            # Todos los algoritmos parten de la misma solución: una vista de solo lectura que cada uno copia
+            tour = np.asarray(tour, dtype=np.int32).view()
+            tour.flags.writeable = False
+
+        # Algoritmos que parten del Greedy, en el orden en que se ejecutan si están en la lista
+        if 'busqueda_local' in algoritmos_a_ejecutar:
+            ejecutar_algoritmo("busqueda_local", "Búsqueda Local del mejor", con_algoritmo(lambda: BusquedaLocal(tour, distancia_total, distancias, params, candidatos), reanudable=True))
+
+        if 'busqueda_local_dlb' in algoritmos_a_ejecutar:
+            ejecutar_algoritmo("busqueda_local_dlb", "Búsqueda Local con don't-look bits", con_algoritmo(lambda: BusquedaLocalDLB(tour, distancia_total, distancias, params, candidatos)))
+
+        if 'lin_kernighan' in algoritmos_a_ejecutar:
+            ejecutar_algoritmo("lin_kernighan", "Lin-Kernighan", con_algoritmo(lambda: LinKernighan(tour, distancia_total, distancias, params, candidatos)))
+
+        if 'algoritmo_tabu' in algoritmos_a_ejecutar:
+            ejecutar_algoritmo("algoritmo_tabu", "Algoritmo Tabú", con_algoritmo(lambda: AlgoritmoTabu(tour, distancia_total, distancias, params, candidatos), reanudable=True))
+
+        if 'algoritmo_tabu_islas' in algoritmos_a_ejecutar:
+            ejecutar_algoritmo("algoritmo_tabu_islas", "Algoritmo Tabú con modelo de islas", con_algoritmo(lambda: AlgoritmoTabuIslas(tour, distancia_total, distancias, params, candidatos, archivo_tsp)))
+
+        # La descomposición espacial construye su propia solución
+        if 'descomposicion' in algoritmos_a_ejecutar:
+            ejecutar_algoritmo("descomposicion", "Descomposición Espacial", con_algoritmo(lambda: Descomposicion(distancias, params, candidatos)))
+
+        return resultados
@@ -0,0 +1,85 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class EliteCompartida:
+    def __init__(self, num_islas, num_ciudades, cerrojo, nombre=None):
+        """
+        Soluciones élite de las islas en memoria compartida: un tour, su distancia y sus evaluaciones por isla.
+        Los procesos solo copian tours de n enteros al publicar o leer; nada pasa por serialización.
+
+        El proceso principal la crea (nombre=None) y la libera al terminar; al enviarla a un proceso hijo
+        solo viaja el nombre del bloque y el cerrojo, y el hijo la vuelve a abrir.
+
+        :param num_islas: Número de islas.
+        :param num_ciudades: Número de ciudades de la instancia.
+        :param cerrojo: multiprocessing.Lock que protege las lecturas y escrituras.
+        :param nombre: Nombre del bloque de memoria compartida existente, o None para crearlo.
+        """
+        self.num_islas = num_islas
+        self.num_ciudades = num_ciudades
+        self.cerrojo = cerrojo
+        self.propietaria = nombre is None
+
+        tamanio = num_islas * (num_ciudades * 4 + 8 + 8)
+        self.bloque = shared_memory.SharedMemory(name=nombre, create=nombre is None, size=tamanio)
+        self._vistas()
+
+        if self.propietaria:
+            self.distancias[:] = np.inf  # Ninguna isla ha publicado todavía
+            self.evaluaciones[:] = 0
+
+    def _vistas(self):
+        # Distancias y evaluaciones van primero para que queden alineadas a 8 bytes
+        n, islas = self.num_ciudades, self.num_islas
+        self.distancias = np.ndarray((islas,), dtype=np.float64, buffer=self.bloque.buf)
+        self.evaluaciones = np.ndarray((islas,), dtype=np.int64, buffer=self.bloque.buf, offset=8 * islas)
+        self.tours = np.ndarray((islas, n), dtype=np.int32, buffer=self.bloque.buf, offset=16 * islas)
+
+    def __getstate__(self):
+        return {'num_islas': self.num_islas, 'num_ciudades': self.num_ciudades, 'cerrojo': self.cerrojo, 'nombre': self.bloque.name}
+
+    def __setstate__(self, estado):
+        self.__init__(estado['num_islas'], estado['num_ciudades'], estado['cerrojo'], estado['nombre'])
+
+    def publicar(self, isla, ciudades, distancia, evaluaciones):
+        """
+        Guarda la élite de una isla si mejora la que tenía publicada.
+
+        :param isla: Índice de la isla.
+        :param ciudades: Array de ciudades de su mejor tour.
+        :param distancia: Distancia del tour.
+        :param evaluaciones: Movimientos evaluados por la isla hasta ahora.
+        """
+        with self.cerrojo:
+            self.evaluaciones[isla] = evaluaciones
+            if distancia < self.distancias[isla]:
+                self.tours[isla] = ciudades
+                self.distancias[isla] = distancia
+
+    def leer(self):
+        """
+        Copia el estado de todas las islas.
+
+        :return: Array (islas, n) de tours y array de distancias (inf para las islas sin élite).
+        """
+        with self.cerrojo:
+            return self.tours.copy(), self.distancias.copy()
+
+    def mejor(self):
+        """
+        La mejor élite publicada.
+
+        :return: Índice de la isla, array de ciudades y distancia.
+        """
+        tours, distancias = self.leer()
+        isla = int(np.argmin(distancias))
+        return isla, tours[isla], float(distancias[isla])
+
+    def cerrar(self):
+        """Libera las vistas y el bloque; el proceso principal además lo elimina del sistema."""
+        del self.distancias, self.evaluaciones, self.tours
+        self.bloque.close()
+        if self.propietaria:
+            self.bloque.unlink()
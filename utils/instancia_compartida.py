@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+
+from utils.candidatos import ListaCandidatos
+from utils.distancias import MatrizDistancias, DistanciasCoordenadas
+
+
+class InstanciaCompartida:
+    def __init__(self, nombre, distancias, candidatos, directorio, coordenadas=None):
+        """
+        Vuelca los datos de una instancia a ficheros .npy para que los procesos trabajadores los abran
+        como memoria mapeada: el sistema operativo comparte las páginas y no se serializa ninguna matriz.
+
+        :param nombre: Nombre del archivo TSP.
+        :param distancias: Proveedor de distancias de la instancia (ver utils.distancias).
+        :param candidatos: Lista de candidatos de la instancia (o None).
+        :param directorio: Directorio temporal donde escribir los ficheros.
+        :param coordenadas: Coordenadas de las ciudades (por defecto, las del proveedor si las tiene).
+        """
+        self.nombre = nombre
+        self.tipo_distancia = getattr(distancias, 'tipo', None)
+        self.rutas = {}
+
+        if coordenadas is None:
+            coordenadas = getattr(distancias, 'coordenadas', None)
+
+        base = os.path.join(directorio, os.path.basename(nombre))
+        if coordenadas is not None:
+            self.rutas['coordenadas'] = self._volcar(base + '.coordenadas.npy', coordenadas)
+        if isinstance(distancias, MatrizDistancias):
+            self.rutas['matriz'] = self._volcar(base + '.matriz.npy', distancias.matriz)
+        # Las sumas por fila (O(n²) con el proveedor perezoso) se calculan una vez en el proceso principal
+        self.rutas['suma'] = self._volcar(base + '.suma.npy', distancias.suma_distancias())
+        if candidatos is not None:
+            self.rutas['candidatos'] = self._volcar(base + '.candidatos.npy', candidatos.vecinos)
+
+    @staticmethod
+    def _volcar(ruta, array):
+        # Los arrays que ya vienen de la caché en disco se comparten directamente desde su archivo
+        if isinstance(array, np.memmap) and array.filename:
+            return array.filename
+        np.save(ruta, array)
+        return ruta
+
+    def cargar(self):
+        """
+        Abre la instancia en el proceso actual (una sola vez por proceso).
+
+        :return: Proveedor de distancias y lista de candidatos (o None).
+        """
+        if self.nombre not in _instancias_cargadas:
+            coordenadas = np.load(self.rutas['coordenadas'], mmap_mode='r') if 'coordenadas' in self.rutas else None
+            if 'matriz' in self.rutas:
+                distancias = MatrizDistancias(np.load(self.rutas['matriz'], mmap_mode='r'))
+            else:
+                distancias = DistanciasCoordenadas(coordenadas, tipo=self.tipo_distancia)
+            distancias.suma = np.load(self.rutas['suma'], mmap_mode='r')
+
+            candidatos = None
+            if 'candidatos' in self.rutas:
+                candidatos = ListaCandidatos(coordenadas, vecinos=np.load(self.rutas['candidatos'], mmap_mode='r'))
+
+            _instancias_cargadas[self.nombre] = (distancias, candidatos)
+
+        return _instancias_cargadas[self.nombre]
+
+
+# Instancias ya abiertas en este proceso trabajador, para no mapearlas de nuevo en cada tarea
+_instancias_cargadas = {}
@@ -0,0 +1,227 @@
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Numba es opcional: sin él se usan las versiones NumPy
+    numba = None
+
+from utils.utilidades import Utilidades
+
+
+# Núcleos escritos como bucles sobre la matriz densa. Con Numba se compilan a código máquina; sin él no se
+# usan (en Python puro serían mucho más lentos que las versiones NumPy de KernelsNumPy). Las sumas se asocian
+# igual que en NumPy para que ambos conjuntos den exactamente los mismos deltas.
+
+def _evaluar_intercambio(ciudades, matriz, i, j):
+    n = len(ciudades)
+    deltas = np.empty(len(i))
+    for k in range(len(i)):
+        a, b = i[k], j[k]
+        anterior_i, ciudad_i, siguiente_i = ciudades[a - 1], ciudades[a], ciudades[(a + 1) % n]
+        anterior_j, ciudad_j, siguiente_j = ciudades[b - 1], ciudades[b], ciudades[(b + 1) % n]
+        desaparecen = matriz[anterior_i, ciudad_i] + matriz[ciudad_j, siguiente_j]
+        nuevos = matriz[anterior_i, ciudad_j] + matriz[ciudad_i, siguiente_j]
+        if b - a != 1:
+            desaparecen = desaparecen + (matriz[ciudad_i, siguiente_i] + matriz[anterior_j, ciudad_j])
+            nuevos = nuevos + (matriz[ciudad_j, siguiente_i] + matriz[anterior_j, ciudad_i])
+        delta = nuevos - desaparecen
+        deltas[k] = delta
+    return deltas
+
+
+def _evaluar_2opt(ciudades, matriz, i, j):
+    n = len(ciudades)
+    deltas = np.empty(len(i))
+    for k in range(len(i)):
+        anterior, primera = ciudades[i[k] - 1], ciudades[i[k]]
+        ultima, siguiente = ciudades[j[k]], ciudades[(j[k] + 1) % n]
+        deltas[k] = (matriz[anterior, ultima] + matriz[primera, siguiente]) - (matriz[anterior, primera] + matriz[ultima, siguiente])
+    return deltas
+
+
+def _evaluar_or_opt(ciudades, matriz, s, j, longitud):
+    n = len(ciudades)
+    deltas = np.empty(len(s))
+    for k in range(len(s)):
+        e = s[k] + longitud[k] - 1
+        anterior, primera = ciudades[s[k] - 1], ciudades[s[k]]
+        ultima, siguiente = ciudades[e], ciudades[(e + 1) % n]
+        a, b = ciudades[j[k]], ciudades[(j[k] + 1) % n]
+        deltas[k] = ((matriz[anterior, siguiente] + matriz[a, primera] + matriz[ultima, b])
+                     - (matriz[anterior, primera] + matriz[ultima, siguiente] + matriz[a, b]))
+    return deltas
+
+
+def _mascara_no_tabu(claves, a, b, num_ciudades):
+    # Búsqueda binaria de cada casilla en el array ordenado de casillas tabú
+    mascara = np.ones(len(a), dtype=np.bool_)
+    for k in range(len(a)):
+        menor, mayor = min(a[k], b[k]), max(a[k], b[k])
+        consulta = menor * num_ciudades + mayor
+        izquierda, derecha = 0, len(claves)
+        while izquierda < derecha:
+            medio = (izquierda + derecha) // 2
+            if claves[medio] < consulta:
+                izquierda = medio + 1
+            else:
+                derecha = medio
+        if izquierda < len(claves) and claves[izquierda] == consulta:
+            mascara[k] = False
+    return mascara
+
+
+def _intercambiar(ciudades, posiciones, i, j):
+    ciudades[i], ciudades[j] = ciudades[j], ciudades[i]
+    posiciones[ciudades[i]] = i
+    posiciones[ciudades[j]] = j
+
+
+def _invertir(ciudades, posiciones, i, j):
+    while i < j:
+        ciudades[i], ciudades[j] = ciudades[j], ciudades[i]
+        posiciones[ciudades[i]] = i
+        posiciones[ciudades[j]] = j
+        i += 1
+        j -= 1
+    if i == j:
+        posiciones[ciudades[i]] = i
+
+
+def _reubicar(ciudades, posiciones, inicio, longitud, j):
+    tramo = ciudades[inicio:inicio + longitud].copy()
+    if j > inicio:
+        # Las ciudades de (fin, j] retroceden y el tramo queda al final
+        for p in range(inicio + longitud, j + 1):
+            ciudades[p - longitud] = ciudades[p]
+            posiciones[ciudades[p - longitud]] = p - longitud
+        destino = j - longitud + 1
+    else:
+        # Las ciudades de (j, inicio) avanzan y el tramo queda justo detrás de j
+        for p in range(inicio - 1, j, -1):
+            ciudades[p + longitud] = ciudades[p]
+            posiciones[ciudades[p + longitud]] = p + longitud
+        destino = j + 1
+    for k in range(longitud):
+        ciudades[destino + k] = tramo[k]
+        posiciones[tramo[k]] = destino + k
+
+
+class KernelsNumPy:
+    nombre = 'numpy'
+
+    # Implementación de referencia: operaciones vectorizadas de NumPy, válidas con cualquier proveedor de distancias
+
+    @staticmethod
+    def crear(params):
+        """
+        Elige el conjunto de núcleos según 'kernels' en config.txt.
+
+        :param params: Parámetros del archivo de configuración.
+        :return: KernelsNumba con 'numba' (o 'auto' si Numba está instalado), KernelsNumPy en otro caso.
+        """
+        modo = params.get('kernels', 'auto')
+        if modo == 'numba' and numba is None:
+            raise ImportError("kernels = numba requiere tener instalado el paquete numba")
+        if modo == 'numba' or (modo == 'auto' and numba is not None):
+            return KernelsNumba
+        return KernelsNumPy
+
+    @staticmethod
+    def evaluar_intercambio(ciudades, distancias, i, j):
+        return Utilidades.evaluar_movimientos(ciudades, distancias, i, j)
+
+    @staticmethod
+    def evaluar_2opt(ciudades, distancias, i, j):
+        n = len(ciudades)
+        anterior, primera = ciudades[i - 1], ciudades[i]
+        ultima, siguiente = ciudades[j], ciudades[(j + 1) % n]
+
+        desaparecen = distancias[anterior, primera] + distancias[ultima, siguiente]
+        nuevos = distancias[anterior, ultima] + distancias[primera, siguiente]
+        return nuevos - desaparecen
+
+    @staticmethod
+    def evaluar_or_opt(ciudades, distancias, s, j, longitud):
+        n = len(ciudades)
+        e = s + longitud - 1
+        anterior, primera = ciudades[s - 1], ciudades[s]
+        ultima, siguiente = ciudades[e], ciudades[(e + 1) % n]
+        a, b = ciudades[j], ciudades[(j + 1) % n]
+
+        desaparecen = distancias[anterior, primera] + distancias[ultima, siguiente] + distancias[a, b]
+        nuevos = distancias[anterior, siguiente] + distancias[a, primera] + distancias[ultima, b]
+        return nuevos - desaparecen
+
+    @staticmethod
+    def mascara_no_tabu(claves, a, b, num_ciudades):
+        consultas = np.minimum(a, b).astype(np.int64) * num_ciudades + np.maximum(a, b)
+        indices = np.minimum(np.searchsorted(claves, consultas), len(claves) - 1)
+        return claves[indices] != consultas
+
+    @staticmethod
+    def intercambiar(tour, i, j):
+        tour.intercambiar(i, j)
+
+    @staticmethod
+    def invertir(tour, i, j):
+        tour.invertir(i, j)
+
+    @staticmethod
+    def reubicar(tour, inicio, longitud, j):
+        tour.reubicar(inicio, longitud, j)
+
+
+if numba is not None:
+    # cache=True guarda el código compilado en __pycache__ para no recompilar en cada ejecución
+    _compilar = numba.njit(cache=True, nogil=True)
+    _evaluar_intercambio = _compilar(_evaluar_intercambio)
+    _evaluar_2opt = _compilar(_evaluar_2opt)
+    _evaluar_or_opt = _compilar(_evaluar_or_opt)
+    _mascara_no_tabu = _compilar(_mascara_no_tabu)
+    _intercambiar = _compilar(_intercambiar)
+    _invertir = _compilar(_invertir)
+    _reubicar = _compilar(_reubicar)
+
+
+class KernelsNumba(KernelsNumPy):
+    nombre = 'numba'
+
+    # Bucles compilados con Numba sobre la matriz densa. Con el proveedor perezoso (instancias grandes)
+    # la evaluación sigue siendo la de NumPy, que calcula los arcos por bloques
+
+    @staticmethod
+    def evaluar_intercambio(ciudades, distancias, i, j):
+        matriz = getattr(distancias, 'matriz', None)
+        if matriz is None:
+            return KernelsNumPy.evaluar_intercambio(ciudades, distancias, i, j)
+        return _evaluar_intercambio(ciudades, np.asarray(matriz), i, j)
+
+    @staticmethod
+    def evaluar_2opt(ciudades, distancias, i, j):
+        matriz = getattr(distancias, 'matriz', None)
+        if matriz is None:
+            return KernelsNumPy.evaluar_2opt(ciudades, distancias, i, j)
+        return _evaluar_2opt(ciudades, np.asarray(matriz), i, j)
+
+    @staticmethod
+    def evaluar_or_opt(ciudades, distancias, s, j, longitud):
+        matriz = getattr(distancias, 'matriz', None)
+        if matriz is None:
+            return KernelsNumPy.evaluar_or_opt(ciudades, distancias, s, j, longitud)
+        return _evaluar_or_opt(ciudades, np.asarray(matriz), s, j, longitud)
+
+    @staticmethod
+    def mascara_no_tabu(claves, a, b, num_ciudades):
+        return _mascara_no_tabu(claves, a, b, num_ciudades)
+
+    @staticmethod
+    def intercambiar(tour, i, j):
+        _intercambiar(tour.ciudades, tour.posiciones, i, j)
+
+    @staticmethod
+    def invertir(tour, i, j):
+        _invertir(tour.ciudades, tour.posiciones, i, j)
+
+    @staticmethod
+    def reubicar(tour, inicio, longitud, j):
+        _reubicar(tour.ciudades, tour.posiciones, inicio, longitud, j)
@@ -0,0 +1,348 @@
+from collections import deque
+
+import numpy as np
+
+from utils.kernels import KernelsNumPy
+
+
+class MemoriaCortoPlazo:
+    def __init__(self, num_ciudades, tenencia, capacidad, kernels=KernelsNumPy):
+        """
+        MCP (Memoria de Control de Prohibición) del Algoritmo Tabú con consultas y actualizaciones O(1).
+
+        Cada casilla (a, b) con a <= b se codifica como el entero a * n + b y se guarda en un diccionario
+        junto al valor del reloj en el que vence su tenencia. El reloj avanza en cada actualización, así que
+        no hace falta recorrer la memoria para decrementar tenencias: una casilla es tabú mientras su
+        vencimiento sea mayor que el reloj y siga dentro de la lista circular.
+
+        :param num_ciudades: Número de ciudades de la instancia.
+        :param tenencia: Número de actualizaciones que una casilla permanece prohibida.
+        :param capacidad: Tamaño de la lista circular (casillas prohibidas como máximo).
+        :param kernels: Núcleos con los que filtrar los entornos (utils.kernels).
+        """
+        self.num_ciudades = num_ciudades
+        self.kernels = kernels
+        self.tenencia = tenencia
+        self.capacidad = capacidad
+        self.reloj = 0
+        self.vencimientos = {}  # Casilla codificada -> reloj en el que deja de ser tabú
+        self.lista_circular = deque()  # Pares (casilla, vencimiento) en orden de inserción
+        self._claves_activas = None  # Array ordenado de casillas tabú, se reconstruye solo tras cambios
+
+    def codificar(self, a, b):
+        """Codifica la casilla (a, b) como un único entero, independientemente del orden."""
+        return min(a, b) * self.num_ciudades + max(a, b)
+
+    def es_tabu(self, a, b):
+        """
+        Comprueba si la casilla (a, b) está prohibida. Coste O(1).
+
+        :return: True si la casilla es tabú.
+        """
+        return self.vencimientos.get(self.codificar(a, b), 0) > self.reloj
+
+    def mascara_no_tabu(self, a, b):
+        """
+        Versión vectorizada de es_tabu para todo un entorno.
+
+        :param a: Array con el primer índice de cada casilla.
+        :param b: Array con el segundo índice de cada casilla.
+        :return: Máscara booleana, True para las casillas que no son tabú.
+        """
+        claves = self.claves_activas()
+        if len(claves) == 0:
+            return np.ones(len(a), dtype=bool)
+        return self.kernels.mascara_no_tabu(claves, a, b, self.num_ciudades)
+
+    def claves_activas(self):
+        """Array ordenado con las casillas tabú codificadas (solo se recalcula si la memoria ha cambiado)."""
+        if self._claves_activas is None:
+            activas = [clave for clave, vencimiento in self.vencimientos.items() if vencimiento > self.reloj]
+            self._claves_activas = np.sort(np.array(activas, dtype=np.int64))
+        return self._claves_activas
+
+    def actualizar(self, casillas):
+        """
+        Avanza el reloj (caducan las tenencias cumplidas) y prohíbe las nuevas casillas. Coste O(1) por casilla.
+
+        :param casillas: Pares (a, b) que pasan a ser tabú.
+        """
+        self.reloj += 1
+        vencimiento = self.reloj + self.tenencia
+
+        for a, b in casillas:
+            clave = self.codificar(a, b)
+            self.vencimientos[clave] = vencimiento
+            self.lista_circular.append((clave, vencimiento))
+
+        # Si la lista circular se llena, se olvidan las casillas más antiguas
+        while len(self.lista_circular) > self.capacidad:
+            clave, vencimiento = self.lista_circular.popleft()
+            if self.vencimientos.get(clave) == vencimiento:  # No se ha vuelto a prohibir después
+                del self.vencimientos[clave]
+
+        self._claves_activas = None
+
+    def limpiar(self):
+        """Vacía la memoria (p. ej. al reiniciar desde una nueva solución)."""
+        self.vencimientos.clear()
+        self.lista_circular.clear()
+        self._claves_activas = None
+
+    def estado(self):
+        """
+        Estado completo de la memoria para un checkpoint.
+
+        :return: Diccionario de arrays y diccionario con el reloj.
+        """
+        lista = np.array(self.lista_circular, dtype=np.int64).reshape(-1, 2)
+        arrays = {'claves': np.fromiter(self.vencimientos.keys(), dtype=np.int64, count=len(self.vencimientos)),
+                  'vencimientos': np.fromiter(self.vencimientos.values(), dtype=np.int64, count=len(self.vencimientos)),
+                  'lista_circular': lista}
+        return arrays, {'reloj': self.reloj}
+
+    def restaurar(self, arrays, meta):
+        """Recupera el estado devuelto por estado()."""
+        self.reloj = meta['reloj']
+        self.vencimientos = dict(zip(arrays['claves'].tolist(), arrays['vencimientos'].tolist()))
+        self.lista_circular = deque(map(tuple, arrays['lista_circular'].tolist()))
+        self._claves_activas = None
+
+    def __len__(self):
+        return len(self.claves_activas())
+
+
+class MemoriaLargoPlazo:
+    # Hasta este número de ciudades se reserva una casilla por cada par de ciudades
+    UMBRAL_DENSA = 2000
+
+    def __init__(self, num_ciudades, candidatos=None):
+        """
+        MLP (Memoria a Largo Plazo) del Algoritmo Tabú: cuántas actualizaciones ha pasado cada arco en el tour.
+
+        En lugar de sumar 1 a todos los arcos del tour en cada actualización, cada arco presente guarda el
+        reloj en el que entró; su frecuencia es lo acumulado en estancias anteriores más lo que lleva en el
+        tour. Así cada actualización solo toca los arcos que el movimiento elimina y crea.
+
+        Los contadores viven en arrays int32 indexados por casilla: una por par de ciudades si la instancia
+        es pequeña, o una por (ciudad, candidato) en las grandes; los arcos que no son de candidatos van a
+        casillas adicionales asignadas bajo demanda.
+
+        :param num_ciudades: Número de ciudades de la instancia.
+        :param candidatos: Lista de candidatos (utils.candidatos.ListaCandidatos), opcional.
+        """
+        self.num_ciudades = num_ciudades
+        self.reloj = 0
+        self.densa = num_ciudades <= MemoriaLargoPlazo.UMBRAL_DENSA
+        self.vecinos = None if self.densa or candidatos is None else candidatos.vecinos
+
+        if self.densa:
+            num_fijas = num_ciudades * num_ciudades
+        elif self.vecinos is not None:
+            num_fijas = self.vecinos.size
+        else:
+            num_fijas = 0
+
+        self.num_fijas = num_fijas
+        self.adicionales = {}  # Arco codificado -> casilla, para los arcos sin casilla fija
+        self.arcos_adicionales = []  # Arco de cada casilla adicional
+
+        capacidad = max(num_fijas, 1024)
+        self.acumulado = np.zeros(capacidad, dtype=np.int32)  # Frecuencia de estancias ya terminadas
+        self.inicio = np.full(capacidad, -1, dtype=np.int32)  # Reloj de entrada si el arco está en el tour, -1 si no
+
+    def casilla(self, a, b):
+        """
+        Devuelve la casilla del arco (a, b), asignando una adicional si no tiene casilla fija.
+
+        :return: Índice de la casilla en los arrays de contadores.
+        """
+        a, b = min(a, b), max(a, b)
+        if self.densa:
+            return a * self.num_ciudades + b
+
+        if self.vecinos is not None:
+            # El arco tiene casilla fija si una de sus ciudades es candidata de la otra
+            k = self.vecinos.shape[1]
+            for origen, destino in ((a, b), (b, a)):
+                posicion = np.flatnonzero(self.vecinos[origen] == destino)
+                if len(posicion):
+                    return origen * k + int(posicion[0])
+
+        clave = a * self.num_ciudades + b
+        casilla = self.adicionales.get(clave)
+        if casilla is None:
+            casilla = self.num_fijas + len(self.arcos_adicionales)
+            self.adicionales[clave] = casilla
+            self.arcos_adicionales.append((a, b))
+            if casilla >= len(self.acumulado):
+                self.ampliar()
+        return casilla
+
+    def arco(self, casilla):
+        """Devuelve el arco (a, b) de una casilla."""
+        if self.densa:
+            return divmod(int(casilla), self.num_ciudades)
+        if casilla < self.num_fijas:
+            origen, k = divmod(int(casilla), self.vecinos.shape[1])
+            return origen, int(self.vecinos[origen, k])
+        return self.arcos_adicionales[casilla - self.num_fijas]
+
+    def ampliar(self):
+        """Duplica la capacidad de los arrays de contadores."""
+        capacidad = len(self.acumulado)
+        self.acumulado = np.concatenate([self.acumulado, np.zeros(capacidad, dtype=np.int32)])
+        self.inicio = np.concatenate([self.inicio, np.full(capacidad, -1, dtype=np.int32)])
+
+    def salir(self, a, b):
+        # El arco se contó en las actualizaciones [inicio, reloj - 1]
+        casilla = self.casilla(a, b)
+        if self.inicio[casilla] >= 0:
+            self.acumulado[casilla] += self.reloj - self.inicio[casilla]
+            self.inicio[casilla] = -1
+
+    def entrar(self, a, b, reloj):
+        casilla = self.casilla(a, b)  # Puede ampliar los arrays, así que se calcula antes de indexar
+        self.inicio[casilla] = reloj
+
+    def actualizar(self, arcos_salen, arcos_entran):
+        """
+        Registra una actualización del tour a partir de los arcos que ha cambiado el movimiento.
+
+        :param arcos_salen: Arcos que el movimiento ha eliminado.
+        :param arcos_entran: Arcos que el movimiento ha creado.
+        """
+        self.reloj += 1
+        for a, b in arcos_salen:
+            self.salir(a, b)
+        for a, b in arcos_entran:
+            self.entrar(a, b, self.reloj)
+
+    def establecer_tour(self, ciudades):
+        """
+        Sustituye el tour completo (p. ej. tras un reinicio). Los arcos del nuevo tour empiezan a contar
+        en la siguiente actualización. Coste O(n).
+
+        :param ciudades: Array de ciudades del nuevo tour.
+        """
+        presentes = np.flatnonzero(self.inicio >= 0)
+        self.acumulado[presentes] += self.reloj - self.inicio[presentes] + 1
+        self.inicio[presentes] = -1
+
+        ciudades = np.asarray(ciudades)
+        for a, b in zip(ciudades.tolist(), np.roll(ciudades, -1).tolist()):
+            self.entrar(a, b, self.reloj + 1)
+
+    def frecuencias(self):
+        """Frecuencia actual de cada casilla en uso."""
+        usadas = self.num_fijas + len(self.arcos_adicionales)
+        inicio = self.inicio[:usadas]
+        en_tour = np.where(inicio >= 0, self.reloj - inicio + 1, 0)
+        return self.acumulado[:usadas] + en_tour
+
+    def casillas_arcos(self, a, b):
+        """
+        Versión vectorizada de casilla para muchos arcos a la vez (p. ej. todos los de un tour).
+        A diferencia de casilla, no asigna casillas nuevas.
+
+        :param a: Array con la primera ciudad de cada arco.
+        :param b: Array con la segunda ciudad de cada arco.
+        :return: Array int64 con la casilla de cada arco, -1 si no tiene.
+        """
+        a = np.asarray(a, dtype=np.int64)
+        b = np.asarray(b, dtype=np.int64)
+        a, b = np.minimum(a, b), np.maximum(a, b)
+        if self.densa:
+            return a * self.num_ciudades + b
+
+        casillas = np.full(len(a), -1, dtype=np.int64)
+        if self.vecinos is not None:
+            # Como en casilla, si b es candidata de a esa casilla tiene prioridad (se aplica la última)
+            k = self.vecinos.shape[1]
+            for origen, destino in ((b, a), (a, b)):
+                coincide = self.vecinos[origen] == destino[:, None]
+                encontrado = coincide.any(axis=1)
+                casillas = np.where(encontrado, origen * k + coincide.argmax(axis=1), casillas)
+
+        for indice in np.flatnonzero(casillas < 0).tolist():
+            casillas[indice] = self.adicionales.get(int(a[indice]) * self.num_ciudades + int(b[indice]), -1)
+        return casillas
+
+    def frecuencias_arcos(self, a, b):
+        """
+        Versión vectorizada de __getitem__. Un arco sin casilla tiene frecuencia 0.
+
+        :return: Array int64 con la frecuencia de cada arco (a[i], b[i]).
+        """
+        casillas = self.casillas_arcos(a, b)
+        validas = casillas >= 0
+        frecuencias = np.zeros(len(casillas), dtype=np.int64)
+        inicio = self.inicio[casillas[validas]]
+        frecuencias[validas] = self.acumulado[casillas[validas]] + np.where(inicio >= 0, self.reloj - inicio + 1, 0)
+        return frecuencias
+
+    def reforzar(self, a, b, cantidad):
+        """
+        Suma frecuencia a unos arcos sin que estén en el tour (p. ej. los de las soluciones élite de otras
+        islas), para que las estrategias de reinicio los traten como arcos que se repiten.
+
+        :param a: Array con la primera ciudad de cada arco.
+        :param b: Array con la segunda ciudad de cada arco.
+        :param cantidad: Frecuencia que se suma a cada arco.
+        """
+        casillas = self.casillas_arcos(a, b)
+        for indice in np.flatnonzero(casillas < 0).tolist():
+            casillas[indice] = self.casilla(int(a[indice]), int(b[indice]))  # Puede ampliar los arrays
+        np.add.at(self.acumulado, casillas, cantidad)
+
+    def extremos(self, cantidad, mas_usados=True):
+        """
+        Arcos más (o menos) frecuentes entre los que han estado alguna vez en el tour, sin ordenar la memoria.
+
+        :param cantidad: Número de arcos a devolver.
+        :param mas_usados: True para los más frecuentes, False para los menos frecuentes.
+        :return: Lista de pares (arco, frecuencia), del más extremo al menos.
+        """
+        frecuencias = self.frecuencias()
+        casillas = np.flatnonzero(frecuencias > 0)
+        if len(casillas) == 0:
+            return []
+
+        valores = frecuencias[casillas] if not mas_usados else -frecuencias[casillas]
+        cantidad = min(cantidad, len(casillas))
+        seleccion = np.argpartition(valores, cantidad - 1)[:cantidad]
+        seleccion = seleccion[np.argsort(valores[seleccion], kind='stable')]
+        return [(self.arco(casilla), int(frecuencias[casilla])) for casilla in casillas[seleccion]]
+
+    def estado(self):
+        """
+        Estado de la memoria para un checkpoint. Solo se guardan las casillas con algún valor, así que
+        el tamaño depende de los arcos que han pasado por el tour y no de n².
+
+        :return: Diccionario de arrays y diccionario con el reloj.
+        """
+        usadas = self.num_fijas + len(self.arcos_adicionales)
+        casillas = np.flatnonzero((self.acumulado[:usadas] != 0) | (self.inicio[:usadas] >= 0))
+        arrays = {'casillas': casillas, 'acumulado': self.acumulado[casillas], 'inicio': self.inicio[casillas],
+                  'arcos_adicionales': np.array(self.arcos_adicionales, dtype=np.int64).reshape(-1, 2)}
+        return arrays, {'reloj': self.reloj}
+
+    def restaurar(self, arrays, meta):
+        """Recupera el estado devuelto por estado()."""
+        self.reloj = meta['reloj']
+        self.arcos_adicionales = [tuple(arco) for arco in arrays['arcos_adicionales'].tolist()]
+        self.adicionales = {a * self.num_ciudades + b: self.num_fijas + indice for indice, (a, b) in enumerate(self.arcos_adicionales)}
+        while self.num_fijas + len(self.arcos_adicionales) > len(self.acumulado):
+            self.ampliar()
+
+        self.acumulado[:] = 0
+        self.inicio[:] = -1
+        self.acumulado[arrays['casillas']] = arrays['acumulado']
+        self.inicio[arrays['casillas']] = arrays['inicio']
+
+    def __getitem__(self, arco):
+        """Frecuencia de un arco (a, b)."""
+        a, b = arco
+        casilla = self.casilla(a, b)
+        inicio = self.inicio[casilla]
+        return int(self.acumulado[casilla] + (self.reloj - inicio + 1 if inicio >= 0 else 0))
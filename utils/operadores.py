@@ -0,0 +1,212 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from utils.kernels import KernelsNumPy
+from utils.utilidades import Utilidades
+
+
+class Operador(ABC):
+    # Nombre con el que se selecciona en config.txt (operador = ...)
+    nombre = None
+
+    def __init__(self, params):
+        """
+        Operador de movimiento. Un movimiento es una tupla de enteros; los entornos se manejan como
+        tuplas de arrays (una componente por array) para generarlos y evaluarlos de forma vectorizada.
+
+        La evaluación y la aplicación de movimientos se delegan en un conjunto de núcleos (utils.kernels):
+        compilados con Numba si está disponible, o las versiones NumPy en otro caso.
+
+        :param params: Parámetros del archivo de configuración.
+        """
+        self.params = params
+        self.kernels = KernelsNumPy.crear(params)
+
+    @staticmethod
+    def crear(params):
+        """
+        Crea el operador indicado en config.txt (por defecto, el intercambio de dos ciudades).
+
+        :param params: Parámetros del archivo de configuración.
+        :return: Instancia de la subclase de Operador correspondiente.
+        """
+        nombre = params.get('operador', OperadorIntercambio.nombre)
+        for clase in (OperadorIntercambio, Operador2Opt, OperadorOrOpt):
+            if clase.nombre == nombre:
+                return clase(params)
+        raise ValueError(f"Operador desconocido en config.txt: {nombre}")
+
+    @abstractmethod
+    def seleccionar_movimientos(self, tamanio_entorno, tour_actual, rng, candidatos=None):
+        """
+        Genera los movimientos de un entorno.
+
+        :param tamanio_entorno: Número de movimientos a generar.
+        :param tour_actual: Tour actual (utils.tour.Tour).
+        :param rng: Generador aleatorio de NumPy (np.random.Generator).
+        :param candidatos: Lista de candidatos (utils.candidatos.ListaCandidatos) o None.
+        :return: Tupla de arrays con las componentes de los movimientos.
+        """
+
+    @abstractmethod
+    def evaluar(self, ciudades, distancias, movimientos):
+        """
+        Calcula en O(1) por movimiento la variación de distancia de cada movimiento del entorno.
+
+        :param ciudades: Array de ciudades en el orden de la ruta.
+        :param distancias: Proveedor de distancias entre las ciudades (ver utils.distancias).
+        :param movimientos: Tupla de arrays devuelta por seleccionar_movimientos.
+        :return: Array de deltas (nueva distancia - distancia actual).
+        """
+
+    @abstractmethod
+    def aplicar(self, tour, movimiento):
+        """
+        Aplica un movimiento en el sitio.
+
+        :param tour: Tour (utils.tour.Tour).
+        :param movimiento: Tupla de enteros con las componentes del movimiento.
+        """
+
+    @abstractmethod
+    def arcos(self, ciudades, movimiento):
+        """
+        Arcos que el movimiento elimina y crea. Debe llamarse antes de aplicarlo.
+
+        :param ciudades: Array de ciudades en el orden de la ruta.
+        :param movimiento: Tupla de enteros con las componentes del movimiento.
+        :return: Lista de arcos que salen del tour y lista de arcos que entran (pares de ciudades).
+        """
+
+    def generar_vecinos(self, tamanio_entorno, tour_actual, distancias, rng, candidatos=None):
+        """
+        Genera y evalúa de una vez un entorno de movimientos.
+
+        :return: Tupla de arrays de movimientos y array de deltas.
+        """
+        movimientos = self.seleccionar_movimientos(tamanio_entorno, tour_actual, rng, candidatos)
+        return movimientos, self.evaluar(tour_actual.ciudades, distancias, movimientos)
+
+
+class OperadorIntercambio(Operador):
+    nombre = 'intercambio'
+
+    # Intercambia las ciudades de las posiciones i y j (el operador original de la práctica)
+
+    def seleccionar_movimientos(self, tamanio_entorno, tour_actual, rng, candidatos=None):
+        return Utilidades.seleccionar_movimientos(tamanio_entorno, tour_actual, rng, candidatos)
+
+    def evaluar(self, ciudades, distancias, movimientos):
+        i, j = movimientos
+        return self.kernels.evaluar_intercambio(ciudades, distancias, i, j)
+
+    def aplicar(self, tour, movimiento):
+        i, j = movimiento
+        self.kernels.intercambiar(tour, i, j)
+
+    def arcos(self, ciudades, movimiento):
+        i, j = movimiento
+        n = len(ciudades)
+        anterior_i, ciudad_i, siguiente_i = int(ciudades[i - 1]), int(ciudades[i]), int(ciudades[(i + 1) % n])
+        anterior_j, ciudad_j, siguiente_j = int(ciudades[j - 1]), int(ciudades[j]), int(ciudades[(j + 1) % n])
+
+        if j - i == 1:
+            salen = [(anterior_i, ciudad_i), (ciudad_i, ciudad_j), (ciudad_j, siguiente_j)]
+            entran = [(anterior_i, ciudad_j), (ciudad_j, ciudad_i), (ciudad_i, siguiente_j)]
+        else:
+            salen = [(anterior_i, ciudad_i), (ciudad_i, siguiente_i), (anterior_j, ciudad_j), (ciudad_j, siguiente_j)]
+            entran = [(anterior_i, ciudad_j), (ciudad_j, siguiente_i), (anterior_j, ciudad_i), (ciudad_i, siguiente_j)]
+        return salen, entran
+
+
+class Operador2Opt(Operador):
+    nombre = '2opt'
+
+    # 2-opt auténtico: invierte el tramo de posiciones [i, j], sustituyendo los arcos
+    # (c[i-1], c[i]) y (c[j], c[j+1]) por (c[i-1], c[j]) y (c[i], c[j+1])
+
+    def seleccionar_movimientos(self, tamanio_entorno, tour_actual, rng, candidatos=None):
+        n = len(tour_actual)
+
+        # Dos posiciones distintas al azar en [1, n - 1]
+        i = rng.integers(1, n, size=tamanio_entorno)
+        j = rng.integers(1, n - 1, size=tamanio_entorno)
+        j += j >= i
+        i, j = np.minimum(i, j), np.maximum(i, j)
+
+        if candidatos is not None:
+            # Crear el arco (ciudad, vecina): basta con invertir el tramo que empieza tras la primera
+            origen = rng.integers(0, n, size=tamanio_entorno)
+            vecina = candidatos.vecinos[tour_actual.ciudades[origen], rng.integers(0, candidatos.num_candidatos, size=tamanio_entorno)]
+            posicion = tour_actual.posiciones[vecina].astype(np.int64)
+
+            inicio = np.minimum(origen, posicion) + 1
+            fin = np.maximum(origen, posicion)
+            validos = inicio < fin  # Si ya son consecutivas el movimiento no cambia nada
+
+            i = np.where(validos, inicio, i)
+            j = np.where(validos, fin, j)
+
+        return i, j
+
+    def evaluar(self, ciudades, distancias, movimientos):
+        i, j = movimientos
+        return self.kernels.evaluar_2opt(ciudades, distancias, i, j)
+
+    def aplicar(self, tour, movimiento):
+        i, j = movimiento
+        self.kernels.invertir(tour, i, j)
+
+    def arcos(self, ciudades, movimiento):
+        i, j = movimiento
+        anterior, primera = int(ciudades[i - 1]), int(ciudades[i])
+        ultima, siguiente = int(ciudades[j]), int(ciudades[(j + 1) % len(ciudades)])
+        return [(anterior, primera), (ultima, siguiente)], [(anterior, ultima), (primera, siguiente)]
+
+
+class OperadorOrOpt(Operador):
+    nombre = 'or_opt'
+
+    # Or-opt: mueve el tramo de longitud L que empieza en la posición s para colocarlo entre
+    # las ciudades de las posiciones j y j + 1. Movimiento = (s, j, L)
+
+    def __init__(self, params):
+        super().__init__(params)
+        self.longitud_maxima = params.get('longitud_or_opt', 3)
+
+    def seleccionar_movimientos(self, tamanio_entorno, tour_actual, rng, candidatos=None):
+        n = len(tour_actual)
+        longitud_maxima = max(1, min(self.longitud_maxima, n - 4))
+
+        # Tramo [s, s + L - 1] dentro de [1, n - 2] y destino j fuera de [s - 1, s + L - 1]
+        longitud = rng.integers(1, longitud_maxima + 1, size=tamanio_entorno)
+        s = 1 + (rng.random(tamanio_entorno) * (n - 1 - longitud)).astype(np.int64)
+        j = (rng.random(tamanio_entorno) * (n - longitud - 1)).astype(np.int64)
+        j += (j >= s - 1) * (longitud + 1)
+
+        if candidatos is not None:
+            # Colocar el tramo justo detrás de un vecino cercano de su primera ciudad
+            vecina = candidatos.vecinos[tour_actual.ciudades[s], rng.integers(0, candidatos.num_candidatos, size=tamanio_entorno)]
+            posicion = tour_actual.posiciones[vecina].astype(np.int64)
+            validos = (posicion < s - 1) | (posicion > s + longitud - 1)
+            j = np.where(validos, posicion, j)
+
+        return s, j, longitud
+
+    def evaluar(self, ciudades, distancias, movimientos):
+        s, j, longitud = movimientos
+        return self.kernels.evaluar_or_opt(ciudades, distancias, s, j, longitud)
+
+    def aplicar(self, tour, movimiento):
+        s, j, longitud = movimiento
+        self.kernels.reubicar(tour, s, longitud, j)
+
+    def arcos(self, ciudades, movimiento):
+        s, j, longitud = movimiento
+        n = len(ciudades)
+        e = s + longitud - 1
+        anterior, primera = int(ciudades[s - 1]), int(ciudades[s])
+        ultima, siguiente = int(ciudades[e]), int(ciudades[(e + 1) % n])
+        a, b = int(ciudades[j]), int(ciudades[(j + 1) % n])
+        return [(anterior, primera), (ultima, siguiente), (a, b)], [(anterior, siguiente), (a, primera), (ultima, b)]
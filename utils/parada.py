@@ -0,0 +1,87 @@
+import time
+
+
+class CriterioParada:
+    # Tiempo mínimo que se deja a un subalgoritmo cuando ya no queda presupuesto (0 significaría sin límite)
+    TIEMPO_MINIMO = 1e-3
+
+    def __init__(self, tiempo_maximo=0, max_evaluaciones=0, distancia_objetivo=0):
+        """
+        Criterios de parada comunes a todos los algoritmos, además de sus propias iteraciones.
+        Un valor 0 desactiva el criterio correspondiente.
+
+        :param tiempo_maximo: Segundos de reloj que puede durar la ejecución.
+        :param max_evaluaciones: Número máximo de movimientos evaluados.
+        :param distancia_objetivo: Distancia a partir de la cual se considera resuelto el problema.
+        """
+        self.tiempo_maximo = tiempo_maximo
+        self.max_evaluaciones = max_evaluaciones
+        self.distancia_objetivo = distancia_objetivo
+        self.evaluaciones = 0
+        self.limite = None
+        self.motivo = None
+        self.iniciar()
+
+    @staticmethod
+    def desde_params(params):
+        """
+        Crea el criterio a partir de config.txt (tiempo_maximo, max_evaluaciones y distancia_objetivo).
+
+        :param params: Parámetros del archivo de configuración.
+        :return: Instancia de CriterioParada, con el reloj ya en marcha.
+        """
+        return CriterioParada(params.get('tiempo_maximo', 0), params.get('max_evaluaciones', 0), params.get('distancia_objetivo', 0))
+
+    def iniciar(self):
+        """Pone en marcha el reloj y reinicia el contador de evaluaciones."""
+        self.evaluaciones = 0
+        self.motivo = None
+        self.limite = time.perf_counter() + self.tiempo_maximo if self.tiempo_maximo else None
+
+    def reanudar(self, evaluaciones, tiempo_previo):
+        """
+        Continúa una ejecución interrumpida: el presupuesto no vuelve a empezar al reanudar.
+
+        :param evaluaciones: Movimientos evaluados antes de la interrupción.
+        :param tiempo_previo: Segundos ejecutados antes de la interrupción (se descuentan del límite de tiempo).
+        """
+        self.evaluaciones = evaluaciones
+        if self.limite is not None:
+            self.limite -= tiempo_previo
+
+    def restante(self, params, partes_tiempo=1, partes_evaluaciones=1):
+        """
+        Parámetros para los subalgoritmos (islas, clusters, reparación) con lo que queda del presupuesto, de
+        modo que entre todos no superen tiempo_maximo ni max_evaluaciones.
+
+        :param params: Parámetros del archivo de configuración.
+        :param partes_tiempo: Tramos consecutivos entre los que se reparte el tiempo restante (1 si van en paralelo).
+        :param partes_evaluaciones: Subalgoritmos entre los que se reparten las evaluaciones restantes.
+        :return: Copia de params con tiempo_maximo y max_evaluaciones ajustados.
+        """
+        restante = dict(params)
+        if self.limite is not None:
+            restante['tiempo_maximo'] = max(self.limite - time.perf_counter(), CriterioParada.TIEMPO_MINIMO) / partes_tiempo
+        if self.max_evaluaciones:
+            restante['max_evaluaciones'] = max(1, (self.max_evaluaciones - self.evaluaciones) // partes_evaluaciones)
+        return restante
+
+    def contar(self, evaluaciones):
+        """Suma movimientos evaluados al contador."""
+        self.evaluaciones += evaluaciones
+
+    def agotado(self, distancia=None):
+        """
+        Comprueba si se debe parar. Es barato (unas comparaciones y una lectura del reloj), así que puede
+        llamarse en cada iteración de los bucles de los algoritmos.
+
+        :param distancia: Mejor distancia encontrada hasta ahora (para la distancia objetivo), opcional.
+        :return: True si se ha cumplido algún criterio; el motivo queda en self.motivo.
+        """
+        if self.max_evaluaciones and self.evaluaciones >= self.max_evaluaciones:
+            self.motivo = f"límite de evaluaciones ({self.evaluaciones})"
+        elif self.distancia_objetivo and distancia is not None and distancia <= self.distancia_objetivo:
+            self.motivo = f"distancia objetivo alcanzada ({distancia})"
+        elif self.limite is not None and time.perf_counter() >= self.limite:
+            self.motivo = f"límite de tiempo ({self.tiempo_maximo} s)"
+        return self.motivo is not None
@@ -0,0 +1,97 @@
+import json
+import time
+
+
+class Perfilador:
+    def __init__(self):
+        """
+        Temporizadores acumulados por fase y contadores de eventos de una ejecución.
+
+        Los algoritmos reciben None cuando el perfilado está desactivado y comprueban 'if perfil:' antes de
+        cada medida (igual que con los mensajes de depuración), así que desactivado no cuesta nada.
+        """
+        self.inicio = time.perf_counter()
+        self.fases = {}  # Nombre -> [segundos acumulados, veces]
+        self.contadores = {}
+
+    def fase(self, nombre, desde):
+        """
+        Suma a una fase el tiempo transcurrido desde 'desde' y devuelve el instante actual, de modo que
+        las fases consecutivas se encadenan con una sola lectura del reloj:
+
+            t = perfil.fase('generar_vecinos', t)
+
+        :param nombre: Nombre de la fase.
+        :param desde: Instante (time.perf_counter) en que empezó la fase.
+        :return: Instante actual.
+        """
+        ahora = time.perf_counter()
+        acumulado = self.fases.get(nombre)
+        if acumulado is None:
+            self.fases[nombre] = [ahora - desde, 1]
+        else:
+            acumulado[0] += ahora - desde
+            acumulado[1] += 1
+        return ahora
+
+    def contar(self, nombre, cantidad=1):
+        """Suma una cantidad a un contador (evaluaciones, movimientos aceptados, reinicios...)."""
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + cantidad
+
+    @staticmethod
+    def ahora():
+        """Instante actual, para abrir la primera fase de un tramo medido."""
+        return time.perf_counter()
+
+    def informe(self):
+        """
+        Resume la ejecución en un diccionario serializable a JSON.
+
+        :return: Tiempo total, fases (segundos, veces y porcentaje), contadores y evaluaciones por segundo.
+        """
+        total = time.perf_counter() - self.inicio
+        fases = {nombre: {'segundos': segundos, 'veces': veces, 'porcentaje': 100 * segundos / total if total > 0 else 0.0}
+                 for nombre, (segundos, veces) in self.fases.items()}
+        evaluaciones = self.contadores.get('evaluaciones', 0)
+        return {'tiempo_total': total, 'fases': fases, 'contadores': dict(self.contadores),
+                'evaluaciones_por_segundo': evaluaciones / total if total > 0 else 0.0}
+
+    @staticmethod
+    def agregar(informes):
+        """
+        Suma los informes de varias ejecuciones (p. ej. todas las semillas de un algoritmo).
+
+        :param informes: Lista de diccionarios devueltos por informe().
+        :return: Diccionario con el mismo formato que informe().
+        """
+        total = sum(informe['tiempo_total'] for informe in informes)
+        fases, contadores = {}, {}
+        for informe in informes:
+            for nombre, datos in informe['fases'].items():
+                acumulado = fases.setdefault(nombre, {'segundos': 0.0, 'veces': 0})
+                acumulado['segundos'] += datos['segundos']
+                acumulado['veces'] += datos['veces']
+            for nombre, valor in informe['contadores'].items():
+                contadores[nombre] = contadores.get(nombre, 0) + valor
+
+        for datos in fases.values():
+            datos['porcentaje'] = 100 * datos['segundos'] / total if total > 0 else 0.0
+        evaluaciones = contadores.get('evaluaciones', 0)
+        return {'tiempo_total': total, 'fases': fases, 'contadores': contadores,
+                'evaluaciones_por_segundo': evaluaciones / total if total > 0 else 0.0}
+
+    @staticmethod
+    def guardar(ruta, datos):
+        """Escribe el informe en JSON."""
+        with open(ruta, 'w') as f:
+            json.dump(datos, f, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def imprimir_tabla(titulo, informe):
+        """Muestra un informe como tabla: una fila por fase, ordenadas por tiempo, y después los contadores."""
+        print(f"{titulo} | Tiempo total: {informe['tiempo_total']:.3f} s | Evaluaciones/s: {informe['evaluaciones_por_segundo']:.0f}")
+        print(f"    {'Fase':<20} {'Segundos':>10} {'Veces':>10} {'%':>7}")
+        for nombre, datos in sorted(informe['fases'].items(), key=lambda item: -item[1]['segundos']):
+            print(f"    {nombre:<20} {datos['segundos']:>10.4f} {datos['veces']:>10} {datos['porcentaje']:>6.1f}%")
+        for nombre, valor in informe['contadores'].items():
+            print(f"    {nombre}: {valor}")
@@ -1,34 +1,218 @@
+import gzip
+from itertools import islice
+
 import numpy as np
-from scipy.spatial.distance import cdist
+
+from utils.candidatos import ListaCandidatos
+from utils.distancias import Distancias, MatrizDistancias
 
 class TSP:
-    def __init__(self, archivo):
+    # Secciones de datos de TSPLIB (todo lo demás en la cabecera son pares CLAVE : VALOR)
+    SECCIONES = {'NODE_COORD_SECTION', 'EDGE_WEIGHT_SECTION', 'DISPLAY_DATA_SECTION', 'TOUR_SECTION',
+                 'DEPOT_SECTION', 'DEMAND_SECTION', 'EDGE_DATA_SECTION', 'FIXED_EDGES_SECTION', 'EOF'}
+
+    def __init__(self, archivo, umbral_matriz_densa=None, num_candidatos=None, cache=None, cache_matriz=False, distancia_tsplib=False):
+        """
+        Instancia del problema leída de un archivo TSP (TSPLIB, admite .gz).
+
+        :param archivo: Ruta del archivo TSP.
+        :param umbral_matriz_densa: Número máximo de ciudades para usar la matriz completa de distancias.
+        :param num_candidatos: Número de vecinos más cercanos por ciudad (None para no calcularlos).
+        :param cache: Caché en disco (utils.cache_instancias.CacheInstancias) o None.
+        :param cache_matriz: Si es True, la matriz densa se guarda en la caché en float32 y se mapea al cargar.
+        :param distancia_tsplib: Si es True se respeta EDGE_WEIGHT_TYPE; si es False, euclídea sin redondeo.
+        """
         self.archivo = archivo
-        self.matriz_distancias = None
+        self.umbral_matriz_densa = umbral_matriz_densa if umbral_matriz_densa is not None else Distancias.UMBRAL_MATRIZ_DENSA
+        self.num_candidatos = num_candidatos
+        self.cache = cache
+        self.cache_matriz = cache_matriz
+        self.distancia_tsplib = distancia_tsplib
+        self.cabecera = {}
+        self.tipo_distancia = None
+        self.coordenadas = None
+        self.distancias = None
+        self.candidatos = None
         self.tour_inicial = None
 
     def procesar(self):
-        with open(self.archivo, 'r') as f:
-            lineas = f.readlines()
-
-        # Inicializa las coordenadas
-        coordenadas = []
-
-        # Procesa el archivo para construir la matriz de distancias y el tour inicial
-        for i, linea in enumerate(lineas):
-            if 'DIMENSION' in linea:
-                dimension = int(linea.split(':')[1].strip())
-                self.matriz_distancias = np.zeros((dimension, dimension))
-            elif 'NODE_COORD_SECTION' in linea:
-                for j in range(dimension):
-                    ciudad, x, y = map(float, lineas[i + 1 + j].split())
-                    coordenadas.append((x, y))  # Guarda las coordenadas
-            elif 'EOF' in linea:
-                break
+        # Entrada de la caché asociada al contenido del archivo (si hay caché)
+        entrada = self.cache.entrada(self.archivo) if self.cache else None
+
+        # La cabecera se lee siempre (son pocas líneas); las secciones solo si no están en la caché
+        self.cabecera = self.leer_instancia(solo_cabecera=True)[0]
+        self.tipo_distancia = self.obtener_tipo_distancia()
+        nombre_datos = 'matriz_explicita' if self.tipo_distancia == 'EXPLICIT' else 'coordenadas'
+
+        datos = entrada.cargar(nombre_datos) if entrada else None
+        if datos is None:
+            _, coordenadas, matriz = self.leer_instancia()
+            datos = matriz if self.tipo_distancia == 'EXPLICIT' else coordenadas
+            if entrada:
+                datos = entrada.guardar(nombre_datos, datos)
+
+        if self.tipo_distancia == 'EXPLICIT':
+            self.distancias = MatrizDistancias(datos)
+        else:
+            # Matriz densa para instancias pequeñas, cálculo perezoso desde coordenadas para las grandes
+            self.coordenadas = datos
+            self.distancias = self.crear_distancias(entrada)
+
+        if entrada:
+            suma = entrada.cargar(f'suma_distancias_{self.tipo_distancia}')
+            if suma is None:
+                suma = entrada.guardar(f'suma_distancias_{self.tipo_distancia}', self.distancias.suma_distancias())
+            self.distancias.suma = suma
 
-        # Calcula la matriz de distancias usando scipy
-        self.matriz_distancias = cdist(coordenadas, coordenadas, metric='euclidean')
+        # Índice de vecinos más cercanos, compartido por todos los algoritmos
+        if self.num_candidatos:
+            vecinos = entrada.cargar(f'candidatos_{self.tipo_distancia}_{self.num_candidatos}') if entrada else None
+            self.candidatos = ListaCandidatos(self.coordenadas, self.num_candidatos, vecinos, self.distancias)
+            if entrada and vecinos is None:
+                entrada.guardar(f'candidatos_{self.tipo_distancia}_{self.num_candidatos}', self.candidatos.vecinos)
 
         # Inicializa el tour inicial (puedes ajustar esto según tu lógica)
-        self.tour_inicial = list(range(dimension))
-        return self.matriz_distancias, self.tour_inicial
+        self.tour_inicial = list(range(self.distancias.num_ciudades))
+        return self.distancias, self.tour_inicial
+
+    def abrir(self):
+        """Abre el archivo en modo texto, descomprimiéndolo si es un gzip."""
+        with open(self.archivo, 'rb') as f:
+            comprimido = f.read(2) == b'\x1f\x8b'
+        return gzip.open(self.archivo, 'rt') if comprimido else open(self.archivo, 'r')
+
+    def leer_instancia(self, solo_cabecera=False):
+        """
+        Lee el archivo de forma secuencial: la cabecera línea a línea y cada sección de datos en bloque.
+
+        :param solo_cabecera: Si es True, se detiene en la primera sección.
+        :return: Cabecera (diccionario), coordenadas (array (n, 2) o None), matriz explícita (o None).
+        """
+        cabecera = {}
+        coordenadas = None
+        matriz = None
+
+        with self.abrir() as f:
+            for linea in f:
+                clave, _, valor = linea.partition(':')
+                clave = clave.strip().upper()
+                if not clave:
+                    continue
+
+                if clave not in TSP.SECCIONES:
+                    cabecera[clave] = valor.strip()
+                    continue
+
+                if solo_cabecera or clave == 'EOF':
+                    break
+
+                dimension = int(cabecera['DIMENSION'])
+                if clave == 'NODE_COORD_SECTION':
+                    coordenadas = TSP.leer_coordenadas(f, dimension)
+                elif clave == 'EDGE_WEIGHT_SECTION':
+                    formato = cabecera.get('EDGE_WEIGHT_FORMAT', 'FULL_MATRIX').upper()
+                    matriz = TSP.leer_matriz_explicita(f, dimension, formato)
+                elif coordenadas is not None or matriz is not None:
+                    # El resto de secciones no afectan a las distancias
+                    break
+
+        return cabecera, coordenadas, matriz
+
+    def obtener_tipo_distancia(self):
+        """
+        Determina la función de distancia a partir de EDGE_WEIGHT_TYPE.
+
+        :return: Clave de utils.distancias.Distancias.METRICAS, o 'EXPLICIT'.
+        """
+        tipo = self.cabecera.get('EDGE_WEIGHT_TYPE', 'EUC_2D').upper()
+        if tipo == 'EXPLICIT':
+            return tipo
+        if tipo not in Distancias.METRICAS:
+            raise ValueError(f"EDGE_WEIGHT_TYPE no soportado en {self.archivo}: {tipo}")
+        return tipo if self.distancia_tsplib else 'EUCLIDEA'
+
+    @staticmethod
+    def leer_coordenadas(f, dimension):
+        """
+        Lee en bloque las líneas 'id x y' de NODE_COORD_SECTION.
+
+        :param f: Archivo abierto, situado justo después de la cabecera de la sección.
+        :param dimension: Número de ciudades.
+        :return: Array (n, 2) con las coordenadas, ordenadas por identificador de ciudad.
+        """
+        datos = np.loadtxt(islice(f, dimension), usecols=(0, 1, 2), ndmin=2)
+        orden = np.argsort(datos[:, 0], kind='stable')
+        return np.ascontiguousarray(datos[orden, 1:3])
+
+    @staticmethod
+    def leer_numeros(f, cantidad):
+        """
+        Lee los siguientes 'cantidad' números del archivo, sin importar cómo estén repartidos en líneas.
+
+        :param f: Archivo abierto.
+        :param cantidad: Número de valores a leer.
+        :return: Array con los valores leídos.
+        """
+        bloques = []
+        leidos = 0
+        for linea in f:
+            valores = np.array(linea.split(), dtype=np.float64)
+            bloques.append(valores)
+            leidos += len(valores)
+            if leidos >= cantidad:
+                break
+
+        if leidos < cantidad:
+            raise ValueError(f"EDGE_WEIGHT_SECTION incompleta: se esperaban {cantidad} valores y hay {leidos}")
+        return np.concatenate(bloques)[:cantidad]
+
+    @staticmethod
+    def leer_matriz_explicita(f, dimension, formato):
+        """
+        Lee EDGE_WEIGHT_SECTION y construye la matriz simétrica completa.
+
+        :param f: Archivo abierto, situado justo después de la cabecera de la sección.
+        :param dimension: Número de ciudades.
+        :param formato: EDGE_WEIGHT_FORMAT de TSPLIB.
+        :return: Matriz (n, n) de distancias.
+        """
+        n = dimension
+        if formato == 'FULL_MATRIX':
+            return TSP.leer_numeros(f, n * n).reshape(n, n)
+
+        # Un triángulo por columnas es el triángulo opuesto por filas
+        equivalentes = {'UPPER_COL': 'LOWER_ROW', 'LOWER_COL': 'UPPER_ROW',
+                        'UPPER_DIAG_COL': 'LOWER_DIAG_ROW', 'LOWER_DIAG_COL': 'UPPER_DIAG_ROW'}
+        formato = equivalentes.get(formato, formato)
+
+        triangulos = {'UPPER_ROW': lambda: np.triu_indices(n, 1), 'LOWER_ROW': lambda: np.tril_indices(n, -1),
+                      'UPPER_DIAG_ROW': lambda: np.triu_indices(n, 0), 'LOWER_DIAG_ROW': lambda: np.tril_indices(n, 0)}
+        if formato not in triangulos:
+            raise ValueError(f"EDGE_WEIGHT_FORMAT no soportado: {formato}")
+
+        filas, columnas = triangulos[formato]()
+        matriz = np.zeros((n, n))
+        matriz[filas, columnas] = TSP.leer_numeros(f, len(filas))
+        matriz[columnas, filas] = matriz[filas, columnas]
+        return matriz
+
+    def crear_distancias(self, entrada=None):
+        """
+        Crea el proveedor de distancias, reutilizando la caché cuando es posible.
+
+        :param entrada: Entrada de la caché de esta instancia (o None).
+        :return: Proveedor de distancias (utils.distancias).
+        """
+        densa = len(self.coordenadas) <= self.umbral_matriz_densa
+
+        if entrada and densa and self.cache_matriz:
+            nombre = f'matriz_float32_{self.tipo_distancia}'
+            matriz = entrada.cargar(nombre)
+            if matriz is None:
+                # Las sumas por fila se guardan a partir de la matriz en float64 para no alterar el Greedy
+                completa = Distancias.crear(self.coordenadas, self.umbral_matriz_densa, self.tipo_distancia)
+                entrada.guardar(f'suma_distancias_{self.tipo_distancia}', completa.suma_distancias())
+                matriz = entrada.guardar(nombre, completa.matriz.astype(np.float32))
+            return MatrizDistancias(matriz)
+
+        return Distancias.crear(self.coordenadas, self.umbral_matriz_densa, self.tipo_distancia)
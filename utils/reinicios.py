@@ -0,0 +1,119 @@
+import numpy as np
+
+
+class Reinicio:
+    # Fragmentos al azar entre los que se busca el más cercano cuando ningún candidato sirve
+    MUESTRA_FRAGMENTOS = 8
+
+    @staticmethod
+    def doble_puente(ciudades, distancia, distancias, rng):
+        """
+        Perturbación double-bridge: corta el tour en cuatro tramos A B C D y los une como A C B D.
+        Cambia solo tres arcos, así que la distancia se actualiza en O(1) y se conserva casi toda la estructura.
+
+        :param ciudades: Array de ciudades del tour de partida (normalmente el mejor global).
+        :param distancia: Distancia del tour de partida.
+        :param distancias: Proveedor de distancias entre las ciudades (ver utils.distancias).
+        :param rng: Generador aleatorio de NumPy (np.random.Generator).
+        :return: Array de ciudades del nuevo tour y su distancia.
+        """
+        n = len(ciudades)
+        if n < 8:
+            return ciudades.copy(), distancia  # No caben cuatro tramos no vacíos
+
+        p1, p2, p3 = np.sort(rng.choice(np.arange(1, n), size=3, replace=False)).tolist()
+        fin_a, inicio_b, fin_b = ciudades[p1 - 1], ciudades[p1], ciudades[p2 - 1]
+        inicio_c, fin_c, inicio_d = ciudades[p2], ciudades[p3 - 1], ciudades[p3]
+
+        desaparecen = distancias[fin_a, inicio_b] + distancias[fin_b, inicio_c] + distancias[fin_c, inicio_d]
+        nuevos = distancias[fin_a, inicio_c] + distancias[fin_c, inicio_b] + distancias[fin_b, inicio_d]
+
+        nuevas_ciudades = np.concatenate([ciudades[:p1], ciudades[p2:p3], ciudades[p1:p2], ciudades[p3:]])
+        return nuevas_ciudades, distancia + float(nuevos - desaparecen)
+
+    @staticmethod
+    def reconstruir(ciudades, distancia, distancias, frecuencias, fraccion, rng, candidatos=None):
+        """
+        Reconstrucción guiada por la MLP: rompe los arcos del tour menos frecuentes en la memoria y vuelve a
+        unir los fragmentos uniendo el extremo de cada uno con el fragmento libre más cercano.
+        Los arcos frecuentes se conservan, y la distancia se obtiene restando los arcos rotos y sumando los
+        de unión (O(fragmentos) en lugar de recorrer el tour completo).
+
+        :param ciudades: Array de ciudades del tour de partida.
+        :param distancia: Distancia del tour de partida.
+        :param distancias: Proveedor de distancias entre las ciudades (ver utils.distancias).
+        :param frecuencias: Frecuencia en la MLP de cada arco (ciudades[i], ciudades[i + 1]) del tour.
+        :param fraccion: Fracción de arcos que se rompen.
+        :param rng: Generador aleatorio de NumPy (np.random.Generator).
+        :param candidatos: Lista de candidatos (utils.candidatos.ListaCandidatos) o None.
+        :return: Array de ciudades del nuevo tour y su distancia.
+        """
+        n = len(ciudades)
+        num_cortes = min(n, max(3, int(fraccion * n)))
+
+        # Arcos menos frecuentes (los empates se deshacen al azar); el arco i une las posiciones i e i + 1
+        prioridad = frecuencias + rng.random(n)
+        cortes = np.sort(np.argpartition(prioridad, num_cortes - 1)[:num_cortes])
+
+        siguientes = ciudades[(cortes + 1) % n]
+        distancia -= float(np.sum(distancias[ciudades[cortes], siguientes]))
+
+        # Fragmentos: de la ciudad que sigue a un corte hasta la del corte siguiente
+        desplazamiento = int(cortes[0]) + 1
+        rotado = np.roll(ciudades, -desplazamiento)
+        fragmentos = np.split(rotado, (cortes[1:] + 1 - desplazamiento).tolist())
+        inicios = np.array([int(fragmento[0]) for fragmento in fragmentos])
+        finales = np.array([int(fragmento[-1]) for fragmento in fragmentos])
+
+        # Fragmento al que pertenece cada extremo (-1 para las ciudades interiores)
+        fragmento_de = np.full(n, -1, dtype=np.int64)
+        fragmento_de[inicios] = np.arange(len(fragmentos))
+        fragmento_de[finales] = np.arange(len(fragmentos))
+
+        # Fragmentos libres al principio de un array, con borrado O(1) intercambiando con el último libre
+        libres = rng.permutation(len(fragmentos))
+        hueco = np.empty(len(fragmentos), dtype=np.int64)
+        hueco[libres] = np.arange(len(fragmentos))
+        num_libres = len(fragmentos)
+
+        def tomar(fragmento):
+            nonlocal num_libres
+            num_libres -= 1
+            ultimo = libres[num_libres]
+            libres[hueco[fragmento]], libres[num_libres] = ultimo, fragmento
+            hueco[ultimo], hueco[fragmento] = hueco[fragmento], num_libres
+
+        primero = int(libres[0])
+        tomar(primero)
+        orden = [fragmentos[primero]]
+        extremo = int(finales[primero])
+
+        while num_libres > 0:
+            elegido, invertido = -1, False
+
+            if candidatos is not None:
+                # Los candidatos están ordenados por distancia: vale el primero que sea extremo de un fragmento libre
+                vecinos = candidatos.vecinos[extremo]
+                fragmentos_vecinos = fragmento_de[vecinos]
+                validos = np.flatnonzero(fragmentos_vecinos >= 0)
+                for posicion in validos.tolist():
+                    fragmento = int(fragmentos_vecinos[posicion])
+                    if hueco[fragmento] < num_libres:
+                        elegido, invertido = fragmento, int(vecinos[posicion]) != inicios[fragmento]
+                        break
+
+            if elegido < 0:
+                # Sin candidatos útiles: el extremo más cercano de una muestra de fragmentos libres
+                muestra = libres[rng.integers(0, num_libres, size=min(num_libres, Reinicio.MUESTRA_FRAGMENTOS))]
+                extremos = np.concatenate([inicios[muestra], finales[muestra]])
+                cercano = int(np.argmin(distancias[np.full(len(extremos), extremo), extremos]))
+                elegido, invertido = int(muestra[cercano % len(muestra)]), cercano >= len(muestra)
+
+            tomar(elegido)
+            entrada = finales[elegido] if invertido else inicios[elegido]
+            distancia += float(distancias[extremo, entrada])
+            orden.append(fragmentos[elegido][::-1] if invertido else fragmentos[elegido])
+            extremo = int(inicios[elegido] if invertido else finales[elegido])
+
+        distancia += float(distancias[extremo, inicios[primero]])
+        return np.concatenate(orden), distancia
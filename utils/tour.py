@@ -0,0 +1,128 @@
+import numpy as np
+
+
+class Tour:
+    def __init__(self, ciudades):
+        """
+        Representación compacta de un tour: array int32 de ciudades más el índice inverso de posiciones.
+        Los movimientos se aplican en el sitio, sin copiar el tour.
+
+        :param ciudades: Secuencia de ciudades en el orden de la ruta (se copia).
+        """
+        self.ciudades = np.array(ciudades, dtype=np.int32)
+        self.posiciones = np.empty(len(self.ciudades), dtype=np.int32)
+        self.posiciones[self.ciudades] = np.arange(len(self.ciudades), dtype=np.int32)
+
+    def intercambiar(self, i, j):
+        """
+        Intercambia en el sitio las ciudades de las posiciones i y j.
+
+        :param i: Posición de la primera ciudad.
+        :param j: Posición de la segunda ciudad.
+        """
+        ciudades = self.ciudades
+        ciudades[i], ciudades[j] = ciudades[j], ciudades[i]
+        self.posiciones[ciudades[i]] = i
+        self.posiciones[ciudades[j]] = j
+
+    def invertir(self, i, j):
+        """
+        Invierte en el sitio el tramo de posiciones [i, j] (movimiento 2-opt). Coste O(j - i).
+
+        :param i: Primera posición del tramo.
+        :param j: Última posición del tramo (i <= j).
+        """
+        tramo = self.ciudades[i:j + 1]
+        tramo[:] = tramo[::-1].copy()
+        self.posiciones[tramo] = np.arange(i, j + 1, dtype=np.int32)
+
+    def reubicar(self, inicio, longitud, j):
+        """
+        Mueve en el sitio el tramo [inicio, inicio + longitud - 1] para colocarlo entre las posiciones
+        j y j + 1 (movimiento Or-opt). Solo se desplazan las ciudades situadas entre el tramo y el destino.
+
+        :param inicio: Primera posición del tramo.
+        :param longitud: Número de ciudades del tramo.
+        :param j: Posición de la ciudad tras la que se coloca el tramo (fuera del tramo y distinta de inicio - 1).
+        """
+        if j > inicio:
+            # El tramo avanza: las ciudades de (fin, j] retroceden longitud posiciones
+            a, b, desplazamiento = inicio, j + 1, -longitud
+        else:
+            # El tramo retrocede: las ciudades de (j, inicio) avanzan longitud posiciones
+            a, b, desplazamiento = j + 1, inicio + longitud, longitud
+
+        zona = self.ciudades[a:b]
+        zona[:] = np.roll(zona, desplazamiento)
+        self.posiciones[zona] = np.arange(a, b, dtype=np.int32)
+
+    def siguiente(self, ciudad):
+        """Ciudad que sigue a la dada en el sentido del tour."""
+        return self.ciudades[(self.posiciones[ciudad] + 1) % len(self.ciudades)]
+
+    def anterior(self, ciudad):
+        """Ciudad que precede a la dada en el sentido del tour."""
+        return self.ciudades[self.posiciones[ciudad] - 1]
+
+    def siguientes(self, ciudades):
+        """Versión vectorizada de siguiente para un array de ciudades."""
+        return self.ciudades[(self.posiciones[ciudades].astype(np.int64) + 1) % len(self.ciudades)]
+
+    def anteriores(self, ciudades):
+        """Versión vectorizada de anterior para un array de ciudades."""
+        return self.ciudades[self.posiciones[ciudades].astype(np.int64) - 1]
+
+    def invertir_tramo(self, desde, hasta):
+        """
+        Invierte el camino que va de la ciudad 'desde' a la ciudad 'hasta' en el sentido del tour (puede dar
+        la vuelta al final del array). Si el camino es más largo que medio tour se invierte el resto, que
+        produce el mismo ciclo recorrido en sentido contrario.
+
+        :param desde: Primera ciudad del camino.
+        :param hasta: Última ciudad del camino.
+        """
+        n = len(self.ciudades)
+        i, j = int(self.posiciones[desde]), int(self.posiciones[hasta])
+        longitud = (j - i) % n + 1
+
+        if 2 * longitud > n:
+            i, j, longitud = (j + 1) % n, (i - 1) % n, n - longitud
+        if longitud < 2:
+            return
+
+        if i <= j:
+            self.invertir(i, j)
+        else:
+            indices = np.arange(i, i + longitud) % n
+            tramo = self.ciudades[indices[::-1]]
+            self.ciudades[indices] = tramo
+            self.posiciones[tramo] = indices
+
+    def copiar(self):
+        """Devuelve una copia independiente del tour."""
+        copia = Tour.__new__(Tour)
+        copia.ciudades = self.ciudades.copy()
+        copia.posiciones = self.posiciones.copy()
+        return copia
+
+    def copiar_de(self, otro):
+        """
+        Sobrescribe este tour con el contenido de otro del mismo tamaño, sin reservar memoria.
+
+        :param otro: Tour de origen.
+        """
+        np.copyto(self.ciudades, otro.ciudades)
+        np.copyto(self.posiciones, otro.posiciones)
+
+    def a_lista(self):
+        """Devuelve las ciudades del tour como lista de enteros de Python."""
+        return self.ciudades.tolist()
+
+    def __getitem__(self, indice):
+        return self.ciudades[indice]
+
+    def __len__(self):
+        return len(self.ciudades)
+
+    def __iter__(self):
+        return iter(self.ciudades)
@@ -0,0 +1,313 @@
+import math
+
+import numpy as np
+
+from utils.tour import Tour
+
+
+class TourDosNiveles:
+    # Si los cortes acumulan más de este múltiplo de los segmentos iniciales, se reconstruye la estructura
+    FACTOR_RECONSTRUCCION = 4
+
+    # Con estructura_tour = auto, a partir de este número de ciudades se usa la lista de dos niveles. Medido con la
+    # Búsqueda Local DLB y Lin-Kernighan desde el Greedy: por debajo el array es más rápido (la mayoría de las
+    # inversiones son cortas y el array invierte el lado menor); la lista solo gana hacia las 100000 ciudades
+    UMBRAL_DOS_NIVELES = 50000
+
+    def __init__(self, ciudades):
+        """
+        Tour como lista doblemente enlazada de dos niveles: las ciudades se agrupan en unos √n segmentos,
+        cada uno con un bit de inversión, y los segmentos forman un anillo en el orden del tour.
+
+        Cada ciudad guarda su segmento, su rango y sus vecinas dentro del segmento en el sentido "natural"
+        del segmento; el sentido del tour es el natural o el contrario según el bit. Así siguiente, anterior
+        y entre cuestan O(1), e invertir un camino cuesta O(√n): se cortan como mucho dos segmentos por
+        los extremos del camino y los segmentos intermedios solo cambian de orden en el anillo y de bit.
+        Cada segmento guarda además sus ciudades en orden natural (con rangos consecutivos), de modo que
+        cortar y unir segmentos son operaciones vectorizadas sobre como mucho √n ciudades.
+
+        Ofrece la misma interfaz por ciudades que utils.tour.Tour (siguiente, anterior, siguientes,
+        anteriores, invertir_tramo, ciudades...), pero no los movimientos por posiciones.
+
+        :param ciudades: Secuencia de ciudades en el orden de la ruta.
+        """
+        ciudades = np.asarray(ciudades, dtype=np.int64)
+        n = len(ciudades)
+        self.num_ciudades = n
+        self.tamanio_grupo = max(1, int(math.isqrt(n)))
+
+        # Nivel de las ciudades
+        self.segmento = np.empty(n, dtype=np.int64)
+        self.rango = np.empty(n, dtype=np.int64)
+        self.sig_natural = np.empty(n, dtype=np.int64)  # -1 al final del segmento
+        self.ant_natural = np.empty(n, dtype=np.int64)  # -1 al principio del segmento
+
+        # Nivel de los segmentos (como mucho n); los identificadores libres se reutilizan
+        self.invertido = np.zeros(n, dtype=bool)
+        self.primera = np.empty(n, dtype=np.int64)  # Extremos en el sentido natural
+        self.ultima = np.empty(n, dtype=np.int64)
+        self.rango_segmento = np.empty(n, dtype=np.int64)
+        self.construir(ciudades)
+
+    @staticmethod
+    def crear(ciudades, params):
+        """
+        Tour para los algoritmos que solo lo consultan por ciudades (siguiente, anterior, invertir_tramo).
+        Con la lista de dos niveles cada inversión cuesta O(√n) en lugar de O(n), lo que compensa su
+        mayor coste por consulta en instancias grandes.
+
+        :param ciudades: Secuencia de ciudades en el orden de la ruta (se copia).
+        :param params: Parámetros del archivo de configuración (estructura_tour).
+        :return: TourDosNiveles o utils.tour.Tour.
+        """
+        estructura = params.get('estructura_tour', 'auto')
+        if estructura == 'auto':
+            estructura = 'dos_niveles' if len(ciudades) >= TourDosNiveles.UMBRAL_DOS_NIVELES else 'array'
+        return TourDosNiveles(ciudades) if estructura == 'dos_niveles' else Tour(ciudades)
+
+    def construir(self, ciudades):
+        """Reparte las ciudades en segmentos consecutivos de tamanio_grupo ciudades, sin invertir."""
+        n, g = self.num_ciudades, self.tamanio_grupo
+        posiciones = np.arange(n)
+        num_segmentos = -(-n // g)
+
+        self.segmento[ciudades] = posiciones // g
+        self.rango[ciudades] = posiciones % g
+        self.sig_natural[ciudades] = np.where(posiciones % g == g - 1, -1, np.roll(ciudades, -1))
+        self.ant_natural[ciudades] = np.where(posiciones % g == 0, -1, np.roll(ciudades, 1))
+        self.sig_natural[ciudades[-1]] = -1  # El último segmento puede ser más corto
+
+        inicios = np.arange(num_segmentos) * g
+        self.invertido[:num_segmentos] = False
+        self.primera[:num_segmentos] = ciudades[inicios]
+        self.ultima[:num_segmentos] = ciudades[np.minimum(inicios + g, n) - 1]
+        self.miembros = [ciudades[inicio:inicio + g] for inicio in inicios.tolist()] + [None] * (n - num_segmentos)
+        self.anillo = np.arange(num_segmentos, dtype=np.int64)  # Segmentos en el orden del tour
+        self.rango_segmento[:num_segmentos] = self.anillo
+        self.libres = list(range(n - 1, num_segmentos - 1, -1))
+        self.max_segmentos = TourDosNiveles.FACTOR_RECONSTRUCCION * num_segmentos
+
+    # ----- Consultas -----
+
+    def _inicio(self, s):
+        """Primera ciudad del segmento en el sentido del tour."""
+        return int(self.ultima[s] if self.invertido[s] else self.primera[s])
+
+    def _final(self, s):
+        """Última ciudad del segmento en el sentido del tour."""
+        return int(self.primera[s] if self.invertido[s] else self.ultima[s])
+
+    def siguiente(self, ciudad):
+        """Ciudad que sigue a la dada en el sentido del tour."""
+        s = int(self.segmento[ciudad])
+        vecina = int(self.ant_natural[ciudad] if self.invertido[s] else self.sig_natural[ciudad])
+        if vecina >= 0:
+            return vecina
+        return self._inicio(self.anillo[(self.rango_segmento[s] + 1) % len(self.anillo)])
+
+    def anterior(self, ciudad):
+        """Ciudad que precede a la dada en el sentido del tour."""
+        s = int(self.segmento[ciudad])
+        vecina = int(self.sig_natural[ciudad] if self.invertido[s] else self.ant_natural[ciudad])
+        if vecina >= 0:
+            return vecina
+        return self._final(self.anillo[self.rango_segmento[s] - 1])
+
+    def siguientes(self, ciudades):
+        """Versión vectorizada de siguiente para un array de ciudades."""
+        s = self.segmento[ciudades]
+        vecinas = np.where(self.invertido[s], self.ant_natural[ciudades], self.sig_natural[ciudades])
+        fin = vecinas < 0
+        if fin.any():
+            t = self.anillo[(self.rango_segmento[s[fin]] + 1) % len(self.anillo)]
+            vecinas[fin] = np.where(self.invertido[t], self.ultima[t], self.primera[t])
+        return vecinas
+
+    def anteriores(self, ciudades):
+        """Versión vectorizada de anterior para un array de ciudades."""
+        s = self.segmento[ciudades]
+        vecinas = np.where(self.invertido[s], self.sig_natural[ciudades], self.ant_natural[ciudades])
+        inicio = vecinas < 0
+        if inicio.any():
+            t = self.anillo[self.rango_segmento[s[inicio]] - 1]
+            vecinas[inicio] = np.where(self.invertido[t], self.primera[t], self.ultima[t])
+        return vecinas
+
+    def _clave(self, ciudad):
+        # Orden de la ciudad en el tour: rango de su segmento y rango dentro de él en el sentido del tour
+        s = self.segmento[ciudad]
+        return int(self.rango_segmento[s]), int(-self.rango[ciudad] if self.invertido[s] else self.rango[ciudad])
+
+    def entre(self, a, b, c):
+        """
+        True si, recorriendo el tour desde a, se llega a b antes que a c (o b es a o c).
+
+        :param a: Ciudad de inicio del camino.
+        :param b: Ciudad consultada.
+        :param c: Ciudad final del camino.
+        """
+        ka, kb, kc = self._clave(a), self._clave(b), self._clave(c)
+        if ka <= kc:
+            return ka <= kb <= kc
+        return kb >= ka or kb <= kc
+
+    # ----- Modificación -----
+
+    def _nuevo_segmento(self, invertido):
+        s = self.libres.pop()
+        self.invertido[s] = invertido
+        return s
+
+    def _insertar_en_anillo(self, s, posicion):
+        self.anillo = np.concatenate((self.anillo[:posicion], [s], self.anillo[posicion:]))
+        self.rango_segmento[self.anillo[posicion:]] = np.arange(posicion, len(self.anillo))
+
+    def _quitar_del_anillo(self, s):
+        posicion = int(self.rango_segmento[s])
+        self.anillo = np.concatenate((self.anillo[:posicion], self.anillo[posicion + 1:]))
+        self.rango_segmento[self.anillo[posicion:]] = np.arange(posicion, len(self.anillo))
+        self.miembros[s] = None
+        self.libres.append(s)
+
+    def _extremos(self, s):
+        self.primera[s], self.ultima[s] = self.miembros[s][0], self.miembros[s][-1]
+
+    def _cortar(self, s, u):
+        """
+        Corta el segmento s tras la ciudad u (en el sentido natural). La parte más corta pasa a un
+        segmento nuevo, que hereda el bit de inversión y se coloca en el anillo en el lado que le toca.
+        """
+        miembros = self.miembros[s]
+        corte = int(self.rango[u] - self.rango[miembros[0]]) + 1
+        izquierda, derecha = miembros[:corte], miembros[corte:]
+        mover_derecha = len(derecha) <= len(izquierda)
+        nodos = derecha if mover_derecha else izquierda
+
+        t = self._nuevo_segmento(self.invertido[s])
+        self.segmento[nodos] = t
+        self.miembros[t], self.miembros[s] = nodos, (izquierda if mover_derecha else derecha)
+        self._extremos(t)
+        self._extremos(s)
+        self.sig_natural[izquierda[-1]] = -1
+        self.ant_natural[derecha[0]] = -1
+
+        # La parte derecha (natural) va detrás en el tour si el segmento no está invertido
+        detras = mover_derecha != bool(self.invertido[s])
+        self._insertar_en_anillo(t, int(self.rango_segmento[s]) + (1 if detras else 0))
+
+    def _separar_antes(self, ciudad):
+        """Corta para que la ciudad sea la primera de su segmento en el sentido del tour."""
+        s = int(self.segmento[ciudad])
+        if self._inicio(s) != ciudad:
+            self._cortar(s, ciudad if self.invertido[s] else int(self.ant_natural[ciudad]))
+
+    def _separar_despues(self, ciudad):
+        """Corta para que la ciudad sea la última de su segmento en el sentido del tour."""
+        s = int(self.segmento[ciudad])
+        if self._final(s) != ciudad:
+            self._cortar(s, int(self.ant_natural[ciudad]) if self.invertido[s] else ciudad)
+
+    def _voltear(self, s):
+        # Invierte el sentido natural de un segmento sin cambiar su orden en el tour
+        nodos = self.miembros[s]
+        self.sig_natural[nodos], self.ant_natural[nodos] = self.ant_natural[nodos], self.sig_natural[nodos]
+        self.rango[nodos] = -self.rango[nodos]
+        self.miembros[s] = nodos[::-1]
+        self._extremos(s)
+        self.invertido[s] = not self.invertido[s]
+
+    def _unir(self, s, t):
+        """Une el segmento t, que va justo detrás de s en el tour, con s. Se mueve el más corto."""
+        queda, sale = (s, t) if len(self.miembros[t]) <= len(self.miembros[s]) else (t, s)
+        if self.invertido[sale] != self.invertido[queda]:
+            self._voltear(sale)
+        nodos = self.miembros[sale]
+
+        # En el sentido natural, s va delante de t si no están invertidos y detrás si lo están
+        delante, detras = (s, t) if not self.invertido[queda] else (t, s)
+        extremo_delante, extremo_detras = int(self.ultima[delante]), int(self.primera[detras])
+        self.sig_natural[extremo_delante] = extremo_detras
+        self.ant_natural[extremo_detras] = extremo_delante
+
+        # Los rangos de la parte que se mueve se desplazan para seguir siendo consecutivos
+        if sale == detras:
+            self.rango[nodos] += self.rango[extremo_delante] - self.rango[extremo_detras] + 1
+            self.miembros[queda] = np.concatenate((self.miembros[queda], nodos))
+        else:
+            self.rango[nodos] += self.rango[extremo_detras] - self.rango[extremo_delante] - 1
+            self.miembros[queda] = np.concatenate((nodos, self.miembros[queda]))
+
+        self.segmento[nodos] = queda
+        self._extremos(queda)
+        self._quitar_del_anillo(sale)
+
+    def _equilibrar(self, s):
+        """Une el segmento con su vecino más corto del anillo si juntos no superan tamanio_grupo."""
+        m = len(self.anillo)
+        if m < 3:
+            return
+        rango = int(self.rango_segmento[s])
+        anterior, siguiente = int(self.anillo[rango - 1]), int(self.anillo[(rango + 1) % m])
+        tamanio, tamanio_anterior, tamanio_siguiente = len(self.miembros[s]), len(self.miembros[anterior]), len(self.miembros[siguiente])
+        if tamanio_anterior <= tamanio_siguiente:
+            if tamanio + tamanio_anterior <= self.tamanio_grupo:
+                self._unir(anterior, s)
+        elif tamanio + tamanio_siguiente <= self.tamanio_grupo:
+            self._unir(s, siguiente)
+
+    def invertir_tramo(self, desde, hasta):
+        """
+        Invierte el camino que va de la ciudad 'desde' a la ciudad 'hasta' en el sentido del tour. Se
+        invierte ese camino o el resto del tour, el que tenga menos segmentos (el ciclo es el mismo).
+
+        :param desde: Primera ciudad del camino.
+        :param hasta: Última ciudad del camino.
+        """
+        desde, hasta = int(desde), int(hasta)
+        if desde == hasta or self.siguiente(hasta) == desde:
+            return  # Un solo nodo o el tour completo: el ciclo no cambia
+
+        self._separar_antes(desde)
+        self._separar_despues(hasta)
+
+        m = len(self.anillo)
+        i, j = int(self.rango_segmento[self.segmento[desde]]), int(self.rango_segmento[self.segmento[hasta]])
+        longitud = (j - i) % m + 1
+        if 2 * longitud > m:
+            i, longitud = (j + 1) % m, m - longitud
+
+        # Los segmentos del camino cambian de orden en el anillo y de sentido
+        indices = (i + np.arange(longitud)) % m
+        segmentos = self.anillo[indices]
+        self.anillo[indices] = segmentos[::-1]
+        self.rango_segmento[segmentos[::-1]] = indices
+        self.invertido[segmentos] = ~self.invertido[segmentos]
+
+        # Los cortes dejan segmentos cortos en los extremos del camino: se unen con sus vecinos
+        for extremo in (desde, hasta):
+            self._equilibrar(int(self.segmento[extremo]))
+        if len(self.anillo) > self.max_segmentos:
+            self.construir(self.ciudades)
+
+    # ----- Conversión -----
+
+    @property
+    def ciudades(self):
+        """Array int32 de las ciudades en el orden del tour, empezando por el primer segmento del anillo."""
+        s = self.segmento
+        sentido = np.where(self.invertido[s], -self.rango, self.rango)
+        return np.lexsort((sentido, self.rango_segmento[s])).astype(np.int32)
+
+    def copiar(self):
+        """Devuelve una copia independiente del tour."""
+        return TourDosNiveles(self.ciudades)
+
+    def a_lista(self):
+        """Devuelve las ciudades del tour como lista de enteros de Python."""
+        return self.ciudades.tolist()
+
+    def __len__(self):
+        return self.num_ciudades
+
+    def __iter__(self):
+        return iter(self.ciudades)
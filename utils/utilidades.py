@@ -1,3 +1,5 @@
+import os
+
 import numpy as np
 import random
 
@@ -16,62 +18,113 @@ class Utilidades:
         return [random.randint(1, 100000) for _ in range(cantidad)]
 
     @staticmethod
-    def calcular_distancia_total(tour, matriz_distancias):
+    def calcular_distancia_total(tour, distancias):
         """
         Calcula la distancia total del tour.
 
         :param tour: Lista de ciudades en el orden de la ruta.
-        :param matriz_distancias: Matriz de distancias entre las ciudades.
+        :param distancias: Proveedor de distancias entre las ciudades (ver utils.distancias).
         :return: Distancia total del tour.
         """
-        distancia = np.sum(matriz_distancias[tour[:-1], tour[1:]])  # Distancia entre ciudades consecutivas
-        distancia += matriz_distancias[tour[-1], tour[0]]  # Vuelta a la ciudad inicial
+        distancia = np.sum(distancias[tour[:-1], tour[1:]], dtype=np.float64)  # Distancia entre ciudades consecutivas
+        distancia += distancias[tour[-1], tour[0]]  # Vuelta a la ciudad inicial
         return distancia
 
     @staticmethod
-    def generar_vecino(tour_actual, matriz_distancias, distancia_actual):
+    def seleccionar_movimientos(tamanio_entorno, tour_actual, rng, candidatos=None):
         """
-        Genera un nuevo vecino aplicando el operador 2-opt.
+        Elige de golpe las parejas de posiciones a intercambiar de todo el entorno.
+
+        Sin lista de candidatos se eligen dos posiciones al azar. Con ella se elige una ciudad al azar
+        y uno de sus vecinos más cercanos, y se propone colocar el vecino junto a la ciudad.
 
-        :param tour_actual: Lista de ciudades en el orden de la ruta.
-        :param matriz_distancias: Matriz de distancias entre las ciudades.
-        :param distancia_actual: Distancia de la ruta.
-        :return: Nuevo vecino, nueva distancia, i, j.
+        :param tamanio_entorno: Número de movimientos a generar.
+        :param tour_actual: Tour actual (utils.tour.Tour).
+        :param rng: Generador aleatorio de NumPy (np.random.Generator).
+        :param candidatos: Lista de candidatos (utils.candidatos.ListaCandidatos) o None.
+        :return: Arrays i, j con i < j en cada posición.
         """
         n = len(tour_actual)
-        i, j = sorted(random.sample(range(1, n - 1), 2))  # Seleccionar dos índices aleatorios
 
-        # Crear una copia del tour y hacer el intercambio de posiciones
-        nuevo_vecino = tour_actual[:]
-        nuevo_vecino[i], nuevo_vecino[j] = tour_actual[j], tour_actual[i]
+        # Dos posiciones distintas al azar en [1, n - 2]
+        i = rng.integers(1, n - 1, size=tamanio_entorno)
+        j = rng.integers(1, n - 2, size=tamanio_entorno)
+        j += j >= i
+
+        if candidatos is not None:
+            origen = rng.integers(1, n - 1, size=tamanio_entorno)
+            vecina = candidatos.vecinos[tour_actual.ciudades[origen], rng.integers(0, candidatos.num_candidatos, size=tamanio_entorno)]
+            posicion = tour_actual.posiciones[vecina].astype(np.int64)
+
+            # La vecina pasa a ocupar la posición contigua a la ciudad, del lado en que se encuentra
+            destino = np.where(posicion > origen, origen + 1, origen - 1)
+            validos = (posicion >= 1) & (posicion <= n - 2) & (destino >= 1) & (destino <= n - 2) & (destino != posicion)
+
+            # Los movimientos no válidos se quedan con la pareja aleatoria
+            i = np.where(validos, destino, i)
+            j = np.where(validos, posicion, j)
+
+        return np.minimum(i, j), np.maximum(i, j)
+
+    @staticmethod
+    def evaluar_movimientos(ciudades, distancias, i, j):
+        """
+        Versión vectorizada de factorizacion: calcula la variación de distancia de cada intercambio (i, j).
+
+        :param ciudades: Array de ciudades en el orden de la ruta.
+        :param distancias: Proveedor de distancias entre las ciudades (ver utils.distancias).
+        :param i: Array de posiciones de la primera ciudad (i < j).
+        :param j: Array de posiciones de la segunda ciudad.
+        :return: Array de deltas (nueva distancia - distancia actual).
+        """
+        n = len(ciudades)
+        anterior_i, ciudad_i, siguiente_i = ciudades[i - 1], ciudades[i], ciudades[(i + 1) % n]
+        anterior_j, ciudad_j, siguiente_j = ciudades[j - 1], ciudades[j], ciudades[(j + 1) % n]
 
-        # Calcular nueva distancia
-        desaparecen, nuevos = Utilidades.factorizacion(tour_actual, matriz_distancias, i, j)
-        nueva_distancia = distancia_actual - (desaparecen) + (nuevos)
+        # Arcos exteriores: se pierden y se crean en todos los casos
+        desaparecen = distancias[anterior_i, ciudad_i] + distancias[ciudad_j, siguiente_j]
+        nuevos = distancias[anterior_i, ciudad_j] + distancias[ciudad_i, siguiente_j]
 
-        # Comprobación de la solución (igual que con factorización)
-        # nueva_distancia = Utilidades.calcular_distancia_total(nuevo_vecino, matriz_distancias)
+        # Arcos interiores: solo cuando las ciudades no son consecutivas
+        no_consecutivas = (j - i) != 1
+        desaparecen = desaparecen + np.where(no_consecutivas, distancias[ciudad_i, siguiente_i] + distancias[anterior_j, ciudad_j], 0.0)
+        nuevos = nuevos + np.where(no_consecutivas, distancias[ciudad_j, siguiente_i] + distancias[anterior_j, ciudad_i], 0.0)
 
-        return nuevo_vecino, nueva_distancia, i, j
+        return nuevos - desaparecen
 
     @staticmethod
-    def generar_vecinos(tamanio_entorno, tour_actual, matriz_distancias, distancia_actual):
+    def generar_vecinos(tamanio_entorno, tour_actual, distancias, rng, candidatos=None):
         """
-        Genera un conjunto de vecinos utilizando el operador 2-opt.
+        Genera y evalúa de una vez un conjunto de vecinos intercambiando dos ciudades.
+        Cada vecino se representa por su movimiento, no por una copia del tour.
+        Los algoritmos eligen el operador en config.txt a través de utils.operadores.
 
         :param tamanio_entorno: Tamaño del entorno para la generación de vecinos.
-        :param tour_actual: Lista de ciudades en el orden de la ruta.
-        :param matriz_distancias: Matriz de distancias entre las ciudades.
-        :param distancia_actual: Distancia de la ruta.
-        :return: Lista de vecinos generados con sus respectivas distancias.
+        :param tour_actual: Tour actual (utils.tour.Tour).
+        :param distancias: Proveedor de distancias entre las ciudades (ver utils.distancias).
+        :param rng: Generador aleatorio de NumPy (np.random.Generator).
+        :param candidatos: Lista de candidatos para restringir el entorno a vecinos cercanos (opcional).
+        :return: Arrays i, j, deltas.
         """
-        vecinos = []
+        i, j = Utilidades.seleccionar_movimientos(tamanio_entorno, tour_actual, rng, candidatos)
+        deltas = Utilidades.evaluar_movimientos(tour_actual.ciudades, distancias, i, j)
 
-        for _ in range(tamanio_entorno):
-            nuevo_vecino, nueva_distancia, i, j = Utilidades.generar_vecino(tour_actual, matriz_distancias, distancia_actual)
-            vecinos.append((nuevo_vecino, nueva_distancia, (i, j)))
+        return i, j, deltas
 
-        return vecinos
+    @staticmethod
+    def mejor_movimiento(deltas, permitidos=None):
+        """
+        Devuelve el índice del movimiento con menor delta.
+
+        :param deltas: Array de deltas de los movimientos.
+        :param permitidos: Máscara booleana de movimientos admisibles (p. ej. no tabú), opcional.
+        :return: Índice del mejor movimiento, o None si no hay ninguno admisible.
+        """
+        if permitidos is not None:
+            deltas = np.where(permitidos, deltas, np.inf)
+        if len(deltas) == 0 or not np.isfinite(deltas).any():
+            return None
+        return int(np.argmin(deltas))
 
     @staticmethod
     def reducir_entorno(tamanio_entorno, cont, iteracion, per_disminucion, per_iteraciones, ite):
@@ -92,12 +145,12 @@ class Utilidades:
         return tamanio_entorno, cont, ite
 
     @staticmethod
-    def factorizacion(tour, matriz_distancias, i, j):
+    def factorizacion(tour, distancias, i, j):
         """
         Realiza el cálculo de los arcos del nuevo tour.
 
         :param tour: Lista de ciudades en el orden de la ruta.
-        :param matriz_distancias: Matriz de distancias entre las ciudades.
+        :param distancias: Proveedor de distancias entre las ciudades (ver utils.distancias).
         :param i: Índice de la ciudad i
         :param j: Índice de la ciudad j
         :return: distancia_desaparecen, distancia_nuevos
@@ -107,16 +160,31 @@ class Utilidades:
 
         # Manejar el caso cuando las ciudades son consecutivas
         if abs(i - j) == 1 or (i == 0 and j == n - 1) or (i == n - 1 and j == 0):
-            desaparecen = matriz_distancias[tour[i - 1], tour[i]] + matriz_distancias[tour[j], tour[(j + 1) % n]]
-            nuevos = matriz_distancias[tour[i - 1], tour[j]] + matriz_distancias[tour[i], tour[(j + 1) % n]]
+            desaparecen = distancias[tour[i - 1], tour[i]] + distancias[tour[j], tour[(j + 1) % n]]
+            nuevos = distancias[tour[i - 1], tour[j]] + distancias[tour[i], tour[(j + 1) % n]]
         else:
             desaparecen = (
-                    matriz_distancias[tour[i - 1], tour[i]] + matriz_distancias[tour[i], tour[(i + 1) % n]] +
-                    matriz_distancias[tour[j - 1], tour[j]] + matriz_distancias[tour[j], tour[(j + 1) % n]]
+                    distancias[tour[i - 1], tour[i]] + distancias[tour[i], tour[(i + 1) % n]] +
+                    distancias[tour[j - 1], tour[j]] + distancias[tour[j], tour[(j + 1) % n]]
             )
             nuevos = (
-                    matriz_distancias[tour[i - 1], tour[j]] + matriz_distancias[tour[j], tour[(i + 1) % n]] +
-                    matriz_distancias[tour[j - 1], tour[i]] + matriz_distancias[tour[i], tour[(j + 1) % n]]
+                    distancias[tour[i - 1], tour[j]] + distancias[tour[j], tour[(i + 1) % n]] +
+                    distancias[tour[j - 1], tour[i]] + distancias[tour[i], tour[(j + 1) % n]]
             )
 
-        return desaparecen, nuevos
\ No newline at end of file
+        return desaparecen, nuevos
+
+    @staticmethod
+    def procesos_internos(solicitados, params):
+        """
+        Nº de procesos que puede lanzar un algoritmo paralelo (islas, descomposición) sin saturar la máquina.
+
+        Dentro de un grupo de procesos del Ejecutor (o del ajuste) cada tarea recibe procesos_ejecutor, el
+        número de tareas simultáneas, y solo le corresponde su parte de los núcleos.
+
+        :param solicitados: Procesos pedidos en config.txt (0 = todos los que correspondan).
+        :param params: Parámetros del archivo de configuración.
+        :return: Número de procesos, al menos 1.
+        """
+        disponibles = max(1, (os.cpu_count() or 1) // params.get('procesos_ejecutor', 1))
+        return min(solicitados, disponibles) if solicitados > 0 else disponibles